@@ -56,10 +56,22 @@ faker_providers = [
 # Módulos importados dinámicamente con importlib en tiempo de ejecución
 # (PyInstaller no los detecta por análisis estático).
 modules_hidden = [
+    'indice_busqueda',
+    'perfiles_columnas',
     'agregar_comentarios',
     'validar_nomenclatura',
     'generar_diccionario',
+    'diccionario_modelo',
+    'diccionario_formatos',
+    'diccionario_web',
+    'diccionario_cache',
+    'diccionario_lote',
+    'diccionario_partes',
     'data_prueba',
+    'data_prueba_pipeline',
+    'data_prueba_estimacion',
+    'data_prueba_mantenimiento',
+    'data_prueba_perfilado',
     'data_prueba_gui',
 ]
 
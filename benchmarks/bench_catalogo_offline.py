@@ -0,0 +1,128 @@
+"""
+Benchmark sin PostgreSQL de los módulos que leen el catálogo: reproduce fixtures
+grabados (catalogo_replay) o sintéticos (catalogo_sintetico) y mide, por módulo
+y escala, el mejor tiempo de N corridas y el pico de memoria Python (tracemalloc,
+en una corrida aparte para no inflar los tiempos).
+
+  diccionario  generar_diccionario en RTF, sin caché de fragmentos
+  overview     MetadataExtractor.exportar_a_excel (requiere pandas y openpyxl)
+  analisis     SmartDataGenerator.analizar_base_datos
+
+Uso: python benchmarks/bench_catalogo_offline.py [tablas ...] [--fixture F ...] [--dir D]
+                                                 [--repeticiones N] [--modulos m1,m2] [--json RUTA]
+
+Sin --fixture usa los sintéticos de 10, 1000 y 10000 tablas de --dir (por
+defecto <temp>/dbmanager_fixtures), grabándolos de nuevo si no existen o si se
+grabaron con otro catálogo u otros módulos disponibles.
+"""
+import contextlib
+import io
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from catalogo_replay import MODULOS, ConexionMemoria, Fixture, ModuloNoDisponible, parchear_connect
+from catalogo_sintetico import ESCALAS, cargar_o_generar, ruta_fixture
+
+
+def _opcion(args, nombre, defecto=None):
+    """Quita de args todas las apariciones de 'nombre valor' y devuelve los valores."""
+    valores = []
+    while nombre in args:
+        i = args.index(nombre)
+        valores.append(args[i + 1])
+        del args[i:i + 2]
+    return valores or defecto
+
+
+def _una_corrida(preparar, fixture, directorio, medir_memoria):
+    """(segundos, pico en bytes o None, detalle). La preparación no se mide."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        ejecutar = preparar(fixture.conexion, directorio)
+        with parchear_connect(lambda: ConexionMemoria(fixture.resolver)):
+            if medir_memoria:
+                tracemalloc.start()
+            try:
+                inicio  = time.perf_counter()
+                detalle = ejecutar()
+                segundos = time.perf_counter() - inicio
+                pico = tracemalloc.get_traced_memory()[1] if medir_memoria else None
+            finally:
+                if medir_memoria:
+                    tracemalloc.stop()
+    return segundos, pico, detalle
+
+
+def medir(nombre, preparar, fixture, repeticiones):
+    resultado = {'modulo': nombre, 'fixture': fixture.origen, 'estado': 'OK', 'segundos': None,
+                 'pico_mb': None, 'detalle': ''}
+    faltantes_previas = len(fixture.faltantes)
+    with tempfile.TemporaryDirectory(prefix='dbmanager_bench_') as directorio:
+        try:
+            tiempos = [_una_corrida(preparar, fixture, directorio, False)[0] for _ in range(repeticiones)]
+            _, pico, detalle = _una_corrida(preparar, fixture, directorio, True)
+        except ModuloNoDisponible as e:
+            resultado.update(estado='OMITIDO', detalle=str(e))
+            return resultado
+        except Exception as e:
+            resultado.update(estado='ERROR', detalle=str(e).strip())
+            return resultado
+    resultado.update(segundos=min(tiempos), pico_mb=pico / (1 << 20), detalle=detalle)
+    faltantes = fixture.faltantes[faltantes_previas:]
+    if faltantes:
+        resultado['estado']    = 'PARCIAL'
+        resultado['faltantes'] = sorted(set(faltantes))
+    return resultado
+
+
+def cargar_fixtures(args):
+    rutas = _opcion(args, '--fixture', [])
+    if rutas:
+        return [Fixture.cargar(r) for r in rutas]
+    directorio = Path(_opcion(args, '--dir', [Path(tempfile.gettempdir()) / "dbmanager_fixtures"])[0])
+    escalas    = [int(a) for a in args] or list(ESCALAS)
+    return [cargar_o_generar(n, ruta_fixture(n, directorio)) for n in escalas]
+
+
+def imprimir(resultados):
+    print(f"\n  {'fixture':<28} {'modulo':<12} {'estado':<8} {'mejor ms':>10} {'pico MB':>9}  detalle")
+    for r in resultados:
+        ms   = f"{r['segundos'] * 1000:10.1f}" if r['segundos'] is not None else f"{'-':>10}"
+        pico = f"{r['pico_mb']:9.1f}" if r['pico_mb'] is not None else f"{'-':>9}"
+        print(f"  {r['fixture']:<28} {r['modulo']:<12} {r['estado']:<8} {ms} {pico}  {r['detalle']}")
+    for r in resultados:
+        for consulta in r.get('faltantes', []):
+            print(f"[AVISO] {r['fixture']} / {r['modulo']}: consulta sin grabar: {consulta}")
+
+
+def main():
+    args         = sys.argv[1:]
+    repeticiones = int(_opcion(args, '--repeticiones', ['3'])[0])
+    modulos      = _opcion(args, '--modulos', [None])[0]
+    ruta_json    = _opcion(args, '--json', [None])[0]
+    elegidos     = [(n, p) for n, p in MODULOS if modulos is None or n in modulos.split(',')]
+    if not elegidos:
+        print(f"Modulos disponibles: {', '.join(n for n, _ in MODULOS)}")
+        sys.exit(1)
+    resultados = []
+    for fixture in cargar_fixtures(args):
+        print(f"{fixture.origen}: {fixture.total} consultas grabadas")
+        for nombre, preparar in elegidos:
+            resultados.append(medir(nombre, preparar, fixture, repeticiones))
+    imprimir(resultados)
+    if ruta_json:
+        with open(ruta_json, 'w', encoding='utf-8') as f:
+            json.dump({'fecha': datetime.now().isoformat(timespec='seconds'), 'repeticiones': repeticiones,
+                       'resultados': resultados}, f, indent=2, ensure_ascii=False)
+    if any(r['estado'] in ('ERROR', 'PARCIAL') for r in resultados):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Latencia del índice de búsqueda de las GUIs sobre un catálogo sintético de
+tablas y columnas con comentarios. Objetivo: cada consulta bajo 16 ms (un frame).
+
+Uso: python benchmarks/bench_indice_busqueda.py [columnas] [repeticiones]
+"""
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "modules"))
+
+from indice_busqueda import IndiceBusqueda
+
+
+PREFIJOS = ['mae', 'tab', 'cab', 'det', 'log', 'aud', 'tmp', 'rel']
+RAICES   = ['cliente', 'producto', 'pedido', 'factura', 'empleado', 'sede', 'ubigeo',
+            'categoria', 'proveedor', 'almacen', 'movimiento', 'cuenta', 'usuario', 'perfil']
+COLUMNAS = ['id', 'codigo', 'nombre', 'descripcion', 'estado', 'fecha_registro', 'monto',
+            'usuario_creacion', 'fecha_modificacion', 'direccion', 'telefono', 'email',
+            'cantidad', 'precio_unitario', 'observacion', 'tipo', 'flag_activo']
+CONSULTAS = ['c', 'id', 'cli', 'cliente', 'mae_cliente_0', 'fecha', 'precio_unit',
+             'clinete', 'provedor', 'registro de', 'zzz', 'estado']
+
+
+def main():
+    n_columnas   = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    repeticiones = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    rng    = random.Random(7)
+    indice = IndiceBusqueda()
+    n = 0
+    t = 0
+    while n < n_columnas:
+        tabla = f"{rng.choice(PREFIJOS)}_{rng.choice(RAICES)}_{t:04d}"
+        indice.agregar(tabla, tabla, f"Tabla de {rng.choice(RAICES)} del modulo {t % 40}")
+        for col in rng.sample(COLUMNAS, rng.randint(5, len(COLUMNAS))):
+            indice.agregar(f"{tabla}.{col}", col, f"Campo {col.replace('_', ' ')} de registro")
+            n += 1
+        t += 1
+    inicio = time.perf_counter()
+    indice.construir()
+    print(f"Indice: {t:,} tablas, {len(indice):,} entradas, construido en "
+          f"{(time.perf_counter() - inicio) * 1000:.0f} ms")
+    print(f"  {'consulta':<16}{'resultados':>12}{'media ms':>10}{'max ms':>10}")
+    for consulta in CONSULTAS:
+        tiempos = []
+        for _ in range(repeticiones):
+            inicio    = time.perf_counter()
+            resultado = indice.buscar(consulta, limite=200)
+            tiempos.append((time.perf_counter() - inicio) * 1000)
+        print(f"  {consulta:<16}{len(resultado):>12}{sum(tiempos) / len(tiempos):>10.2f}{max(tiempos):>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
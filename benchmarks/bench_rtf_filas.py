@@ -0,0 +1,135 @@
+"""
+Formateo de filas RTF del diccionario: implementación anterior (preámbulo
+reconstruido por fila, escape carácter a carácter) contra la actual (plantillas
+por anchos y str.translate). Verifica que los bytes sean idénticos y mide la
+mejora sobre ~40k filas de atributos sintéticas.
+
+Uso: python benchmarks/bench_rtf_filas.py [filas] [repeticiones]
+"""
+import io
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "modules"))
+
+from generar_diccionario import (ATRIBUTOS_HEADERS, ATRIBUTOS_WIDTHS, create_table_row,
+                                 escape_rtf)
+
+
+# ── Implementación anterior (referencia) ──────────────────────────────────────
+def escape_rtf_anterior(text):
+    if text is None:
+        return ""
+    text = str(text)
+    sb = []
+    for char in text:
+        code = ord(char)
+        if char == '\\':
+            sb.append('\\\\')
+        elif char == '{':
+            sb.append('\\{')
+        elif char == '}':
+            sb.append('\\}')
+        elif char == '\n':
+            sb.append('\\line ')
+        elif char == '\r':
+            continue
+        elif 32 <= code <= 126:
+            sb.append(char)
+        else:
+            sb.append(f"\\u{code}?")
+    return ''.join(sb)
+
+
+def create_table_row_anterior(cells, widths, is_header=False):
+    row = []
+    row.append("\\trowd\\trgaph108\\trleft0")
+    row.append("\\trbrdrt\\brdrs\\brdrw10")
+    row.append("\\trbrdrl\\brdrs\\brdrw10")
+    row.append("\\trbrdrb\\brdrs\\brdrw10")
+    row.append("\\trbrdrr\\brdrs\\brdrw10")
+    pos = 0
+    for width in widths:
+        pos += width
+        row.append("\\clbrdrt\\brdrs\\brdrw10")
+        row.append("\\clbrdrl\\brdrs\\brdrw10")
+        row.append("\\clbrdrb\\brdrs\\brdrw10")
+        row.append("\\clbrdrr\\brdrs\\brdrw10")
+        if is_header:
+            row.append("\\clcbpat3")
+        row.append(f"\\cellx{pos}")
+    row.append("\n")
+    for cell in cells:
+        if is_header:
+            row.append("\\qc\\b\\cf2 ")
+        else:
+            row.append("\\ql ")
+        row.append(escape_rtf_anterior(cell or ""))
+        if is_header:
+            row.append("\\b0\\cf1")
+        row.append("\\cell ")
+    row.append("\\row\n")
+    return ''.join(row)
+
+
+# ── Datos ─────────────────────────────────────────────────────────────────────
+TIPOS       = ['integer', 'bigint', 'varchar(50)', 'numeric', 'timestamp', 'date', 'text', 'jsonb']
+COMENTARIOS = ['', 'Identificador del registro', 'Código único {interno}', 'Año de emisión',
+               'Ruta C:\\datos\\archivo', 'Línea 1\nLínea 2\r\n', 'Monto en €', 'Estado 😀',
+               'Descripción del campo de auditoría', None]
+
+
+def filas_sinteticas(n, rng):
+    filas = []
+    for i in range(n):
+        filas.append([str(i % 40 + 1), f"campo_{i % 97}", rng.choice(TIPOS), rng.choice(['SI', 'NO']),
+                      rng.choice(['SI', '']), rng.choice(['SI', '']), rng.choice(COMENTARIOS),
+                      'Numero entero positivo'])
+    return filas
+
+
+def escribir(filas, fila_rtf):
+    salida = io.StringIO()
+    salida.write(fila_rtf(ATRIBUTOS_HEADERS, ATRIBUTOS_WIDTHS, True))
+    for cells in filas:
+        salida.write(fila_rtf(cells, ATRIBUTOS_WIDTHS, False))
+    return salida.getvalue()
+
+
+def medir(funcion, repeticiones):
+    mejor = float('inf')
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion()
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor, resultado
+
+
+def main():
+    n_filas      = int(sys.argv[1]) if len(sys.argv) > 1 else 40000
+    repeticiones = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    rng   = random.Random(11)
+    filas = filas_sinteticas(n_filas, rng)
+
+    # Escape: textos aleatorios con ASCII, controles, latín, BMP y astrales.
+    alfabeto = [chr(c) for c in range(0, 130)] + list('ñáéíóúÑ€{}\\') + ['😀', '\u2028', '\ud800']
+    for _ in range(20000):
+        texto = ''.join(rng.choice(alfabeto) for _ in range(rng.randint(0, 30)))
+        if escape_rtf(texto) != escape_rtf_anterior(texto):
+            print(f"[ERROR] escape distinto para {texto!r}")
+            sys.exit(1)
+
+    t_anterior, rtf_anterior = medir(lambda: escribir(filas, create_table_row_anterior), repeticiones)
+    t_actual,   rtf_actual   = medir(lambda: escribir(filas, create_table_row), repeticiones)
+    if rtf_actual.encode('utf-8') != rtf_anterior.encode('utf-8'):
+        print("[ERROR] La salida RTF difiere de la implementacion anterior")
+        sys.exit(1)
+    print(f"[OK] {n_filas:,} filas, {len(rtf_actual.encode('utf-8')):,} bytes identicos")
+    print(f"  anterior: {t_anterior * 1000:8.1f} ms")
+    print(f"  actual:   {t_actual * 1000:8.1f} ms  ({t_anterior / t_actual:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Microbenchmark del serializador COPY: ruta anterior (dicts + escalera de
+isinstance + csv.writer) contra el serializador compilado por tabla (tuplas +
+formato COPY texto), sobre una tabla sintética de 30 columnas.
+
+Uso: python benchmarks/bench_serializador_copy.py [filas] [repeticiones]
+"""
+import csv
+import io
+import json
+import random
+import sys
+import time
+import uuid
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "modules"))
+
+from data_prueba import _compilar_serializador_texto
+
+
+# 30 columnas: 10 int, 4 numeric, 3 date, 3 timestamp, 2 bool, 2 uuid, 6 texto
+TIPOS = (['int4'] * 6 + ['int8'] * 4 + ['numeric'] * 4 + ['date'] * 3 +
+         ['timestamp'] * 3 + ['bool'] * 2 + ['uuid'] * 2 + ['varchar'] * 4 + ['text'] * 2)
+PALABRAS = ['lorem', 'ipsum', 'dolor', 'sit', 'amet', 'consectetur', 'adipiscing', 'elit']
+
+
+def generar_valor(rng, tipo):
+    if rng.random() < 0.1:
+        return None
+    if tipo in ('int4', 'int8'):
+        return rng.randint(1, 2147483647)
+    if tipo == 'numeric':
+        return Decimal(str(round(rng.uniform(0, 99999), 2)))
+    if tipo == 'date':
+        return date(2025, 1, 1) - timedelta(days=rng.randint(0, 1825))
+    if tipo == 'timestamp':
+        return datetime(2025, 1, 1) - timedelta(days=rng.randint(0, 730), hours=rng.randint(0, 23))
+    if tipo == 'bool':
+        return rng.random() < 0.5
+    if tipo == 'uuid':
+        return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+    texto = ' '.join(rng.choices(PALABRAS, k=rng.randint(2, 12)))
+    return texto + '\tcon\\escape' if rng.random() < 0.05 else texto
+
+
+def serializar_anterior(registros, columnas):
+    output = io.StringIO()
+    writer = csv.writer(output, delimiter='\t', quotechar='"',
+                        quoting=csv.QUOTE_MINIMAL, lineterminator='\n')
+    for registro in registros:
+        fila = []
+        for col in columnas:
+            valor = registro.get(col)
+            if valor is None:
+                fila.append('\\N')
+            elif isinstance(valor, datetime):
+                fila.append(valor.isoformat())
+            elif isinstance(valor, bool):
+                fila.append('t' if valor else 'f')
+            elif isinstance(valor, (list, dict)):
+                fila.append(json.dumps(valor))
+            else:
+                fila.append(str(valor))
+        writer.writerow(fila)
+    return output.getvalue().encode('utf-8')
+
+
+def medir(nombre, funcion, repeticiones):
+    mejor = float('inf')
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        datos  = funcion()
+        mejor  = min(mejor, time.perf_counter() - inicio)
+    print(f"  {nombre:<12} {len(datos) / mejor / 1e6:8.1f} MB/s   {mejor * 1000:8.1f} ms   {len(datos):,} bytes")
+    return len(datos) / mejor
+
+
+def main():
+    filas_n      = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    repeticiones = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    rng       = random.Random(42)
+    columnas  = [f"col_{i:02d}" for i in range(len(TIPOS))]
+    filas     = [tuple(generar_valor(rng, t) for t in TIPOS) for _ in range(filas_n)]
+    registros = [dict(zip(columnas, fila)) for fila in filas]
+    serializar = _compilar_serializador_texto(TIPOS)
+
+    print(f"Serializacion COPY: {filas_n:,} filas x {len(TIPOS)} columnas, mejor de {repeticiones}")
+    anterior  = medir('anterior', lambda: serializar_anterior(registros, columnas), repeticiones)
+    compilado = medir('compilado', lambda: serializar(filas).encode('utf-8'), repeticiones)
+    print(f"  Aceleracion: {compilado / anterior:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
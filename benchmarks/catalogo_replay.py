@@ -0,0 +1,443 @@
+"""
+Grabación y reproducción de consultas de catálogo, para medir sin PostgreSQL
+los módulos que leen el catálogo: generar_diccionario, el extractor de
+metadata del dashboard y SmartDataGenerator.analizar_base_datos.
+
+Grabar una corrida real (las tres rutas contra un esquema) en un fixture:
+
+  python benchmarks/catalogo_replay.py grabar <host> <puerto> <bd> <usuario> <password> <esquema> <fixture>
+
+El fixture (JSON, .json.gz comprimido) guarda cada consulta con sus parámetros,
+columnas y filas, o el error que dio. ConexionMemoria lo sirve de vuelta con la
+interfaz de psycopg2 que usan los módulos; parchear_connect() la instala en
+lugar de psycopg2.connect. Una consulta que no está en el fixture falla con
+ErrorReplay y queda anotada en Fixture.faltantes.
+"""
+import base64
+import contextlib
+import gzip
+import io
+import json
+import re
+import sys
+import tempfile
+import threading
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+_RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_RAIZ / "modules"))
+sys.path.insert(0, str(_RAIZ / "modules" / "dashboard"))
+
+import psycopg2
+
+
+VERSION_FIXTURE = 1
+_ESPACIOS = re.compile(r'\s+')
+
+
+class ErrorReplay(psycopg2.DatabaseError):
+    """Error grabado de una consulta, o consulta que el fixture no tiene."""
+
+
+def clave(sql, params=None):
+    """Consulta normalizada (espacios) y parámetros: identifica una ejecución."""
+    return (_ESPACIOS.sub(' ', sql).strip(), json.dumps(_codificar(params), sort_keys=True))
+
+
+# ── Valores ───────────────────────────────────────────────────────────────────
+def _codificar(valor):
+    if valor is None or isinstance(valor, (bool, int, float, str)):
+        return valor
+    if isinstance(valor, (list, tuple)):
+        return [_codificar(v) for v in valor]
+    if isinstance(valor, dict):
+        return {k: _codificar(v) for k, v in valor.items()}
+    if isinstance(valor, Decimal):
+        return {'$decimal': str(valor)}
+    if isinstance(valor, datetime):
+        return {'$datetime': valor.isoformat()}
+    if isinstance(valor, date):
+        return {'$date': valor.isoformat()}
+    if isinstance(valor, time):
+        return {'$time': valor.isoformat()}
+    if isinstance(valor, timedelta):
+        return {'$timedelta': valor.total_seconds()}
+    if isinstance(valor, (bytes, bytearray, memoryview)):
+        return {'$bytes': base64.b64encode(bytes(valor)).decode('ascii')}
+    return str(valor)
+
+
+_DECODIFICAR = {
+    '$decimal':   Decimal,
+    '$datetime':  datetime.fromisoformat,
+    '$date':      date.fromisoformat,
+    '$time':      time.fromisoformat,
+    '$timedelta': lambda s: timedelta(seconds=s),
+    '$bytes':     base64.b64decode,
+}
+
+
+def _decodificar(valor):
+    if isinstance(valor, list):
+        return [_decodificar(v) for v in valor]
+    if isinstance(valor, dict):
+        if len(valor) == 1:
+            etiqueta, dato = next(iter(valor.items()))
+            if etiqueta in _DECODIFICAR:
+                return _DECODIFICAR[etiqueta](dato)
+        return {k: _decodificar(v) for k, v in valor.items()}
+    return valor
+
+
+# ── Fixture ───────────────────────────────────────────────────────────────────
+class Fixture:
+    """Consultas grabadas de un catálogo. conexion: host, puerto, bd, usuario y
+    esquema con que se grabó (sin password); los módulos se corren con ellos.
+    modulos: los de MODULOS que se grabaron; huella_catalogo: la del catálogo
+    sintético de origen (None si se grabó de una base real)."""
+
+    def __init__(self, conexion, consultas=None, origen='', modulos=(), huella_catalogo=None):
+        self.conexion        = dict(conexion)
+        self.origen          = origen
+        self.modulos         = list(modulos)
+        self.huella_catalogo = huella_catalogo
+        self.consultas       = {}
+        self.faltantes       = []
+        self._bloqueo        = threading.Lock()
+        for entrada in consultas or []:
+            self.consultas.setdefault(clave(entrada['sql'], entrada['params']), []).append(entrada)
+
+    @property
+    def total(self):
+        return sum(len(e) for e in self.consultas.values())
+
+    # Grabación
+    def grabando(self, resolver):
+        """Envuelve un resolver (sql, params) -> (columnas, filas) y guarda cada
+        resultado o error antes de devolverlo."""
+        def grabar(sql, params):
+            entrada = {'sql': _ESPACIOS.sub(' ', sql).strip(), 'params': _codificar(params)}
+            try:
+                columnas, filas = resolver(sql, params)
+                entrada['columnas'], entrada['filas'] = columnas, filas
+                return columnas, filas
+            except Exception as e:
+                entrada['error'] = f"{type(e).__name__}: {str(e).strip()}"
+                raise
+            finally:
+                with self._bloqueo:
+                    self.consultas.setdefault(clave(sql, params), []).append(entrada)
+        return grabar
+
+    def guardar(self, ruta):
+        ruta     = Path(ruta)
+        ruta.parent.mkdir(parents=True, exist_ok=True)
+        entradas = [dict(e, filas=_codificar(e['filas'])) if 'filas' in e else e
+                    for lista in self.consultas.values() for e in lista]
+        datos    = {'version': VERSION_FIXTURE, 'origen': self.origen, 'conexion': self.conexion,
+                    'modulos': self.modulos, 'huella_catalogo': self.huella_catalogo,
+                    'consultas': entradas}
+        abrir    = gzip.open if ruta.suffix == '.gz' else open
+        with abrir(ruta, 'wt', encoding='utf-8') as f:
+            json.dump(datos, f, ensure_ascii=False, separators=(',', ':'))
+
+    @classmethod
+    def cargar(cls, ruta):
+        ruta  = Path(ruta)
+        abrir = gzip.open if ruta.suffix == '.gz' else open
+        with abrir(ruta, 'rt', encoding='utf-8') as f:
+            datos = json.load(f)
+        if datos.get('version') != VERSION_FIXTURE:
+            raise ValueError(f"version de fixture no soportada: {datos.get('version')} ({ruta})")
+        for entrada in datos['consultas']:
+            if 'filas' in entrada and entrada['filas'] is not None:
+                entrada['filas'] = [tuple(_decodificar(f)) for f in entrada['filas']]
+        return cls(datos['conexion'], datos['consultas'], datos.get('origen', ''),
+                   datos.get('modulos', ()), datos.get('huella_catalogo'))
+
+    # Reproducción
+    def resolver(self, sql, params):
+        """Resultado grabado de la consulta. Si se grabó varias veces se entregan en
+        el orden de la grabación, y al acabarse se vuelve a empezar."""
+        k = clave(sql, params)
+        with self._bloqueo:
+            entradas = self.consultas.get(k)
+            if not entradas:
+                self.faltantes.append(k[0][:120])
+                raise ErrorReplay(f"consulta no grabada: {k[0][:120]}")
+            entrada = entradas[0]
+            if len(entradas) > 1:
+                entradas.append(entradas.pop(0))
+        if 'error' in entrada:
+            raise ErrorReplay(entrada['error'])
+        return entrada['columnas'], entrada['filas']
+
+
+# ── Conexión en memoria ───────────────────────────────────────────────────────
+class CursorMemoria:
+    """Cursor con la interfaz de psycopg2 que usan los módulos; execute() pide el
+    resultado completo al resolver de la conexión."""
+
+    def __init__(self, conexion, name=None):
+        self.connection  = conexion
+        self.name        = name
+        self.itersize    = 2000
+        self.arraysize   = 1
+        self.description = None
+        self.rowcount    = -1
+        self.closed      = False
+        self._filas      = []
+        self._pos        = 0
+
+    def execute(self, sql, params=None):
+        columnas, filas = self.connection.resolver(sql, params)
+        self.description = [(c, None, None, None, None, None, None) for c in columnas] if columnas else None
+        self._filas      = filas or []
+        self._pos        = 0
+        self.rowcount    = len(self._filas) if columnas else -1
+
+    def _pendientes(self):
+        if self.description is None:
+            raise ErrorReplay("no results to fetch")
+        return self._filas
+
+    def fetchone(self):
+        filas = self._pendientes()
+        if self._pos >= len(filas):
+            return None
+        self._pos += 1
+        return filas[self._pos - 1]
+
+    def fetchmany(self, size=None):
+        filas = self._pendientes()
+        lote  = filas[self._pos:self._pos + (size or self.arraysize)]
+        self._pos += len(lote)
+        return lote
+
+    def fetchall(self):
+        filas = self._pendientes()
+        resto = filas[self._pos:]
+        self._pos = len(filas)
+        return resto
+
+    def __iter__(self):
+        while True:
+            fila = self.fetchone()
+            if fila is None:
+                return
+            yield fila
+
+    def close(self):
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ConexionMemoria:
+    """Conexión que resuelve cada consulta con resolver(sql, params) -> (columnas,
+    filas). real: conexión psycopg2 a la que se delegan commit/rollback/close
+    mientras se graba."""
+
+    def __init__(self, resolver, real=None):
+        self.resolver = resolver
+        self.real     = real
+        self.closed   = False
+        self._autocommit = False
+
+    @property
+    def autocommit(self):
+        return self._autocommit
+
+    @autocommit.setter
+    def autocommit(self, valor):
+        self._autocommit = valor
+        if self.real is not None:
+            self.real.autocommit = valor
+
+    def cursor(self, name=None, **_opciones):
+        return CursorMemoria(self, name)
+
+    def commit(self):
+        if self.real is not None:
+            self.real.commit()
+
+    def rollback(self):
+        if self.real is not None:
+            self.real.rollback()
+
+    def close(self):
+        self.closed = True
+        if self.real is not None:
+            self.real.close()
+
+
+def resolver_psycopg2(conn):
+    """Resolver sobre una conexión real. Los cursores con nombre de los módulos se
+    leen aquí con uno normal: el resultado es el mismo y se graba completo."""
+    def resolver(sql, params):
+        with conn.cursor() as cursor:
+            cursor.execute(sql, params)
+            if cursor.description is None:
+                return None, None
+            return [d[0] for d in cursor.description], cursor.fetchall()
+    return resolver
+
+
+@contextlib.contextmanager
+def parchear_connect(fabrica):
+    """psycopg2.connect devuelve fabrica() mientras dure el bloque."""
+    original = psycopg2.connect
+    psycopg2.connect = lambda *args, **kwargs: fabrica()
+    try:
+        yield
+    finally:
+        psycopg2.connect = original
+
+
+# ── Módulos medidos ───────────────────────────────────────────────────────────
+# Cada preparar_* recibe los datos de conexión del fixture y un directorio de
+# trabajo y devuelve la función a medir (sin la preparación) o lanza
+# ModuloNoDisponible. La función devuelve un detalle corto del resultado.
+class ModuloNoDisponible(Exception):
+    pass
+
+
+def preparar_diccionario(conexion, directorio):
+    import generar_diccionario
+    salida = Path(directorio) / f"diccionario_{conexion['esquema']}.rtf"
+
+    def ejecutar():
+        try:
+            generar_diccionario.generar_diccionario(
+                conexion['host'], conexion['puerto'], conexion['bd'], conexion['usuario'], '',
+                conexion['esquema'], str(salida), incremental=False)
+        except SystemExit as e:
+            raise RuntimeError(f"generar_diccionario termino con codigo {e.code}")
+        return f"{salida.stat().st_size:,} bytes RTF"
+    return ejecutar
+
+
+def preparar_overview(conexion, directorio):
+    try:
+        import pandas  # noqa: F401
+        import openpyxl  # noqa: F401
+        import extraer_metadata_overview
+    except ImportError as e:
+        raise ModuloNoDisponible(f"falta {e.name}")
+    config = Path(directorio) / "db_config_replay.json"
+    with open(config, 'w', encoding='utf-8') as f:
+        json.dump({'host': conexion['host'], 'port': conexion['puerto'], 'database': conexion['bd'],
+                   'user': conexion['usuario'], 'password': ''}, f)
+    salida = Path(directorio) / "metadata_overview.xlsx"
+
+    def ejecutar():
+        extractor = extraer_metadata_overview.MetadataExtractor(str(config))
+        if not extractor.conectar():
+            raise RuntimeError("no se pudo conectar")
+        try:
+            if not extractor.exportar_a_excel(str(salida)):
+                raise RuntimeError("fallo la exportacion a Excel")
+        finally:
+            extractor.cerrar()
+        return f"{salida.stat().st_size:,} bytes XLSX"
+    return ejecutar
+
+
+def preparar_analisis(conexion, directorio):
+    from data_prueba import SmartDataGenerator
+    generador = SmartDataGenerator(conexion['host'], conexion['puerto'], conexion['bd'],
+                                   conexion['usuario'], '', conexion['esquema'])
+
+    def ejecutar():
+        if not generador.conectar():
+            raise RuntimeError("no se pudo conectar")
+        try:
+            generador.analizar_base_datos()
+        finally:
+            generador.desconectar()
+        return f"{len(generador.metadata['orden_carga']):,} tablas ordenadas"
+    return ejecutar
+
+
+MODULOS = [
+    ('diccionario', preparar_diccionario),
+    ('overview',    preparar_overview),
+    ('analisis',    preparar_analisis),
+]
+
+
+def modulos_disponibles(conexion):
+    """Nombres de MODULOS que se pueden preparar en este entorno: los que
+    grabar_fixture grabaría ahora."""
+    disponibles = []
+    with tempfile.TemporaryDirectory(prefix='dbmanager_modulos_') as directorio:
+        with contextlib.redirect_stdout(io.StringIO()):
+            for nombre, preparar in MODULOS:
+                try:
+                    preparar(conexion, directorio)
+                except ModuloNoDisponible:
+                    continue
+                disponibles.append(nombre)
+    return disponibles
+
+
+def correr_modulo(preparar, conexion, fabrica, directorio):
+    """Prepara y corre un módulo una vez con psycopg2.connect -> fabrica() y la
+    salida estándar descartada. Devuelve el detalle del resultado."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        ejecutar = preparar(conexion, directorio)
+        with parchear_connect(fabrica):
+            return ejecutar()
+
+
+def grabar_fixture(fabrica_base, conexion, ruta, origen='', verboso=True, huella_catalogo=None):
+    """Corre los módulos disponibles con conexiones de fabrica_base() (que
+    devuelve (resolver, real)) grabando todo en un fixture guardado en ruta."""
+    fixture = Fixture(conexion, origen=origen, huella_catalogo=huella_catalogo)
+
+    def fabrica():
+        resolver, real = fabrica_base()
+        return ConexionMemoria(fixture.grabando(resolver), real)
+
+    with tempfile.TemporaryDirectory(prefix='dbmanager_grabar_') as directorio:
+        for nombre, preparar in MODULOS:
+            try:
+                detalle = correr_modulo(preparar, conexion, fabrica, directorio)
+                fixture.modulos.append(nombre)
+                if verboso:
+                    print(f"  {nombre}: {detalle}")
+            except ModuloNoDisponible as e:
+                if verboso:
+                    print(f"  {nombre}: omitido ({e})")
+    fixture.guardar(ruta)
+    if verboso:
+        print(f"Fixture: {ruta} ({fixture.total} consultas)")
+    return fixture
+
+
+def main():
+    uso = ("Uso: python benchmarks/catalogo_replay.py grabar <host> <puerto> <bd> <usuario> "
+           "<password> <esquema> <fixture>")
+    if len(sys.argv) != 9 or sys.argv[1] != 'grabar':
+        print(uso)
+        sys.exit(1)
+    host, puerto, bd, usuario, password, esquema, ruta = sys.argv[2:]
+    conexion = {'host': host, 'puerto': puerto, 'bd': bd, 'usuario': usuario, 'esquema': esquema}
+    conectar = psycopg2.connect
+
+    def fabrica_base():
+        real = conectar(host=host, port=puerto, database=bd, user=usuario, password=password)
+        return resolver_psycopg2(real), real
+
+    print(f"Grabando {bd}.{esquema}@{host}:")
+    grabar_fixture(fabrica_base, conexion, ruta, origen=f"{bd}.{esquema}@{host}")
+
+
+if __name__ == "__main__":
+    main()
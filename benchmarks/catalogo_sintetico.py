@@ -0,0 +1,338 @@
+"""
+Catálogo sintético de PostgreSQL para fixtures de replay de cualquier tamaño:
+responde las consultas de catálogo de generar_diccionario, del extractor de
+metadata del dashboard y de SmartDataGenerator.analizar_base_datos como lo
+haría un esquema de N tablas (PK serial, código único, CHECK, FKs a tablas
+anteriores, comentarios, índices y secuencias).
+
+Uso: python benchmarks/catalogo_sintetico.py [tablas ...] [--dir DIRECTORIO]
+
+Por defecto genera 10, 1000 y 10000 tablas en <temp>/dbmanager_fixtures/
+(sintetico_<N>.json.gz), grabando las corridas de los módulos disponibles
+contra el catálogo con catalogo_replay.
+"""
+import hashlib
+import json
+import random
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from catalogo_replay import ErrorReplay, Fixture, grabar_fixture, modulos_disponibles
+
+
+ESCALAS     = (10, 1000, 10000)
+PREFIJOS    = ('mae', 'tab', 'cab', 'det', 'aud', 'tmp')
+RAICES      = ('cliente', 'producto', 'pedido', 'factura', 'almacen', 'empleado', 'proveedor',
+               'pago', 'envio', 'contrato', 'sucursal', 'moneda')
+# (nombre, data_type, udt_name, largo, precision, escala, nulos)
+COLUMNAS_EXTRA = [
+    ('email',         'character varying', 'varchar',   120,  None, None, 'YES'),
+    ('telefono',      'character varying', 'varchar',   20,   None, None, 'YES'),
+    ('direccion',     'text',              'text',      None, None, None, 'YES'),
+    ('cantidad',      'integer',           'int4',      None, 32,   0,    'YES'),
+    ('peso',          'numeric',           'numeric',   None, 10,   3,    'YES'),
+    ('fecha_fin',     'date',              'date',      None, None, None, 'YES'),
+    ('activo',        'boolean',           'bool',      None, None, None, 'NO'),
+    ('datos',         'jsonb',             'jsonb',     None, None, None, 'YES'),
+    ('codigo_postal', 'character',         'bpchar',    5,    None, None, 'YES'),
+    ('version',       'bigint',            'int8',      None, 64,   0,    'NO'),
+]
+_TIPO_DICCIONARIO = {'date': 'date', 'timestamp': 'timestamp', 'int8': 'bigint', 'int2': 'smallint',
+                     'text': 'text', 'numeric': 'numeric', 'jsonb': 'jsonb', 'int4': 'integer'}
+_CATEGORIA_TIPO   = {'character varying': 'TEXT', 'character': 'TEXT', 'text': 'TEXT',
+                     'integer': 'NUMERIC', 'bigint': 'NUMERIC', 'smallint': 'NUMERIC', 'numeric': 'NUMERIC',
+                     'timestamp without time zone': 'DATE/TIME', 'date': 'DATE/TIME',
+                     'boolean': 'BOOLEAN', 'jsonb': 'JSON'}
+
+
+def _columna(nombre, data_type, udt, largo=None, precision=None, escala=None, nulos='YES',
+             default=None, pk=False, fk=None, comentario=''):
+    return {'nombre': nombre, 'data_type': data_type, 'udt': udt, 'largo': largo,
+            'precision': precision, 'escala': escala, 'nulos': nulos, 'default': default,
+            'pk': pk, 'fk': fk, 'comentario': comentario}
+
+
+class CatalogoSintetico:
+    """Esquema de n_tablas tablas generado con una semilla fija."""
+
+    def __init__(self, n_tablas, esquema='sintetico', semilla=7):
+        self.esquema = esquema
+        rng          = random.Random(semilla)
+        self.tablas  = []
+        for i in range(1, n_tablas + 1):
+            nombre = f"{PREFIJOS[i % len(PREFIJOS)]}_{RAICES[i % len(RAICES)]}_{i:05d}"
+            refs   = rng.sample(self.tablas, min(len(self.tablas), rng.choice((0, 1, 1, 2, 3))))
+            self.tablas.append(self._tabla(rng, nombre, [r['nombre'] for r in refs]))
+        self.tablas.sort(key=lambda t: t['nombre'])
+        self._por_nombre = {t['nombre']: t for t in self.tablas}
+        self._reglas = [
+            ('SET cursor_tuple_fraction',              lambda p: (None, None)),
+            ('WITH objetos AS',                        self._overview_resumen),
+            ('AS total_tablas',                        self._overview_totales),
+            ('AS categoria_tipo',                      self._overview_tipos),
+            ('md5(string_agg',                         self._huellas),
+            ('ORDER BY c.table_name, c.attnum',        self._campos_esquema),
+            ('AND c.table_name = %s',                  self._campos_tabla),
+            ('ORDER BY table_name, ordinal_position',  self._columnas_esquema),
+            ('AND table_name = %s',                    self._columnas_tabla),
+            ('FROM information_schema.tables',         self._nombres_tablas),
+            ("constraint_type = 'PRIMARY KEY'",        self._pks),
+            ('unnest(c.conkey, c.confkey)',            self._fks),
+            ("constraint_type = 'CHECK'",              self._checks),
+            ("c.contype = 'u'",                        self._uniques),
+            ('FROM information_schema.sequences',      self._sequences),
+            ('FROM pg_indexes i',                      self._indices_diccionario),
+            ('FROM pg_indexes',                        self._indices),
+            ("obj_description(n.oid, 'pg_namespace')", self._esquemas),
+            ("WHERE c.relkind = 'r'",                  self._tablas_comentarios),
+            ('ON n.oid = c.connamespace',              self._constraints),
+            ('FROM cron.job',                          self._sin_pg_cron),
+        ]
+        # Secciones que el esquema sintético no tiene: procedimientos, funciones,
+        # vistas, triggers, types, tablespaces, extensiones, servidores y foráneas.
+        self._vacias = ('FROM pg_tablespace', 'FROM pg_extension', 'FROM pg_proc', 'FROM pg_trigger',
+                        "WHERE c.relkind = 'v'", 'FROM pg_type t', 'FROM pg_foreign_server',
+                        "WHERE c.relkind = 'f'")
+
+    @staticmethod
+    def _tabla(rng, nombre, refs):
+        columnas = [
+            _columna('id', 'integer', 'int4', precision=32, escala=0, nulos='NO',
+                     default=f"nextval('{nombre}_id_seq'::regclass)", pk=True, comentario='Identificador'),
+            _columna('codigo', 'character varying', 'varchar', 20, nulos='NO', comentario='Codigo unico'),
+            _columna('nombre', 'character varying', 'varchar', 100, nulos='NO'),
+            _columna('descripcion', 'text', 'text'),
+            _columna('fecha_registro', 'timestamp without time zone', 'timestamp', nulos='NO',
+                     default='now()'),
+            _columna('monto', 'numeric', 'numeric', precision=12, escala=2, default='0'),
+            _columna('estado', 'character', 'bpchar', 1, nulos='NO', default="'A'::bpchar",
+                     comentario='A: activo, I: inactivo'),
+        ]
+        for ref in refs:
+            columnas.append(_columna(f"id_{ref}", 'integer', 'int4', precision=32, escala=0, fk=ref,
+                                     comentario=f"Referencia a {ref}"))
+        for extra in rng.sample(COLUMNAS_EXTRA, rng.randint(0, 5)):
+            columnas.append(_columna(*extra, comentario=rng.choice(('', '', f"Dato de {extra[0]}"))))
+        return {'nombre': nombre, 'columnas': columnas, 'check': rng.random() < 0.5,
+                'comentario': f"Registro de {nombre.split('_')[1]}" if rng.random() < 0.7 else None}
+
+    def huella(self):
+        """md5 del esquema generado y de este archivo (que arma las respuestas):
+        un fixture grabado con otra huella ya no corresponde al catálogo."""
+        contenido = json.dumps([self.esquema, self.tablas], sort_keys=True).encode('utf-8')
+        return hashlib.md5(contenido + Path(__file__).read_bytes()).hexdigest()
+
+    # ── Resolución ────────────────────────────────────────────────────────────
+    def resolver(self, sql, params):
+        sql = ' '.join(sql.split())
+        for fragmento, regla in self._reglas:
+            if fragmento in sql:
+                return regla(params)
+        if any(fragmento in sql for fragmento in self._vacias):
+            return ['nombre', 'comentario'], []
+        raise ErrorReplay(f"consulta no soportada por el catalogo sintetico: {sql[:100]}")
+
+    def _del_esquema(self, params):
+        return self.tablas if params and params[0] == self.esquema else []
+
+    @staticmethod
+    def _sin_pg_cron(params):
+        raise ErrorReplay('relation "cron.job" does not exist')
+
+    def _esquemas(self, params):
+        return ['esquema', 'comentario'], [('public', 'standard public schema'),
+                                           (self.esquema, f"Esquema sintetico de {len(self.tablas)} tablas")]
+
+    def _nombres_tablas(self, params):
+        return ['table_name'], [(t['nombre'],) for t in self._del_esquema(params)]
+
+    def _tablas_comentarios(self, params):
+        return ['tabla', 'comentario'], [(t['nombre'], t['comentario']) for t in self._del_esquema(params)]
+
+    @staticmethod
+    def _restricciones(tabla):
+        nombre = tabla['nombre']
+        nombres = [f"{nombre}_pkey", f"{nombre}_codigo_key"]
+        nombres += [f"fk_{nombre}_{c['fk']}" for c in tabla['columnas'] if c['fk']]
+        if tabla['check']:
+            nombres.append(f"ck_{nombre}_monto")
+        return nombres
+
+    def _constraints(self, params):
+        filas = sorted((n, None) for t in self._del_esquema(params) for n in self._restricciones(t))
+        return ['constraint_name', 'comentario'], filas
+
+    def _indices_diccionario(self, params):
+        return ['indice', 'comentario'], [(f"idx_{t['nombre']}_fecha", None) for t in self._del_esquema(params)]
+
+    # Atributos del diccionario: mismas reglas que _SQL_CAMPOS de generar_diccionario.
+    @staticmethod
+    def _campo_diccionario(c):
+        if c['udt'] in ('bpchar', 'varchar'):
+            tipo = f"varchar({c['largo'] or 255})"
+        else:
+            tipo = _TIPO_DICCIONARIO.get(c['udt'], c['udt'])
+        if c['data_type'] == 'text':
+            valores = 'Cadena tipo text'
+        elif c['data_type'] == 'numeric':
+            valores = 'Numero decimal'
+        elif c['data_type'] == 'jsonb':
+            valores = 'Representacion binaria de los datos JSON'
+        elif c['data_type'] in ('integer', 'smallint', 'bigint'):
+            valores = 'Numero entero positivo'
+        elif c['data_type'].startswith('timestamp') or c['data_type'] == 'date':
+            valores = 'dd/mm/aaaa hh:mm:ss'
+        elif c['largo'] is not None:
+            valores = f"Cadena de hasta {c['largo']} caracteres"
+        else:
+            valores = 'Valor especifico del tipo de dato'
+        return (c['nombre'], tipo, 'SI' if c['nulos'] == 'YES' else 'NO', 'SI' if c['pk'] else '',
+                'SI' if c['fk'] else '', c['comentario'], valores)
+
+    def _campos(self, tablas):
+        return (['table_name', 'nombre_columna', 'tipo', 'permite_nulos', 'pk', 'fk', 'descripcion_columna',
+                 'valores_permitidos'],
+                [(t['nombre'],) + self._campo_diccionario(c) for t in tablas for c in t['columnas']])
+
+    def _campos_esquema(self, params):
+        if len(params) > 1:
+            pedidas = set(params[1])
+            return self._campos([t for t in self._del_esquema(params) if t['nombre'] in pedidas])
+        return self._campos(self._del_esquema(params))
+
+    def _campos_tabla(self, params):
+        tabla = self._por_nombre.get(params[1]) if params[0] == self.esquema else None
+        columnas, filas = self._campos([tabla] if tabla else [])
+        return columnas[1:], [f[1:] for f in filas]
+
+    def _huellas(self, params):
+        filas = []
+        for tabla in self._del_esquema(params):
+            texto = chr(30).join(chr(31).join(self._campo_diccionario(c)) for c in tabla['columnas'])
+            filas.append((tabla['nombre'], hashlib.md5(texto.encode('utf-8')).hexdigest(),
+                          len(tabla['columnas'])))
+        return ['table_name', 'md5', 'count'], filas
+
+    # information_schema.columns (analizar_base_datos)
+    @staticmethod
+    def _columna_information_schema(c, posicion):
+        return (c['nombre'], c['data_type'], c['udt'], c['largo'], c['precision'], c['escala'],
+                c['nulos'], c['default'], posicion)
+
+    _COLUMNAS_IS = ['column_name', 'data_type', 'udt_name', 'character_maximum_length', 'numeric_precision',
+                    'numeric_scale', 'is_nullable', 'column_default', 'ordinal_position']
+
+    def _columnas_esquema(self, params):
+        return (['table_name'] + self._COLUMNAS_IS,
+                [(t['nombre'],) + self._columna_information_schema(c, i)
+                 for t in self._del_esquema(params) for i, c in enumerate(t['columnas'], 1)])
+
+    def _columnas_tabla(self, params):
+        tabla = self._por_nombre.get(params[1]) if params[0] == self.esquema else None
+        return self._COLUMNAS_IS, [self._columna_information_schema(c, i)
+                                   for i, c in enumerate(tabla['columnas'] if tabla else [], 1)]
+
+    def _pks(self, params):
+        return ['table_name', 'column_name'], [(t['nombre'], 'id') for t in self._del_esquema(params)]
+
+    def _fks(self, params):
+        return (['relname', 'conname', 'attname', 'relname', 'attname'],
+                [(t['nombre'], f"fk_{t['nombre']}_{c['fk']}", c['nombre'], c['fk'], 'id')
+                 for t in self._del_esquema(params) for c in t['columnas'] if c['fk']])
+
+    def _checks(self, params):
+        return ['table_name', 'check_clause'], [(t['nombre'], '(monto >= (0)::numeric)')
+                                                for t in self._del_esquema(params) if t['check']]
+
+    def _uniques(self, params):
+        return (['relname', 'conname', 'attname'],
+                [(t['nombre'], f"{t['nombre']}_codigo_key", 'codigo') for t in self._del_esquema(params)])
+
+    def _sequences(self, params):
+        return (['sequence_name', 'data_type', 'start_value', 'minimum_value', 'maximum_value', 'increment'],
+                [(f"{t['nombre']}_id_seq", 'integer', '1', '1', '2147483647', '1')
+                 for t in self._del_esquema(params)])
+
+    def _indices(self, params):
+        filas = []
+        for t in self._del_esquema(params):
+            n, e = t['nombre'], self.esquema
+            filas += [(n, f"{n}_codigo_key", f"CREATE UNIQUE INDEX {n}_codigo_key ON {e}.{n} USING btree (codigo)"),
+                      (n, f"{n}_pkey", f"CREATE UNIQUE INDEX {n}_pkey ON {e}.{n} USING btree (id)"),
+                      (n, f"idx_{n}_fecha", f"CREATE INDEX idx_{n}_fecha ON {e}.{n} USING btree (fecha_registro)")]
+        return ['tablename', 'indexname', 'indexdef'], filas
+
+    # Dashboard (sin parámetros: toda la base, que aquí es el esquema sintético)
+    def _overview_resumen(self, params):
+        n = len(self.tablas)
+        return ['esquema', 'tipo_objeto', 'cantidad'], [(self.esquema, 'SEQUENCE', n), (self.esquema, 'TABLE', n)]
+
+    def _overview_totales(self, params):
+        n = len(self.tablas)
+        return (['total_tablas', 'total_vistas', 'total_funciones', 'total_procedimientos', 'total_triggers',
+                 'total_sequences', 'total_esquemas'], [(n, 0, 0, 0, 0, n, 1 if n else 0)])
+
+    def _overview_tipos(self, params):
+        conteo = {}
+        for t in self.tablas:
+            for c in t['columnas']:
+                conteo[c['data_type']] = conteo.get(c['data_type'], 0) + 1
+        filas = sorted(((_CATEGORIA_TIPO.get(d, 'OTHER'), d, n) for d, n in conteo.items()),
+                       key=lambda f: -f[2])
+        return ['categoria_tipo', 'tipo_dato_especifico', 'cantidad_columnas'], filas
+
+
+def ruta_fixture(n_tablas, directorio):
+    return Path(directorio) / f"sintetico_{n_tablas}.json.gz"
+
+
+def generar_fixture(n_tablas, ruta, verboso=True, catalogo=None):
+    """Graba en ruta las corridas de los módulos contra un catálogo de n_tablas."""
+    catalogo = catalogo or CatalogoSintetico(n_tablas)
+    conexion = {'host': 'sintetico', 'puerto': '5432', 'bd': 'sintetica', 'usuario': 'postgres',
+                'esquema': catalogo.esquema}
+    if verboso:
+        print(f"Catalogo sintetico de {n_tablas} tablas:")
+    return grabar_fixture(lambda: (catalogo.resolver, None), conexion, ruta,
+                          origen=f"sintetico:{n_tablas}", verboso=verboso, huella_catalogo=catalogo.huella())
+
+
+def cargar_o_generar(n_tablas, ruta, verboso=True):
+    """Fixture de ruta si se grabó con este mismo catálogo y con los módulos que
+    hoy se pueden correr; si no (o no existe) se vuelve a grabar."""
+    catalogo = CatalogoSintetico(n_tablas)
+    if Path(ruta).exists():
+        try:
+            fixture = Fixture.cargar(ruta)
+        except ValueError as e:
+            motivo = str(e)
+        else:
+            if fixture.huella_catalogo != catalogo.huella():
+                motivo = "grabado con otro catalogo"
+            elif set(fixture.modulos) != set(modulos_disponibles(fixture.conexion)):
+                motivo = f"grabado con los modulos {', '.join(fixture.modulos) or 'ninguno'}"
+            else:
+                return fixture
+        if verboso:
+            print(f"{ruta}: {motivo}, se vuelve a grabar")
+    generar_fixture(n_tablas, ruta, verboso, catalogo)
+    return Fixture.cargar(ruta)
+
+
+def main():
+    args       = sys.argv[1:]
+    directorio = Path(tempfile.gettempdir()) / "dbmanager_fixtures"
+    if '--dir' in args:
+        i = args.index('--dir')
+        directorio = Path(args[i + 1])
+        del args[i:i + 2]
+    escalas = [int(a) for a in args] or list(ESCALAS)
+    for n in escalas:
+        generar_fixture(n, ruta_fixture(n, directorio))
+
+
+if __name__ == "__main__":
+    main()
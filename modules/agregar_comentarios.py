@@ -1,10 +1,17 @@
 import sys
+from pathlib import Path
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
 from datetime import datetime
 from typing import List, Tuple
 import psycopg2
 
+if not getattr(sys, 'frozen', False):
+    sys.path.insert(0, str(Path(__file__).parent))
+from indice_busqueda import IndiceBusqueda
+
+_MAX_FILTRO = 500
+
 _OBJECT_SQL: dict = {
     "Procedimientos": ("""
         SELECT p.proname, obj_description(p.oid, 'pg_proc')
@@ -108,6 +115,7 @@ class ComentariosGUI:
         self.tipo_objeto_actual: str = None
         self.objetos_actuales: List[Tuple[str, str]] = []
         self.widgets_comentarios: dict = {}
+        self.indice: IndiceBusqueda = None
         self.modo_actual = "tablas"
         self.root = tk.Tk()
         self.root.title(f"Agregar Comentarios - {schema} @ {database}")
@@ -184,6 +192,8 @@ class ComentariosGUI:
                 return
             self.tablas_nombres = [r[0] for r in rows]
             self.tablas_con_comentarios = [(r[0], r[1] or '') for r in rows]
+            self.indice = self._construir_indice()
+            self.buscar_var.set('')
             self.combo_items['values'] = self.tablas_nombres
             print(f"Se cargaron {len(rows)} tablas")
         except Exception as e:
@@ -193,6 +203,40 @@ class ComentariosGUI:
             else:
                 print(f"Error al cargar tablas: {e}")
 
+    def _construir_indice(self) -> IndiceBusqueda:
+        """Search index over table and column names and comments (one query)."""
+        indice = IndiceBusqueda()
+        for tabla, comentario in self.tablas_con_comentarios:
+            indice.agregar(tabla, tabla, comentario)
+        try:
+            self.cursor.execute("""
+                SELECT c.relname, a.attname, COALESCE(col_description(c.oid, a.attnum), '')
+                FROM pg_class c
+                JOIN pg_namespace n ON n.oid = c.relnamespace
+                JOIN pg_attribute a ON a.attrelid = c.oid AND a.attnum > 0 AND NOT a.attisdropped
+                WHERE c.relkind = 'r' AND n.nspname = %s
+            """, (self.schema,))
+            for tabla, columna, comentario in self.cursor.fetchall():
+                indice.agregar(f"{tabla}.{columna}", columna, comentario)
+        except Exception as e:
+            print(f"Error al indexar columnas: {e}")
+        indice.construir()
+        return indice
+
+    def filtrar_tablas(self, *_):
+        """Narrows the table combobox to tables matching the search box, by table
+        or column name/comment, most relevant first."""
+        consulta = self.buscar_var.get()
+        if not consulta.strip() or self.indice is None:
+            self.combo_items['values'] = self.tablas_nombres
+            self.lbl_filtro.config(text="")
+            return
+        tablas = {}
+        for clave in self.indice.buscar(consulta, limite=_MAX_FILTRO):
+            tablas.setdefault(clave.split('.', 1)[0], None)
+        self.combo_items['values'] = list(tablas)
+        self.lbl_filtro.config(text=f"{len(tablas)} tabla(s)")
+
     def obtener_campos_tabla(self, tabla: str) -> List[Tuple[str, str, str]]:
         """Returns (column_name, data_type, comment) for every column of a table."""
         try:
@@ -293,6 +337,15 @@ class ComentariosGUI:
                                         state='readonly', width=40, font=('Arial', 10))
         self.combo_items.pack(side=tk.LEFT, padx=5)
         self.combo_items.bind('<<ComboboxSelected>>', self.on_item_seleccionado)
+        ttk.Label(self.selector_frame, text="Buscar:",
+                  font=('Arial', 10)).pack(side=tk.LEFT, padx=(15, 5))
+        self.buscar_var = tk.StringVar()
+        ttk.Entry(self.selector_frame, textvariable=self.buscar_var, width=30,
+                  font=('Arial', 10)).pack(side=tk.LEFT, padx=5)
+        self.lbl_filtro = ttk.Label(self.selector_frame, text="", font=('Arial', 9),
+                                    foreground='gray')
+        self.lbl_filtro.pack(side=tk.LEFT, padx=5)
+        self.buscar_var.trace_add('write', self.filtrar_tablas)
 
         btn_frame = ttk.Frame(self.root, padding="10")
         btn_frame.pack(side=tk.TOP, fill=tk.X)
@@ -432,7 +485,7 @@ class ComentariosGUI:
         if self.modo_actual == "tablas":
             self.tipo_objeto_frame.pack_forget()
             self.selector_frame.pack(side=tk.TOP, fill=tk.X, before=self.main_frame)
-            self.combo_items['values'] = self.tablas_nombres
+            self.filtrar_tablas()
             self.item_var.set('')
             self.limpiar_frame_campos()
             self.mostrar_comentarios_tablas()
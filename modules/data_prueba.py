@@ -1,7 +1,8 @@
 import sys
 import os
 import psycopg2
-from psycopg2.extras import execute_batch
+from psycopg2.extras import execute_batch, execute_values
+from psycopg2 import sql
 import json
 import random
 from datetime import datetime, timedelta
@@ -10,7 +11,178 @@ import re
 from collections import defaultdict
 from pathlib import Path
 import io
-import csv
+import struct
+import time
+import uuid
+import hashlib
+import itertools
+
+# ── COPY binario ──────────────────────────────────────────────────────────────
+# Cabecera/terminador del formato binario de COPY y codificadores por udt_name.
+# Tipos fuera de este mapa hacen que la estrategia 'copy_binario' no aplique.
+_PGCOPY_CABECERA = b'PGCOPY\n\xff\r\n\x00' + struct.pack('!ii', 0, 0)
+_PGCOPY_FIN      = struct.pack('!h', -1)
+_PGCOPY_NULL     = struct.pack('!i', -1)
+_PG_EPOCH        = datetime(2000, 1, 1)
+_PG_EPOCH_DIA    = _PG_EPOCH.toordinal()
+_S_H, _S_I, _S_Q = struct.Struct('!h'), struct.Struct('!i'), struct.Struct('!q')
+_NEXTVAL         = re.compile(r"nextval\('((?:[^']|'')+)'(?:::regclass)?\)")
+
+
+def _valor_texto(valor):
+    """Representación textual de un valor tal como la recibe COPY."""
+    if isinstance(valor, datetime):
+        return valor.isoformat()
+    if isinstance(valor, bool):
+        return 't' if valor else 'f'
+    if isinstance(valor, (list, dict)):
+        return json.dumps(valor)
+    return str(valor)
+
+
+def _bin_timestamp(valor):
+    if not isinstance(valor, datetime):
+        valor = datetime.combine(valor, datetime.min.time())
+    delta = valor - _PG_EPOCH
+    return _S_Q.pack((delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds)
+
+
+_CODIFICADORES_BINARIOS = {
+    'int2':      _S_H.pack,
+    'int4':      _S_I.pack,
+    'int8':      _S_Q.pack,
+    'float4':    struct.Struct('!f').pack,
+    'float8':    struct.Struct('!d').pack,
+    'bool':      lambda v: b'\x01' if v else b'\x00',
+    'varchar':   lambda v: _valor_texto(v).encode('utf-8'),
+    'bpchar':    lambda v: _valor_texto(v).encode('utf-8'),
+    'text':      lambda v: _valor_texto(v).encode('utf-8'),
+    'date':      lambda v: _S_I.pack(v.toordinal() - _PG_EPOCH_DIA),
+    'timestamp': _bin_timestamp,
+    'uuid':      lambda v: uuid.UUID(str(v)).bytes,
+}
+
+# ── COPY texto ────────────────────────────────────────────────────────────────
+# Serializador compilado por tabla: una función generada con un '%s\t%s...\n'
+# por fila. Los tipos de _TIPOS_SIN_ESCAPE van directo a '%s' (str() nunca produce
+# tabuladores, saltos ni barras); el resto pasa por su formateador.
+_ESCAPE_COPY_TEXTO = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+_TIPOS_SIN_ESCAPE  = {'int2', 'int4', 'int8', 'oid', 'numeric', 'float4', 'float8',
+                      'date', 'timestamp', 'timestamptz', 'uuid'}
+
+
+def _texto_escapado(valor):
+    if valor.__class__ is not str:
+        valor = _valor_texto(valor)
+    if '\\' in valor or '\t' in valor or '\n' in valor or '\r' in valor:
+        return valor.translate(_ESCAPE_COPY_TEXTO)
+    return valor
+
+
+def _texto_bool(valor):
+    if valor is True:
+        return 't'
+    if valor is False:
+        return 'f'
+    return _texto_escapado(valor)
+
+
+_FORMATEADORES_TEXTO = {'bool': _texto_bool}
+
+
+def _compilar_serializador_texto(tipos):
+    """Devuelve serializar(filas) -> str en formato COPY texto para filas-tupla
+    con columnas de los tipos (udt_name) indicados."""
+    espacio = {'N': '\\N'}
+    celdas  = []
+    for i, tipo in enumerate(tipos):
+        if tipo in _TIPOS_SIN_ESCAPE:
+            celdas.append(f"N if c{i} is None else c{i}")
+        else:
+            espacio[f"f{i}"] = _FORMATEADORES_TEXTO.get(tipo, _texto_escapado)
+            celdas.append(f"N if c{i} is None else f{i}(c{i})")
+    variables = ''.join(f"c{i}, " for i in range(len(tipos)))
+    plantilla = '\t'.join(['%s'] * len(tipos)) + '\n'
+    codigo    = (f"def serializar(filas):\n"
+                 f"    return ''.join([{plantilla!r} % ({', '.join(celdas)},)\n"
+                 f"                    for {variables}in filas])\n")
+    exec(codigo, espacio)
+    return espacio['serializar']
+
+
+# ── Alfabetos para códigos ────────────────────────────────────────────────────
+def _tabla_alfabeto(alfabeto):
+    """(tabla, borrar) para bytes.translate: cada byte se mapea a un carácter del
+    alfabeto y se descartan los bytes altos que sesgarían la distribución."""
+    n      = len(alfabeto)
+    limite = 256 // n * n
+    return bytes(ord(alfabeto[b % n]) for b in range(256)), bytes(range(limite, 256))
+
+
+_LETRAS       = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+_DIGITOS      = '0123456789'
+_ALFANUMERICO = _LETRAS + _DIGITOS
+_MINUSCULAS   = 'abcdefghijklmnopqrstuvwxyz'
+_TABLAS_ALFABETO = {a: _tabla_alfabeto(a) for a in (_LETRAS, _DIGITOS, _ALFANUMERICO, _MINUSCULAS)}
+
+
+# ── RNG basado en contador ────────────────────────────────────────────────────
+_M64    = (1 << 64) - 1
+_GAMMA  = 0x9E3779B97F4A7C15
+
+
+def _mix64(z):
+    """Finalizador de SplitMix64: biyección de 64 bits con buena avalancha."""
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _M64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _M64
+    return z ^ (z >> 31)
+
+
+class _RngContador(random.Random):
+    """random.Random cuyo n-ésimo valor es mix64(clave + n·gamma).
+
+    Reposicionarlo en otra clave es O(1) (a diferencia de reseed del Mersenne
+    Twister), así cada celda (tabla, columna, fila) tiene su propio flujo y
+    cualquier rango de filas se puede regenerar sin reproducir las anteriores.
+    """
+
+    def seed(self, a=None, version=2):
+        if a is None:
+            a = random.SystemRandom().getrandbits(64)
+        elif not isinstance(a, int):
+            a = int.from_bytes(hashlib.blake2b(str(a).encode('utf-8'), digest_size=8).digest(), 'big')
+        self.posicionar(a & _M64)
+        self.gauss_next = None
+
+    def posicionar(self, clave):
+        self._clave    = clave
+        self._contador = 0
+
+    def _siguiente(self):
+        self._contador += 1
+        return _mix64((self._clave + self._contador * _GAMMA) & _M64)
+
+    def random(self):
+        return (self._siguiente() >> 11) * (1.0 / 9007199254740992.0)
+
+    def getrandbits(self, k):
+        if k <= 64:
+            return self._siguiente() >> (64 - k)
+        valor = 0
+        for _ in range(-(-k // 64)):
+            valor = (valor << 64) | self._siguiente()
+        return valor >> (-k % 64)
+
+    def getstate(self):
+        return (self._clave, self._contador, self.gauss_next)
+
+    def setstate(self, state):
+        self._clave, self._contador, self.gauss_next = state
+
+
+class GeneracionCancelada(Exception):
+    """La generación se detuvo a pedido del usuario en el límite de un chunk."""
+
 
 class SmartDataGenerator:
     _NOMBRES      = ['Juan', 'María', 'Carlos', 'Ana', 'Luis', 'Carmen', 'Pedro', 'Rosa',
@@ -47,6 +219,8 @@ class SmartDataGenerator:
         'lorem', 'ipsum', 'dolor', 'sit', 'amet', 'consectetur', 'adipiscing', 'elit',
         'sed', 'eiusmod', 'tempor', 'incididunt', 'labore', 'dolore', 'magna', 'aliqua',
     ]
+    _PALABRAS_CORPUS = 65536
+    _BYTES_RESERVA   = 8192
 
     _CTX = [
         (r'(nombre_completo|full_name|nombre_apellido)',                        'generar_nombre_completo'),
@@ -81,6 +255,22 @@ class SmartDataGenerator:
         (r'(observacion|observation|nota|comment|comentario)',                  'generar_observacion'),
     ]
 
+    # Candidatas de la selección adaptativa, en orden de prueba sobre el primer chunk.
+    _ESTRATEGIAS_INSERCION = ('copy', 'copy_binario', 'values', 'prepared')
+    _METODOS_INSERCION = {
+        'copy':         '_insertar_con_copy',
+        'copy_binario': '_insertar_con_copy_binario',
+        'values':       '_insertar_con_values',
+        'prepared':     '_insertar_con_prepared',
+        'batch':        '_insertar_con_batch',
+    }
+    _MIN_FILAS_BENCHMARK = 50
+    # Estrategias cuyo payload puede prepararse fuera del hilo que envía (pipeline).
+    _SERIALIZADORES = {
+        'copy':         ('_serializar_copy', '_enviar_copy'),
+        'copy_binario': ('_serializar_copy_binario', '_enviar_copy_binario'),
+    }
+
 
     def __init__(self, host, puerto, bd, usuario, password, esquema, config_file=None):
         self.host     = host
@@ -94,13 +284,26 @@ class SmartDataGenerator:
         self.metadata = {
             'tablas': [], 'columnas': {}, 'pks': {}, 'fks': {},
             'checks': {}, 'uniques': {}, 'sequences': {}, 'indices': {},
-            'orden_carga': [], 'grafos_dependencias': {}
+            'orden_carga': [], 'grafos_dependencias': {}, 'fks_diferidas': {}
         }
         self.data_cache      = {}
+        self._cursor_lectura = None
         self.generated_values = {}
+        self._diferidas       = set()
+        self._fk_por_columna  = {}
+        self._unica_simple    = {}
+        self._unicas_compuestas = {}
+        self._fila_fk         = {}
+        self._tablas_con_ids  = set()
+        self._filas_diferidas = {}
+        self._n_preparadas    = 0       # sufijo de las sentencias PREPARE de esta conexión
+        self.cancelacion      = None    # threading.Event opcional, se consulta entre chunks
+        self.al_progresar     = None    # callback(tabla, filas_procesadas, filas_tabla)
+        self._mantenimiento   = None
         self.stats = {
             'total_registros': 0, 'por_tabla': {},
-            'tiempo_inicio': None, 'tiempo_fin': None, 'errores': []
+            'tiempo_inicio': None, 'tiempo_fin': None, 'errores': [],
+            'estrategias': {}
         }
         if getattr(sys, 'frozen', False):
             _root = Path(sys.executable).parent
@@ -109,8 +312,21 @@ class SmartDataGenerator:
         if config_file is None:
             config_file = _root / "resources" / "config_data_prueba.json"
         self.config = self.cargar_config(config_file)
-        if self.config.get('seeds', {}).get('random_seed'):
-            random.seed(self.config['seeds']['random_seed'])
+        # Con semilla, cada celda se genera desde su propio flujo (semilla, tabla,
+        # columna, fila); sin semilla se usa un Mersenne Twister normal (más rápido).
+        self._semilla        = self.config.get('seeds', {}).get('random_seed')
+        self._claves_columna = {}
+        self._fecha_ref      = None
+        if self._semilla is not None:
+            self.rng = _RngContador(self._semilla)
+            self._fecha_ref = datetime.strptime(
+                self.config['seeds'].get('fecha_referencia') or '2025-01-01', '%Y-%m-%d')
+        else:
+            self.rng = random.Random()
+        self._corpus          = None
+        self._inicios_corpus  = None
+        self._cubre_corpus    = 0
+        self._reservas        = {}
         self.faker = None
         self._init_faker()
 
@@ -119,17 +335,32 @@ class SmartDataGenerator:
             from faker import Faker
             locale = self.config.get('faker', {}).get('locale', 'es_ES')
             self.faker = Faker(locale)
+            if self._semilla is not None:
+                self.faker.random = self.rng
             print(f"[OK] Faker inicializado con locale: {locale}")
         except ImportError:
             print("[WARN] Faker no esta instalado. Usando generadores basicos.")
             print("  Para mejores resultados, instala: pip install faker")
             self.faker = None
 
+    def _ahora(self):
+        """Instante de referencia para fechas relativas (fijo si hay semilla)."""
+        return self._fecha_ref or datetime.now()
+
+    def _posicionar_rng(self, tabla, columna, fila):
+        """Sitúa el RNG en el flujo de la celda (tabla, columna, fila)."""
+        clave = self._claves_columna.get((tabla, columna))
+        if clave is None:
+            digest = hashlib.blake2b(f"{self._semilla}|{tabla}|{columna}".encode('utf-8'),
+                                     digest_size=8).digest()
+            clave  = self._claves_columna[(tabla, columna)] = int.from_bytes(digest, 'big')
+        self.rng.posicionar(_mix64(clave ^ ((fila * _GAMMA) & _M64)))
+
     def _faker_or(self, attr, fallback):
         """Usa faker si está disponible, si no elige de la lista fallback."""
         if self.faker:
             return getattr(self.faker, attr)()
-        return random.choice(fallback)
+        return self.rng.choice(fallback)
 
     def inferir_contexto_columna(self, nombre_columna):
         nombre_lower = nombre_columna.lower()
@@ -153,61 +384,61 @@ class SmartDataGenerator:
         return f"{self.generar_nombre_persona(columna_info)} {self.generar_apellido(columna_info)}"
 
     def generar_dni(self, columna_info):
-        return str(random.randint(10000000, 99999999))
+        return str(self.rng.randint(10000000, 99999999))
 
     def generar_ruc(self, columna_info):
-        tipo = random.choice(['10', '15', '20'])
-        base = str(random.randint(10000000, 99999999))
-        return tipo + base + str(random.randint(0, 9))
+        tipo = self.rng.choice(['10', '15', '20'])
+        base = str(self.rng.randint(10000000, 99999999))
+        return tipo + base + str(self.rng.randint(0, 9))
 
     def generar_pasaporte(self, columna_info):
-        return f"{random.choice(['P', 'A', 'E'])}{random.randint(10000000, 99999999)}"
+        return f"{self.rng.choice(['P', 'A', 'E'])}{self.rng.randint(10000000, 99999999)}"
 
     def generar_email(self, columna_info):
         if self._tipo_columna(columna_info) in ('int2', 'smallint', 'int4', 'integer', 'int8', 'bigint'):
-            return random.randint(0, 1)
+            return self.rng.randint(0, 1)
         if self.faker:
             return self.faker.email()
-        nombre = ''.join(random.choices('abcdefghijklmnopqrstuvwxyz', k=8))
-        return f"{nombre}@{random.choice(self._DOMINIOS)}"
+        nombre = self._caracteres(_MINUSCULAS, 8)
+        return f"{nombre}@{self.rng.choice(self._DOMINIOS)}"
 
     def generar_telefono(self, columna_info):
-        if random.choice([True, False]):
-            return f"9{random.randint(10000000, 99999999)}"
-        return f"01{random.randint(1000000, 9999999)}"
+        if self.rng.choice([True, False]):
+            return f"9{self.rng.randint(10000000, 99999999)}"
+        return f"01{self.rng.randint(1000000, 9999999)}"
 
     def generar_direccion(self, columna_info):
         if self.faker:
             return self.faker.address().replace('\n', ', ')
-        return f"{random.choice(self._DIR_TIPOS)} {random.choice(self._DIR_CALLES)} {random.randint(100, 999)}"
+        return f"{self.rng.choice(self._DIR_TIPOS)} {self.rng.choice(self._DIR_CALLES)} {self.rng.randint(100, 999)}"
 
     def generar_ciudad(self, columna_info):
-        return random.choice(self._CIUDADES)
+        return self.rng.choice(self._CIUDADES)
 
     def generar_pais(self, columna_info):
         return self._faker_or('country', self._PAISES)
 
     def generar_codigo_postal(self, columna_info):
-        return f"LIMA{random.randint(1, 99):02d}"
+        return f"LIMA{self.rng.randint(1, 99):02d}"
 
     def generar_latitud(self, columna_info):
-        return round(random.uniform(-18.35, 0), 6)
+        return round(self.rng.uniform(-18.35, 0), 6)
 
     def generar_longitud(self, columna_info):
-        return round(random.uniform(-81.33, -68.65), 6)
+        return round(self.rng.uniform(-81.33, -68.65), 6)
 
     def generar_empresa(self, columna_info):
         if self.faker:
             return self.faker.company()
-        return f"{random.choice(self._EMP_PREF)} {random.choice(self._EMP_NOMB)} {random.choice(self._EMP_SUF)}"
+        return f"{self.rng.choice(self._EMP_PREF)} {self.rng.choice(self._EMP_NOMB)} {self.rng.choice(self._EMP_SUF)}"
 
     def generar_estado(self, columna_info):
         if self._tipo_columna(columna_info) in ('int2', 'smallint', 'int4', 'integer', 'int8', 'bigint'):
-            return random.randint(0, 5)
-        return random.choice(self._ESTADOS)
+            return self.rng.randint(0, 5)
+        return self.rng.choice(self._ESTADOS)
 
     def generar_boolean_activo(self, columna_info):
-        prob = random.random() < 0.8
+        prob = self.rng.random() < 0.8
         tipo = self._tipo_columna(columna_info)
         if tipo in ('int2', 'smallint', 'int4', 'integer', 'int8', 'bigint', 'numeric', 'decimal'):
             return 1 if prob else 0
@@ -216,45 +447,43 @@ class SmartDataGenerator:
         return prob
 
     def generar_usuario(self, columna_info):
-        return random.choice(self._USUARIOS)
+        return self.rng.choice(self._USUARIOS)
 
     def generar_fecha_creacion(self, columna_info):
-        return datetime.now() - timedelta(days=random.randint(1, 365))
+        return self._ahora() - timedelta(days=self.rng.randint(1, 365))
 
     def generar_fecha_modificacion(self, columna_info):
-        return datetime.now() - timedelta(days=random.randint(0, 180))
+        return self._ahora() - timedelta(days=self.rng.randint(0, 180))
 
     def generar_monto(self, columna_info):
         scale = columna_info.get('scale', 2)
-        rango = random.choice([(10, 100), (100, 1000), (1000, 10000), (10000, 100000)])
-        return Decimal(str(round(random.uniform(*rango), scale)))
+        rango = self.rng.choice([(10, 100), (100, 1000), (1000, 10000), (10000, 100000)])
+        return Decimal(str(round(self.rng.uniform(*rango), scale)))
 
     def generar_porcentaje(self, columna_info):
-        return Decimal(str(round(random.uniform(0, 100), 2)))
+        return Decimal(str(round(self.rng.uniform(0, 100), 2)))
 
     def generar_url(self, columna_info):
         if self.faker:
             return self.faker.url()
-        return f"https://www.{random.choice(self._URL_DOMINIOS)}/pagina/{random.randint(1, 100)}"
+        return f"https://www.{self.rng.choice(self._URL_DOMINIOS)}/pagina/{self.rng.randint(1, 100)}"
 
     def generar_ip(self, columna_info):
         if self.faker:
             return self.faker.ipv4()
-        return f"{random.randint(1,255)}.{random.randint(0,255)}.{random.randint(0,255)}.{random.randint(1,255)}"
+        return f"{self.rng.randint(1,255)}.{self.rng.randint(0,255)}.{self.rng.randint(0,255)}.{self.rng.randint(1,255)}"
 
     def generar_codigo(self, columna_info):
         max_len = columna_info.get('max_length') or 10
-        length  = min(random.randint(6, 12), max_len)
-        letras  = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
-        numeros = '0123456789'
+        length  = min(self.rng.randint(6, 12), max_len)
         if length >= 8:
-            return f"{''.join(random.choices(letras, k=3))}-{''.join(random.choices(numeros, k=min(4, length-4)))}"
-        return ''.join(random.choices(letras + numeros, k=length))
+            return f"{self._caracteres(_LETRAS, 3)}-{self._caracteres(_DIGITOS, min(4, length-4))}"
+        return self._caracteres(_ALFANUMERICO, length)
 
     def generar_descripcion(self, columna_info):
         if self.faker:
             return self.faker.text(max_nb_chars=min(columna_info.get('max_length', 200), 200))
-        return random.choice(self._DESCRIPCIONES)
+        return self.rng.choice(self._DESCRIPCIONES)
 
     def generar_observacion(self, columna_info):
         return self._faker_or('sentence', self._OBSERVACIONES)
@@ -266,10 +495,50 @@ class SmartDataGenerator:
         elif max_len <= 3:
             length = 3
         elif max_len <= 5:
-            length = random.randint(2, min(4, max_len))
+            length = self.rng.randint(2, min(4, max_len))
         else:
-            length = random.randint(2, 5)
-        return ''.join(random.choices('ABCDEFGHIJKLMNOPQRSTUVWXYZ', k=length))
+            length = self.rng.randint(2, 5)
+        return self._caracteres(_LETRAS, length)
+
+    # ── Motor de texto ────────────────────────────────────────────────────────
+    def _caracteres(self, alfabeto, k):
+        """k caracteres aleatorios del alfabeto, tomados de una reserva de bytes
+        traducida en bloque. Con semilla se sortean por celda para no romper el
+        acceso aleatorio por fila."""
+        if k <= 0:
+            return ''
+        tabla, borrar = _TABLAS_ALFABETO[alfabeto]
+        if self._semilla is not None:
+            texto = ''
+            while len(texto) < k:
+                texto += self.rng.randbytes(k + 4).translate(tabla, borrar).decode('ascii')
+            return texto[:k]
+        reserva, pos = self._reservas.get(alfabeto, ('', 0))
+        if pos + k > len(reserva):
+            bloque  = self.rng.randbytes(max(self._BYTES_RESERVA, 2 * k))
+            reserva = reserva[pos:] + bloque.translate(tabla, borrar).decode('ascii')
+            pos     = 0
+        self._reservas[alfabeto] = (reserva, pos + k)
+        return reserva[pos:pos + k]
+
+    def _preparar_corpus(self, max_len):
+        """Texto precomputado con palabras al azar y el offset de inicio de cada una.
+        Los textos empiezan en una de las primeras _PALABRAS_CORPUS palabras; detrás
+        se añaden max_len + 2 palabras para que cualquier porción quepa."""
+        palabras = self._PALABRAS + [p.strip() for p in self.config.get('texto', {}).get('palabras_personalizadas', [])
+                                     if isinstance(p, str) and p.strip()]
+        # Con semilla el corpus sale de su propio Random(semilla): al ampliarlo por un
+        # max_len mayor conserva el mismo prefijo y los textos ya generados no cambian.
+        rng     = random.Random(self._semilla) if self._semilla is not None else self.rng
+        corpus  = ' '.join(rng.choices(palabras, k=self._PALABRAS_CORPUS + max_len + 2))
+        inicios = [0]
+        pos     = corpus.find(' ')
+        while pos != -1 and len(inicios) < self._PALABRAS_CORPUS:
+            inicios.append(pos + 1)
+            pos = corpus.find(' ', pos + 1)
+        self._corpus         = corpus
+        self._inicios_corpus = inicios
+        self._cubre_corpus   = max_len
 
     def cargar_config(self, config_file):
         config_default = {
@@ -293,8 +562,15 @@ class SmartDataGenerator:
             },
             'texto':       {'max_length_text': 500, 'palabras_personalizadas': []},
             'faker':       {'habilitado': True, 'locale': 'es_ES'},
-            'optimizacion':{'usar_copy': True, 'batch_size': 1000},
-            'seeds':       {'random_seed': None}
+            'optimizacion':{'usar_copy': True, 'batch_size': 1000,
+                            'estrategia_insercion': 'auto', 'tamano_chunk': 5000,
+                            'pipeline': True, 'tamano_cola': 4},
+            'seeds':       {'random_seed': None, 'fecha_referencia': '2025-01-01'},
+            'autoreferencias': {'profundidad': 4, 'ramificacion': 5, 'por_tabla': {}},
+            'estimacion':  {'filas_muestra': 1000},
+            'mantenimiento': {'habilitado': True, 'vacuum_freeze': False, 'conexiones': 2,
+                              'durante_carga': True, 'omitir': []},
+            'perfilado':   {'habilitado': False, 'directorio': None, 'top': 15}
         }
         if config_file and os.path.exists(config_file):
             try:
@@ -336,8 +612,9 @@ class SmartDataGenerator:
 
     def analizar_base_datos(self):
         self.metadata['tablas'] = self.obtener_tablas()
+        columnas = self.obtener_columnas_esquema()
         for tabla in self.metadata['tablas']:
-            self.metadata['columnas'][tabla] = self.obtener_columnas(tabla)
+            self.metadata['columnas'][tabla] = columnas.get(tabla, [])
         print(f"[OK] Columnas analizadas")
         self.metadata['pks'] = self.obtener_primary_keys()
         print(f"[OK] Primary Keys: {len(self.metadata['pks'])}")
@@ -347,12 +624,16 @@ class SmartDataGenerator:
         print(f"[OK] CHECK Constraints: {sum(len(v) for v in self.metadata['checks'].values())}")
         self.metadata['uniques'] = self.obtener_unique_constraints()
         print(f"[OK] UNIQUE Constraints: {sum(len(v) for v in self.metadata['uniques'].values())}")
+        self._preparar_restricciones()
         self.metadata['sequences'] = self.obtener_sequences()
         print(f"[OK] Sequences: {len(self.metadata['sequences'])}")
         self.metadata['indices'] = self.obtener_indices()
         print(f"[OK] Indices: {sum(len(v) for v in self.metadata['indices'].values())}")
         self.metadata['orden_carga'] = self.resolver_orden_carga()
         print(f"[OK] Orden de carga resuelto: {len(self.metadata['orden_carga'])} tablas")
+        if self._diferidas:
+            print(f"[OK] FKs diferidas (ciclos y autorreferencias): "
+                  f"{', '.join(f'{t}.{c}' for t, c in sorted(self._diferidas))}")
         self._analizar_contexto_semantico()
         print(f"\n{'='*70}")
         print(f"[OK] ANALISIS COMPLETADO")
@@ -396,6 +677,19 @@ class SmartDataGenerator:
             for r in self.cursor.fetchall()
         ]
 
+    def obtener_columnas_esquema(self):
+        """Columnas de todas las tablas en una sola consulta (una por tabla no escala
+        a esquemas de miles de tablas)."""
+        return self._query_to_groups("""
+            SELECT table_name, column_name, data_type, udt_name, character_maximum_length,
+                   numeric_precision, numeric_scale, is_nullable, column_default, ordinal_position
+            FROM information_schema.columns
+            WHERE table_schema = %s
+            ORDER BY table_name, ordinal_position
+        """, lambda r: (r[0], {'nombre': r[1], 'tipo_dato': r[2], 'udt_name': r[3],
+                                'max_length': r[4], 'precision': r[5], 'scale': r[6],
+                                'nullable': r[7] == 'YES', 'default': r[8], 'posicion': r[9]}))
+
     def _query_to_groups(self, query, row_to_kv):
         """Ejecuta query y agrupa resultados en un dict de listas."""
         self.cursor.execute(query, (self.esquema,))
@@ -416,19 +710,34 @@ class SmartDataGenerator:
             ORDER BY tc.table_name, kcu.ordinal_position
         """, lambda row: (row[0], row[1]))
 
+    def _query_restricciones(self, query):
+        """Agrupa por tabla y constraint las filas (tabla, constraint, columna, ...)
+        ordenadas por posición dentro del constraint."""
+        self.cursor.execute(query, (self.esquema,))
+        grupos = defaultdict(dict)
+        for row in self.cursor.fetchall():
+            tabla, nombre = row[0], row[1]
+            grupos[tabla].setdefault(nombre, []).append(row[2:])
+        return {tabla: list(restricciones.items()) for tabla, restricciones in grupos.items()}
+
     def obtener_foreign_keys(self):
-        return self._query_to_groups("""
-            SELECT tc.table_name, kcu.column_name, ccu.table_name, ccu.column_name
-            FROM information_schema.table_constraints tc
-            JOIN information_schema.key_column_usage kcu
-                ON tc.constraint_name = kcu.constraint_name
-                AND tc.table_schema = kcu.table_schema
-            JOIN information_schema.constraint_column_usage ccu
-                ON ccu.constraint_name = tc.constraint_name
-                AND ccu.table_schema = tc.table_schema
-            WHERE tc.table_schema = %s AND tc.constraint_type = 'FOREIGN KEY'
-            ORDER BY tc.table_name
-        """, lambda row: (row[0], {'columna': row[1], 'tabla_ref': row[2], 'columna_ref': row[3]}))
+        """Una entrada por constraint, con sus columnas en orden (FKs compuestas)."""
+        grupos = self._query_restricciones("""
+            SELECT cl.relname, c.conname, a.attname, clr.relname, ar.attname
+            FROM pg_constraint c
+            JOIN pg_class cl      ON cl.oid = c.conrelid
+            JOIN pg_namespace n   ON n.oid = cl.relnamespace
+            JOIN pg_class clr     ON clr.oid = c.confrelid
+            CROSS JOIN LATERAL unnest(c.conkey, c.confkey) WITH ORDINALITY AS k(col, col_ref, pos)
+            JOIN pg_attribute a   ON a.attrelid = c.conrelid  AND a.attnum = k.col
+            JOIN pg_attribute ar  ON ar.attrelid = c.confrelid AND ar.attnum = k.col_ref
+            WHERE n.nspname = %s AND c.contype = 'f'
+            ORDER BY cl.relname, c.conname, k.pos
+        """)
+        return {tabla: [{'nombre': nombre, 'columnas': [f[0] for f in filas],
+                         'tabla_ref': filas[0][1], 'columnas_ref': [f[2] for f in filas]}
+                        for nombre, filas in restricciones]
+                for tabla, restricciones in grupos.items()}
 
     def obtener_check_constraints(self):
         return self._query_to_groups("""
@@ -440,15 +749,43 @@ class SmartDataGenerator:
         """, lambda row: (row[0], row[1]))
 
     def obtener_unique_constraints(self):
-        return self._query_to_groups("""
-            SELECT tc.table_name, kcu.column_name
-            FROM information_schema.table_constraints tc
-            JOIN information_schema.key_column_usage kcu
-                ON tc.constraint_name = kcu.constraint_name
-                AND tc.table_schema = kcu.table_schema
-            WHERE tc.table_schema = %s AND tc.constraint_type = 'UNIQUE'
-            ORDER BY tc.table_name
-        """, lambda row: (row[0], row[1]))
+        """Una entrada por constraint UNIQUE, con sus columnas en orden."""
+        grupos = self._query_restricciones("""
+            SELECT cl.relname, c.conname, a.attname
+            FROM pg_constraint c
+            JOIN pg_class cl    ON cl.oid = c.conrelid
+            JOIN pg_namespace n ON n.oid = cl.relnamespace
+            CROSS JOIN LATERAL unnest(c.conkey) WITH ORDINALITY AS k(col, pos)
+            JOIN pg_attribute a ON a.attrelid = c.conrelid AND a.attnum = k.col
+            WHERE n.nspname = %s AND c.contype = 'u'
+            ORDER BY cl.relname, c.conname, k.pos
+        """)
+        return {tabla: [{'nombre': nombre, 'columnas': [f[0] for f in filas]}
+                        for nombre, filas in restricciones]
+                for tabla, restricciones in grupos.items()}
+
+    def _preparar_restricciones(self):
+        """Índices derivados de FKs y UNIQUE agrupados por constraint. La PK cuenta
+        como restricción única salvo que sea serial (la secuencia ya la garantiza)."""
+        self._fk_por_columna   = {}
+        self._unica_simple     = {}
+        self._unicas_compuestas = defaultdict(list)
+        for tabla, fks in self.metadata['fks'].items():
+            for fk in fks:
+                for col in fk['columnas']:
+                    self._fk_por_columna[(tabla, col)] = fk
+        for tabla in self.metadata['tablas']:
+            restricciones = list(self.metadata['uniques'].get(tabla, []))
+            pks = self.metadata['pks'].get(tabla, [])
+            seriales = {c['nombre'] for c in self.metadata['columnas'].get(tabla, [])
+                        if c['default'] and 'nextval' in str(c['default'])}
+            if pks and not set(pks) & seriales:
+                restricciones.append({'nombre': f"{tabla}_pkey", 'columnas': pks})
+            for restriccion in restricciones:
+                if len(restriccion['columnas']) == 1:
+                    self._unica_simple[(tabla, restriccion['columnas'][0])] = restriccion['nombre']
+                else:
+                    self._unicas_compuestas[tabla].append(restriccion)
 
     def obtener_sequences(self):
         self.cursor.execute("""
@@ -469,14 +806,19 @@ class SmartDataGenerator:
         """, lambda row: (row[0], {'nombre': row[1], 'definicion': row[2]}))
 
     def resolver_orden_carga(self):
+        """Orden topológico de carga. Los ciclos se rompen difiriendo el menor conjunto
+        de FKs anulables, que se rellenan después con completar_fks_diferidas()."""
         dependencias = defaultdict(set)
-        sin_dependencias = set(self.metadata['tablas'])
         for tabla, fks in self.metadata['fks'].items():
             for fk in fks:
                 tabla_ref = fk['tabla_ref']
                 if tabla_ref != tabla:
                     dependencias[tabla].add(tabla_ref)
-                    sin_dependencias.discard(tabla)
+        rotas = self._romper_ciclos(dependencias)
+        for tabla, tabla_ref in rotas:
+            dependencias[tabla].discard(tabla_ref)
+        self._registrar_fks_diferidas(rotas)
+        sin_dependencias = {t for t in self.metadata['tablas'] if not dependencias.get(t)}
         orden      = []
         procesadas = set()
         en_proceso = set()
@@ -502,6 +844,221 @@ class SmartDataGenerator:
             visitar_tabla(tabla)
         return orden
 
+    # ── Ciclos de FKs ─────────────────────────────────────────────────────────
+    _MAX_ARISTAS_BUSQUEDA = 15
+
+    def _componentes_fuertes(self, dependencias):
+        """Tarjan iterativo sobre el grafo tabla -> tablas padre."""
+        indice, bajo, en_pila = {}, {}, set()
+        pila, componentes     = [], []
+        for raiz in sorted(self.metadata['tablas']):
+            if raiz in indice:
+                continue
+            indice[raiz] = bajo[raiz] = len(indice)
+            pila.append(raiz)
+            en_pila.add(raiz)
+            trabajo = [(raiz, iter(sorted(dependencias.get(raiz, ()))))]
+            while trabajo:
+                nodo, hijos = trabajo[-1]
+                for hijo in hijos:
+                    if hijo not in indice:
+                        indice[hijo] = bajo[hijo] = len(indice)
+                        pila.append(hijo)
+                        en_pila.add(hijo)
+                        trabajo.append((hijo, iter(sorted(dependencias.get(hijo, ())))))
+                        break
+                    if hijo in en_pila:
+                        bajo[nodo] = min(bajo[nodo], indice[hijo])
+                else:
+                    trabajo.pop()
+                    if trabajo:
+                        padre = trabajo[-1][0]
+                        bajo[padre] = min(bajo[padre], bajo[nodo])
+                    if bajo[nodo] == indice[nodo]:
+                        componente = []
+                        while True:
+                            tabla = pila.pop()
+                            en_pila.discard(tabla)
+                            componente.append(tabla)
+                            if tabla == nodo:
+                                break
+                        componentes.append(sorted(componente))
+        return componentes
+
+    def _es_aciclico(self, nodos, aristas):
+        grado = {n: 0 for n in nodos}
+        hijos = defaultdict(list)
+        for tabla, tabla_ref in aristas:
+            grado[tabla] += 1
+            hijos[tabla_ref].append(tabla)
+        libres  = [n for n, g in grado.items() if g == 0]
+        vistos  = 0
+        while libres:
+            nodo = libres.pop()
+            vistos += 1
+            for hijo in hijos[nodo]:
+                grado[hijo] -= 1
+                if grado[hijo] == 0:
+                    libres.append(hijo)
+        return vistos == len(nodos)
+
+    def _arista_diferible(self, tabla, tabla_ref):
+        """Una arista se puede diferir si todas sus columnas FK admiten NULL y la
+        tabla tiene PK para identificar las filas en el UPDATE posterior."""
+        if not self.metadata['pks'].get(tabla):
+            return False
+        nullables = {c['nombre']: c['nullable'] for c in self.metadata['columnas'].get(tabla, [])}
+        return all(nullables.get(col, False)
+                   for fk in self.metadata['fks'].get(tabla, []) if fk['tabla_ref'] == tabla_ref
+                   for col in fk['columnas'])
+
+    def _romper_ciclos(self, dependencias):
+        """Menor conjunto de aristas (tabla, tabla_ref) diferibles que deja el grafo
+        sin ciclos. Búsqueda exacta por tamaño en componentes pequeñas; en las
+        grandes, un conjunto mínimo por inclusión (quitar todas y reponer las que
+        no crean ciclo)."""
+        rotas = set()
+        for componente in self._componentes_fuertes(dependencias):
+            if len(componente) < 2:
+                continue
+            nodos      = set(componente)
+            aristas    = sorted((t, p) for t in componente for p in dependencias.get(t, ()) if p in nodos)
+            diferibles = [a for a in aristas if self._arista_diferible(*a)]
+            elegidas   = None
+            if len(diferibles) <= self._MAX_ARISTAS_BUSQUEDA:
+                for k in range(1, len(diferibles) + 1):
+                    for combinacion in itertools.combinations(diferibles, k):
+                        quitar = set(combinacion)
+                        if self._es_aciclico(nodos, [a for a in aristas if a not in quitar]):
+                            elegidas = quitar
+                            break
+                    if elegidas is not None:
+                        break
+            elif self._es_aciclico(nodos, [a for a in aristas if a not in set(diferibles)]):
+                elegidas = set(diferibles)
+                for arista in diferibles:
+                    elegidas.discard(arista)
+                    if not self._es_aciclico(nodos, [a for a in aristas if a not in elegidas]):
+                        elegidas.add(arista)
+            if elegidas is None:
+                print(f"  [WARN] Ciclo sin FK anulable entre: {', '.join(componente)}")
+                continue
+            rotas |= elegidas
+        return rotas
+
+    def _registrar_fks_diferidas(self, rotas):
+        """FKs que se cargan en NULL y se rellenan en la segunda pasada: las de las
+        aristas rotas y las autorreferencias anulables hacia la PK (árbol)."""
+        diferidas = defaultdict(list)
+        for tabla, fks in self.metadata['fks'].items():
+            nullables = {c['nombre']: c['nullable'] for c in self.metadata['columnas'].get(tabla, [])}
+            for fk in fks:
+                if (tabla, fk['tabla_ref']) in rotas:
+                    diferidas[tabla].append(fk)
+                elif fk['tabla_ref'] == tabla:
+                    if (all(nullables.get(col, False) for col in fk['columnas'])
+                            and set(fk['columnas_ref']) <= set(self.metadata['pks'].get(tabla, []))):
+                        diferidas[tabla].append(fk)
+                    else:
+                        print(f"  [WARN] Autorreferencia {tabla}.{fk['nombre']} no anulable o "
+                              f"no apunta a la PK: se genera en una sola pasada")
+        self.metadata['fks_diferidas'] = dict(diferidas)
+        self._diferidas = {(t, col) for t, fks in diferidas.items() for fk in fks for col in fk['columnas']}
+        self._tablas_con_ids = set(diferidas) | {fk['tabla_ref'] for fks in diferidas.values() for fk in fks}
+
+    def _secuencia_columna(self, columna):
+        """Secuencia del DEFAULT nextval('...') de la columna (texto regclass), o None."""
+        m = _NEXTVAL.search(str(columna.get('default') or ''))
+        return m.group(1).replace("''", "'") if m else None
+
+    def _reservar_ids(self, tabla, registros):
+        """Asigna a la PK serial valores reservados de su secuencia, para conocer en
+        el cliente las claves que necesita la segunda pasada. Solo en el camino de
+        inserción (consume la secuencia): verificar y estimar no reservan."""
+        if not registros or tabla not in self._tablas_con_ids:
+            return
+        pks = self.metadata['pks'].get(tabla, [])
+        if len(pks) != 1:
+            return
+        columna   = next((c for c in self.metadata['columnas'][tabla] if c['nombre'] == pks[0]), None)
+        secuencia = self._secuencia_columna(columna) if columna else None
+        if secuencia is None:
+            return
+        cursor = self._cursor_lectura or self.cursor
+        cursor.execute("SELECT nextval(%s::regclass) FROM generate_series(1, %s)",
+                       (secuencia, len(registros)))
+        for registro, (valor,) in zip(registros, cursor.fetchall()):
+            registro[pks[0]] = valor
+
+    def completar_fks_diferidas(self):
+        """Segunda pasada: por cada tabla con FKs diferidas carga con COPY una tabla
+        temporal (PK -> valores) y aplica un único UPDATE ... FROM."""
+        if not self.metadata['fks_diferidas']:
+            return 0
+        print(f"\nCompletando FKs diferidas...")
+        total = 0
+        for tabla, fks in self.metadata['fks_diferidas'].items():
+            claves = self._filas_diferidas.pop(tabla, None)
+            if not claves:
+                continue
+            pks      = self.metadata['pks'][tabla]
+            valores  = [self._padres_arbol(tabla, fk, claves) if fk['tabla_ref'] == tabla
+                        else self._valores_diferidos(fk, len(claves))
+                        for fk in fks]
+            vacias   = [(None,) * len(fk['columnas']) for fk in fks]
+            filas    = [clave + sum((v[i] or vacia for v, vacia in zip(valores, vacias)), ())
+                        for i, clave in enumerate(claves)
+                        if any(v[i] is not None for v in valores)]
+            columnas_fk = [col for fk in fks for col in fk['columnas']]
+            columnas    = pks + columnas_fk
+            if not filas:
+                continue
+            estado = self._nuevo_estado_insercion(tabla, columnas)
+            estado['tabla_completa'] = '_dp_diferidas'
+            asignaciones = ', '.join(f'"{col}" = m."{col}"' for col in columnas_fk)
+            condicion    = ' AND '.join(f't."{pk}" = m."{pk}"' for pk in pks)
+            try:
+                self.cursor.execute(f"CREATE TEMP TABLE _dp_diferidas ON COMMIT DROP AS "
+                                    f"SELECT {estado['columnas_str']} FROM {self.esquema}.{tabla} WITH NO DATA")
+                self._insertar_con_copy(estado, filas)
+                self.cursor.execute(f"UPDATE {self.esquema}.{tabla} t SET {asignaciones} "
+                                    f"FROM _dp_diferidas m WHERE {condicion}")
+                actualizadas = self.cursor.rowcount
+                self.conn.commit()
+            except Exception as e:
+                self.conn.rollback()
+                print(f"  [ERROR] Error completando FKs de {tabla}: {e}")
+                self.stats['errores'].append(f"{tabla} (FKs diferidas): {str(e)}")
+                continue
+            total += actualizadas
+            print(f"  [OK] {tabla}: {actualizadas} filas ({', '.join(columnas_fk)})")
+        return total
+
+    def _padres_arbol(self, tabla, fk, claves):
+        """Clave padre (tupla) de cada fila para una autorreferencia: bosque de árboles
+        con la profundidad y ramificación configuradas (las raíces quedan en NULL)."""
+        cfg          = self.config.get('autoreferencias', {})
+        cfg_tabla    = cfg.get('por_tabla', {}).get(tabla, {})
+        profundidad  = max(1, int(cfg_tabla.get('profundidad', cfg.get('profundidad', 4))))
+        ramificacion = max(1, int(cfg_tabla.get('ramificacion', cfg.get('ramificacion', 5))))
+        tamano_arbol = sum(ramificacion ** nivel for nivel in range(profundidad))
+        idx          = [self.metadata['pks'][tabla].index(col) for col in fk['columnas_ref']]
+        padres       = []
+        for i in range(len(claves)):
+            arbol, local = divmod(i, tamano_arbol)
+            if local == 0:
+                padres.append(None)
+            else:
+                padre = claves[arbol * tamano_arbol + (local - 1) // ramificacion]
+                padres.append(tuple(padre[j] for j in idx))
+        return padres
+
+    def _valores_diferidos(self, fk, cantidad):
+        if len(fk['columnas']) == 1:
+            valores = (self.obtener_valor_fk(fk['tabla_ref'], fk['columnas_ref'][0]) for _ in range(cantidad))
+            return [None if v is None else (v,) for v in valores]
+        return [self.obtener_tupla_fk(fk) for _ in range(cantidad)]
+
     def generar_valor_columna(self, tabla, columna_info, registro_actual=None):
         nombre_col = columna_info['nombre']
         tipo       = columna_info['udt_name'] or columna_info['tipo_dato']
@@ -510,16 +1067,24 @@ class SmartDataGenerator:
         if col_key in columnas_personalizadas:
             try:
                 valor = self._generar_valor_personalizado(col_key, columnas_personalizadas[col_key], columna_info)
-                if tabla in self.metadata['uniques'] and nombre_col in self.metadata['uniques'][tabla]:
+                if (tabla, nombre_col) in self._unica_simple:
                     gen_lambda = lambda ci: self._generar_valor_personalizado(col_key, columnas_personalizadas[col_key], ci)
                     valor = self._garantizar_unicidad(tabla, nombre_col, valor, gen_lambda, columna_info)
                 return valor
             except Exception as e:
                 print(f"  [WARN] Error en configuración personalizada para {col_key}: {e}")
-        if tabla in self.metadata['fks']:
-            for fk in self.metadata['fks'][tabla]:
-                if fk['columna'] == nombre_col:
-                    return self.obtener_valor_fk(fk['tabla_ref'], fk['columna_ref'])
+        fk = self._fk_por_columna.get((tabla, nombre_col))
+        if fk is not None:
+            if (tabla, nombre_col) in self._diferidas:
+                return None
+            if len(fk['columnas']) == 1:
+                return self.obtener_valor_fk(fk['tabla_ref'], fk['columnas_ref'][0])
+            # FK compuesta: una tupla padre por fila, compartida por sus columnas.
+            tupla = self._fila_fk.get(fk['nombre'])
+            if tupla is None:
+                tupla = self.obtener_tupla_fk(fk) or (None,) * len(fk['columnas'])
+                self._fila_fk[fk['nombre']] = tupla
+            return tupla[fk['columnas'].index(nombre_col)]
         if tabla in self.metadata['pks'] and nombre_col in self.metadata['pks'][tabla]:
             if columna_info['default'] and 'nextval' in str(columna_info['default']):
                 return None
@@ -530,7 +1095,7 @@ class SmartDataGenerator:
             try:
                 generador = getattr(self, generador_nombre)
                 valor = generador(columna_info)
-                if tabla in self.metadata['uniques'] and nombre_col in self.metadata['uniques'][tabla]:
+                if (tabla, nombre_col) in self._unica_simple:
                     valor = self._garantizar_unicidad(tabla, nombre_col, valor, generador, columna_info)
                 return valor
             except Exception as e:
@@ -541,9 +1106,9 @@ class SmartDataGenerator:
         tipo   = config_personalizada['tipo']
         config = config_personalizada['config']
         if tipo in ('int2', 'smallint', 'int4', 'integer', 'int8', 'bigint'):
-            return random.randint(config['min'], config['max'])
+            return self.rng.randint(config['min'], config['max'])
         elif tipo in ('numeric', 'decimal'):
-            valor = random.uniform(config['min'], config['max'])
+            valor = self.rng.uniform(config['min'], config['max'])
             return round(Decimal(str(valor)), config.get('decimales', 2))
         elif tipo in ('varchar', 'character varying', 'bpchar', 'char', 'character', 'text'):
             longitud = config['longitud']
@@ -554,17 +1119,17 @@ class SmartDataGenerator:
             try:
                 fecha_inicio = datetime.strptime(config['fecha_inicio'], '%Y-%m-%d')
                 fecha_fin    = datetime.strptime(config['fecha_fin'],    '%Y-%m-%d')
-                fecha = fecha_inicio + timedelta(days=random.randint(0, (fecha_fin - fecha_inicio).days))
+                fecha = fecha_inicio + timedelta(days=self.rng.randint(0, (fecha_fin - fecha_inicio).days))
                 if 'timestamp' in tipo:
-                    fecha = fecha.replace(hour=random.randint(0, 23),
-                                          minute=random.randint(0, 59),
-                                          second=random.randint(0, 59))
+                    fecha = fecha.replace(hour=self.rng.randint(0, 23),
+                                          minute=self.rng.randint(0, 59),
+                                          second=self.rng.randint(0, 59))
                 return fecha
             except Exception as e:
                 print(f"  [WARN] Error al parsear fechas en {col_key}: {e}. Usando fallback.")
                 return self.generar_fecha()
         elif tipo == 'bool':
-            return random.random() < config.get('prob_true', 0.5)
+            return self.rng.random() < config.get('prob_true', 0.5)
         else:
             raise ValueError(f"Tipo '{tipo}' no soportado en configuración personalizada")
 
@@ -577,120 +1142,191 @@ class SmartDataGenerator:
                 and self.config['generacion_nulls']['excluir_pks']):
             return False
         if (self.config['generacion_nulls']['excluir_fks']
-                and tabla in self.metadata['fks']
-                and any(fk['columna'] == nombre_col for fk in self.metadata['fks'][tabla])):
+                and (tabla, nombre_col) in self._fk_por_columna):
             return False
-        return random.random() < self.config['generacion_nulls']['probabilidad']
+        return self.rng.random() < self.config['generacion_nulls']['probabilidad']
 
     def _garantizar_unicidad(self, tabla, columna, valor, generador, columna_info):
-        cache_key = f"{tabla}.{columna}"
+        cache_key = f"{tabla}.{self._unica_simple[(tabla, columna)]}"
         usados    = self.generated_values.setdefault(cache_key, set())
+        maximo    = self.config.get('validacion', {}).get('max_intentos_unicidad', 1000)
         intentos  = 0
-        while valor in usados and intentos < 1000:
+        while valor in usados and intentos < maximo:
             valor = generador(columna_info)
             intentos += 1
-        if intentos >= 1000:
-            import uuid
+        if intentos >= maximo:
             if isinstance(valor, str):
-                valor = f"{valor}_{uuid.uuid4().hex[:6]}"
+                valor = f"{valor}_{self.rng.getrandbits(24):06x}"
         usados.add(valor)
         return valor
 
+    def _garantizar_unicidad_compuesta(self, tabla, restriccion, registro, columnas_info):
+        """Regenera las columnas de un UNIQUE/PK compuesto hasta que la tupla sea
+        nueva. Devuelve False si se agotan los intentos o queda un NOT NULL vacío.
+        Una FK compuesta que comparte columnas con la restricción se regenera
+        entera: su tupla tiene que salir de una sola fila padre."""
+        usados  = self.generated_values.setdefault(f"{tabla}.{restriccion['nombre']}", set())
+        maximo  = self.config.get('validacion', {}).get('max_intentos_unicidad', 1000)
+        columnas = restriccion['columnas']
+        regenerar = list(dict.fromkeys(
+            list(columnas) + [col for fk in self.metadata['fks'].get(tabla, [])
+                        if len(fk['columnas']) > 1 and not set(fk['columnas']).isdisjoint(columnas)
+                        for col in fk['columnas']]))
+        for _ in range(maximo):
+            tupla = tuple(registro.get(col) for col in columnas)
+            if None in tupla:
+                # NULL nunca colisiona en UNIQUE; solo importa si la columna es NOT NULL.
+                return all(registro.get(col) is not None or columnas_info[col]['nullable']
+                           or col not in registro for col in columnas)
+            if tupla not in usados:
+                usados.add(tupla)
+                return True
+            self._fila_fk = {}
+            for col in regenerar:
+                if col in registro:
+                    # El valor descartado deja de contar como usado en el UNIQUE simple
+                    # de la columna; si no, ese valor queda vetado sin estar en ninguna fila.
+                    simple = self._unica_simple.get((tabla, col))
+                    if simple is not None:
+                        self.generated_values.get(f"{tabla}.{simple}", set()).discard(registro[col])
+                    registro[col] = self.generar_valor_columna(tabla, columnas_info[col], registro)
+        return False
+
     def generar_por_tipo(self, tipo, columna_info):
         tipo = tipo.lower()
         if tipo in ('varchar', 'character varying', 'bpchar', 'char', 'character'):
             max_len = columna_info['max_length'] or self.config.get('texto', {}).get('max_length_text', 50)
-            return self.generar_texto_basico(max_len)
+            # En columnas cortas (char(2), varchar(3)) casi ninguna palabra cabe: se usa
+            # un código para no generar siempre '' y agotar las claves únicas.
+            return self.generar_texto_basico(max_len) or self._caracteres(_ALFANUMERICO, max_len)
         elif tipo == 'text':
             max_len_cfg = self.config.get('texto', {}).get('max_length_text', 200)
-            return self.generar_texto_basico(min(random.randint(50, 200), max_len_cfg))
+            return self.generar_texto_basico(min(self.rng.randint(50, 200), max_len_cfg))
         elif tipo in ('int4', 'integer'):
             cfg = self.config['rangos_personalizados']['integer']
-            return random.randint(cfg['min'], min(cfg['max'], 2147483647))
+            return self.rng.randint(cfg['min'], min(cfg['max'], 2147483647))
         elif tipo in ('int8', 'bigint'):
             cfg = self.config['rangos_personalizados']['bigint']
-            return random.randint(cfg['min'], min(cfg['max'], 9223372036854775807))
+            return self.rng.randint(cfg['min'], min(cfg['max'], 9223372036854775807))
         elif tipo in ('int2', 'smallint'):
             cfg = self.config['rangos_personalizados']['smallint']
-            return random.randint(cfg['min'], min(cfg['max'], 32767))
+            return self.rng.randint(cfg['min'], min(cfg['max'], 32767))
         elif tipo in ('numeric', 'decimal'):
             precision = columna_info['precision'] or 10
             scale     = columna_info['scale'] or 2
             max_val   = 10 ** (precision - scale) - 1
-            return Decimal(str(round(random.uniform(0, max_val), scale)))
+            return Decimal(str(round(self.rng.uniform(0, max_val), scale)))
         elif tipo in ('float4', 'float8', 'real', 'double precision'):
-            return round(random.uniform(0, 10000), 2)
+            return round(self.rng.uniform(0, 10000), 2)
         elif tipo == 'date':
             cfg = self.config['rangos_fechas']['date']
-            return (datetime.now() - timedelta(days=random.randint(0, cfg['dias_atras']))).date()
+            return (self._ahora() - timedelta(days=self.rng.randint(0, cfg['dias_atras']))).date()
         elif tipo in ('timestamp', 'timestamptz', 'timestamp without time zone', 'timestamp with time zone'):
             cfg = self.config['rangos_fechas']['timestamp']
-            return datetime.now() - timedelta(days=random.randint(0, cfg['dias_atras']),
-                                               hours=random.randint(0, 23))
+            return self._ahora() - timedelta(days=self.rng.randint(0, cfg['dias_atras']),
+                                               hours=self.rng.randint(0, 23))
         elif tipo in ('time', 'time without time zone'):
-            return f"{random.randint(0,23):02d}:{random.randint(0,59):02d}:{random.randint(0,59):02d}"
+            return f"{self.rng.randint(0,23):02d}:{self.rng.randint(0,59):02d}:{self.rng.randint(0,59):02d}"
         elif tipo in ('bool', 'boolean'):
-            return random.choice([True, False])
+            return self.rng.choice([True, False])
         elif tipo == 'uuid':
-            import uuid
-            return str(uuid.uuid4())
+            return str(uuid.UUID(int=self.rng.getrandbits(128), version=4))
         elif tipo in ('json', 'jsonb'):
-            return json.dumps({'id': random.randint(1, 1000),
+            return json.dumps({'id': self.rng.randint(1, 1000),
                                'valor': self.generar_texto_basico(20),
-                               'activo': random.choice([True, False])})
+                               'activo': self.rng.choice([True, False])})
         elif tipo.endswith('[]'):
-            return [self.generar_por_tipo(tipo[:-2], columna_info) for _ in range(random.randint(1, 5))]
+            return [self.generar_por_tipo(tipo[:-2], columna_info) for _ in range(self.rng.randint(1, 5))]
         else:
             return self.generar_texto_basico(50)
 
     def generar_texto_basico(self, max_len):
-        texto = ''
-        while len(texto) < max_len:
-            palabra = random.choice(self._PALABRAS)
-            if len(texto) + len(palabra) + 1 <= max_len:
-                texto += palabra + ' '
-            else:
-                break
-        return texto.strip()[:max_len]
+        """Porción del corpus que empieza en una palabra y se corta en el último
+        límite de palabra que cabe en max_len."""
+        if max_len <= 0:
+            return ''
+        if self._corpus is None or max_len > self._cubre_corpus:
+            self._preparar_corpus(max(max_len, 500))
+        inicio = self._inicios_corpus[int(self.rng.random() * self._PALABRAS_CORPUS)]
+        trozo  = self._corpus[inicio:inicio + max_len + 1]
+        if trozo[max_len] == ' ':
+            return trozo[:max_len]
+        corte = trozo.rfind(' ')
+        return trozo[:corte] if corte > 0 else ''
 
     def obtener_valor_fk(self, tabla_ref, columna_ref):
         cache_key = f"{tabla_ref}.{columna_ref}"
         if cache_key in self.data_cache and self.data_cache[cache_key]:
-            return random.choice(self.data_cache[cache_key])
+            return self.rng.choice(self.data_cache[cache_key])
         tabla_completa = f"{self.esquema}.{tabla_ref}"
         query = f'SELECT "{columna_ref}" FROM {tabla_completa} WHERE "{columna_ref}" IS NOT NULL LIMIT 1000'
+        cursor = self._cursor_lectura or self.cursor
         try:
-            self.cursor.execute(query)
-            valores = [row[0] for row in self.cursor.fetchall()]
+            cursor.execute(query)
+            valores = [row[0] for row in cursor.fetchall()]
             if valores:
                 self.data_cache[cache_key] = valores
-                return random.choice(valores)
+                return self.rng.choice(valores)
             return None
         except Exception as e:
             print(f"  [WARN] Error obteniendo FK {tabla_ref}.{columna_ref}: {e}")
             return None
 
-    def generar_registros_tabla(self, tabla, cantidad):
+    def obtener_tupla_fk(self, fk):
+        """Tupla completa de una fila padre para una FK compuesta."""
+        cache_key = f"{fk['tabla_ref']}.({','.join(fk['columnas_ref'])})"
+        if self.data_cache.get(cache_key):
+            return self.rng.choice(self.data_cache[cache_key])
+        columnas = ', '.join(f'"{col}"' for col in fk['columnas_ref'])
+        filtro   = ' AND '.join(f'"{col}" IS NOT NULL' for col in fk['columnas_ref'])
+        query    = f'SELECT {columnas} FROM {self.esquema}.{fk["tabla_ref"]} WHERE {filtro} LIMIT 1000'
+        cursor   = self._cursor_lectura or self.cursor
+        try:
+            cursor.execute(query)
+            valores = [tuple(row) for row in cursor.fetchall()]
+            if valores:
+                self.data_cache[cache_key] = valores
+                return self.rng.choice(valores)
+            return None
+        except Exception as e:
+            print(f"  [WARN] Error obteniendo FK {fk['tabla_ref']}({columnas}): {e}")
+            return None
+
+    def generar_registros_tabla(self, tabla, cantidad, inicio=0):
+        """Genera las filas [inicio, inicio + cantidad). Con semilla, la fila i
+        depende solo de (semilla, tabla, columna, i)."""
         registros           = []
         columnas            = self.metadata['columnas'][tabla]
         registros_saltados  = 0
         columnas_procesadas = 0
         columnas_con_default = 0
-        for _ in range(cantidad):
+        por_celda           = self._semilla is not None
+        compuestas          = self._unicas_compuestas.get(tabla, [])
+        columnas_info       = {c['nombre']: c for c in columnas}
+        for fila in range(inicio, inicio + cantidad):
             registro      = {}
             registro_valido = True
+            self._fila_fk  = {}
             for columna in columnas:
                 nombre_col = columna['nombre']
                 if columna['default'] and 'nextval' in str(columna['default']):
                     columnas_con_default += 1
                     continue
                 columnas_procesadas += 1
+                if por_celda:
+                    self._posicionar_rng(tabla, nombre_col, fila)
                 valor = self.generar_valor_columna(tabla, columna, registro)
                 if valor is None and not columna['nullable']:
                     registro_valido = False
                     registros_saltados += 1
                     break
                 registro[nombre_col] = valor
+            if registro_valido and compuestas:
+                for restriccion in compuestas:
+                    if not self._garantizar_unicidad_compuesta(tabla, restriccion, registro, columnas_info):
+                        registro_valido = False
+                        registros_saltados += 1
+                        break
             if registro_valido and registro:
                 registros.append(registro)
         if len(registros) == 0:
@@ -705,80 +1341,341 @@ class SmartDataGenerator:
             print(f"  [WARN] {registros_saltados} registros saltados por columnas requeridas sin valor")
         return registros
 
+    def _columnas_deterministas(self, tabla):
+        """Columnas cuyo valor depende solo de (semilla, tabla, columna, fila).
+        Quedan fuera las secuencias, las FKs (muestrean claves ya cargadas) y las
+        UNIQUE (sus reintentos dependen de los valores generados antes)."""
+        fks     = {col for fk in self.metadata['fks'].get(tabla, []) for col in fk['columnas']}
+        uniques = ({col for (t, col) in self._unica_simple if t == tabla}
+                   | {col for r in self._unicas_compuestas.get(tabla, []) for col in r['columnas']})
+        return [c['nombre'] for c in self.metadata['columnas'][tabla]
+                if not (c['default'] and 'nextval' in str(c['default']))
+                and c['nombre'] not in fks and c['nombre'] not in uniques]
+
+    def verificar_rango(self, tabla, desde, hasta):
+        """Regenera las filas [desde, hasta) y comprueba que estén en la tabla cargada."""
+        if self._semilla is None:
+            print("[ERROR] La verificacion requiere seeds.random_seed en la configuracion")
+            return None
+        columnas  = self._columnas_deterministas(tabla)
+        registros = self.generar_registros_tabla(tabla, hasta - desde, inicio=desde)
+        filas     = [tuple(r.get(col) for col in columnas) for r in registros]
+        cols_sql  = ', '.join([f'"{col}"' for col in columnas])
+        estado    = self._nuevo_estado_insercion(tabla, columnas)
+        estado['tabla_completa'] = '_dp_verificacion'
+        try:
+            self.cursor.execute(f"CREATE TEMP TABLE _dp_verificacion ON COMMIT DROP AS "
+                                f"SELECT {cols_sql} FROM {self.esquema}.{tabla} WITH NO DATA")
+            if filas:
+                self._insertar_con_copy(estado, filas)
+            self.cursor.execute("SELECT md5(string_agg(v::text, '|' ORDER BY v::text)) "
+                                "FROM _dp_verificacion v")
+            checksum = self.cursor.fetchone()[0]
+            self.cursor.execute(f"SELECT count(*) FROM (SELECT {cols_sql} FROM _dp_verificacion "
+                                f"EXCEPT ALL SELECT {cols_sql} FROM {self.esquema}.{tabla}) x")
+            faltantes = self.cursor.fetchone()[0]
+        finally:
+            self.conn.rollback()
+        resultado = {'tabla': tabla, 'desde': desde, 'hasta': hasta, 'columnas': columnas,
+                     'filas': len(filas), 'faltantes': faltantes, 'checksum': checksum}
+        estado_txt = "[OK]" if faltantes == 0 else "[ERROR]"
+        print(f"{estado_txt} {tabla}[{desde}:{hasta}] filas: {len(filas)}, "
+              f"faltantes: {faltantes}, checksum: {checksum}")
+        return resultado
+
     def insertar_registros(self, tabla, registros):
         if not registros:
             return 0
-        if self.config.get('optimizacion', {}).get('usar_copy', True):
-            return self._insertar_con_copy(tabla, registros)
-        return self._insertar_con_batch(tabla, registros)
-
-    def _insertar_con_copy(self, tabla, registros):
-        if not registros:
+        self._reservar_ids(tabla, registros)
+        columnas = list(registros[0].keys())
+        filas    = [tuple(registro.get(col) for col in columnas) for registro in registros]
+        return self.insertar_filas(tabla, columnas, filas)
+
+    def insertar_filas(self, tabla, columnas, filas):
+        """Inserta por chunks dentro de una única transacción por tabla."""
+        if not filas:
             return 0
+        chunk  = max(1, int(self.config.get('optimizacion', {}).get('tamano_chunk', 5000)))
+        estado = self._nuevo_estado_insercion(tabla, columnas)
         try:
-            columnas       = list(registros[0].keys())
-            tabla_completa = f"{self.esquema}.{tabla}"
-            output = io.StringIO()
-            writer = csv.writer(output, delimiter='\t', quotechar='"',
-                                quoting=csv.QUOTE_MINIMAL, lineterminator='\n')
-            for registro in registros:
-                fila = []
-                for col in columnas:
-                    valor = registro.get(col)
-                    if valor is None:
-                        fila.append('\\N')
-                    elif isinstance(valor, datetime):
-                        fila.append(valor.isoformat())
-                    elif isinstance(valor, bool):
-                        fila.append('t' if valor else 'f')
-                    elif isinstance(valor, (list, dict)):
-                        fila.append(json.dumps(valor))
-                    else:
-                        fila.append(str(valor))
-                writer.writerow(fila)
-            output.seek(0)
-            columnas_str = ', '.join([f'"{col}"' for col in columnas])
-            self.cursor.copy_expert(
-                f"COPY {tabla_completa} ({columnas_str}) FROM STDIN WITH (FORMAT CSV, DELIMITER E'\\t', NULL '\\N', QUOTE '\"')",
-                output
-            )
+            insertados = 0
+            for inicio in range(0, len(filas), chunk):
+                insertados += self._insertar_chunk(estado, filas[inicio:inicio + chunk])
             self.conn.commit()
-            self._actualizar_cache_insercion(tabla, registros, columnas)
-            return len(registros)
         except Exception as e:
             self.conn.rollback()
-            print(f"  [ERROR] Error con COPY en {tabla}: {e}")
-            print(f"  [INFO] Intentando con execute_batch...")
-            return self._insertar_con_batch(tabla, registros)
-
-    def _insertar_con_batch(self, tabla, registros):
-        if not registros:
+            print(f"  [ERROR] Error insertando en {tabla}: {e}")
+            self.stats['errores'].append(f"{tabla}: {str(e)}")
             return 0
+        finally:
+            self._liberar_preparada(estado)
+        self.stats['estrategias'][tabla] = {'elegida': estado['estrategia'],
+                                            'medidas': estado['medidas']}
+        self._actualizar_cache_insercion(tabla, filas, columnas)
+        return insertados
+
+    # ── Progreso y cancelación ────────────────────────────────────────────────
+    def _comprobar_cancelacion(self):
+        if self.cancelacion is not None and self.cancelacion.is_set():
+            raise GeneracionCancelada("Generacion cancelada por el usuario")
+
+    def _notificar_progreso(self, tabla, procesadas, total):
+        if self.al_progresar is not None:
+            self.al_progresar(tabla, procesadas, total)
+
+    def cargar_tabla(self, tabla, cantidad):
+        """Genera e inserta por chunks en una única transacción. Entre chunks atiende
+        la cancelación: la tabla en curso se revierte y se propaga GeneracionCancelada."""
+        chunk      = max(1, int(self.config.get('optimizacion', {}).get('tamano_chunk', 5000)))
+        estado     = None
+        lotes      = []
+        insertados = 0
         try:
-            columnas       = list(registros[0].keys())
-            tabla_completa = f"{self.esquema}.{tabla}"
-            columnas_str   = ', '.join([f'"{col}"' for col in columnas])
-            placeholders   = ', '.join(['%s'] * len(columnas))
-            query          = f'INSERT INTO {tabla_completa} ({columnas_str}) VALUES ({placeholders})'
-            datos          = [tuple(registro.get(col) for col in columnas) for registro in registros]
-            batch_size     = self.config.get('optimizacion', {}).get('batch_size', 1000)
-            execute_batch(self.cursor, query, datos, page_size=batch_size)
+            for desde in range(0, cantidad, chunk):
+                self._comprobar_cancelacion()
+                registros = self.generar_registros_tabla(tabla, min(chunk, cantidad - desde), inicio=desde)
+                self._reservar_ids(tabla, registros)
+                if registros:
+                    if estado is None:
+                        estado = self._nuevo_estado_insercion(tabla, list(registros[0].keys()))
+                    filas = [tuple(r.get(col) for col in estado['columnas']) for r in registros]
+                    insertados += self._insertar_chunk(estado, filas)
+                    lotes.append(filas)
+                self._notificar_progreso(tabla, min(desde + chunk, cantidad), cantidad)
+            self._comprobar_cancelacion()
             self.conn.commit()
-            self._actualizar_cache_insercion(tabla, registros, columnas)
-            return len(registros)
+        except GeneracionCancelada:
+            self.conn.rollback()
+            raise
         except Exception as e:
             self.conn.rollback()
             print(f"  [ERROR] Error insertando en {tabla}: {e}")
             self.stats['errores'].append(f"{tabla}: {str(e)}")
             return 0
+        finally:
+            if estado is not None:
+                self._liberar_preparada(estado)
+        if estado is None:
+            return 0
+        self.stats['estrategias'][tabla] = {'elegida': estado['estrategia'],
+                                            'medidas': estado['medidas']}
+        for filas in lotes:
+            self._actualizar_cache_insercion(tabla, filas, estado['columnas'])
+        self._tabla_confirmada(tabla, insertados)
+        return insertados
+
+    # ── Estrategias de inserción ──────────────────────────────────────────────
+    def _nuevo_estado_insercion(self, tabla, columnas):
+        opt        = self.config.get('optimizacion', {})
+        estrategia = opt.get('estrategia_insercion', 'auto')
+        if estrategia == 'auto':
+            candidatos = [e for e in self._ESTRATEGIAS_INSERCION
+                          if opt.get('usar_copy', True) or not e.startswith('copy')]
+        else:
+            candidatos = [estrategia]
+        tipos = {c['nombre']: self._tipo_columna(c) for c in self.metadata['columnas'].get(tabla, [])}
+        estado = {
+            'tabla':          tabla,
+            'columnas':       columnas,
+            'tabla_completa': f"{self.esquema}.{tabla}",
+            'columnas_str':   ', '.join([f'"{col}"' for col in columnas]),
+            'codificadores':  [_CODIFICADORES_BINARIOS.get(tipos.get(col)) for col in columnas],
+            'tipos':          [tipos.get(col, '') for col in columnas],
+            'serializador':   None,
+            'codificacion':   psycopg2.extensions.encodings.get(
+                getattr(self.conn, 'encoding', None), 'utf-8'),
+            'estrategia':     None,
+            'candidatos':     candidatos,
+            'medidas':        {},
+            'preparada':      None,
+        }
+        if 'copy_binario' in candidatos and not all(estado['codificadores']):
+            candidatos.remove('copy_binario')
+            estado['medidas']['copy_binario'] = 'no aplica'
+        if len(candidatos) == 1:
+            estado['estrategia'] = candidatos[0]
+        return estado
+
+    def _insertar_chunk(self, estado, filas, carga=None):
+        """carga: (estrategia, payload) ya serializado; se usa si coincide con la elegida."""
+        if estado['estrategia'] is None:
+            return self._elegir_estrategia(estado, filas)
+        if carga is not None and carga[0] != estado['estrategia']:
+            carga = None
+        try:
+            self._ejecutar_estrategia(estado, estado['estrategia'], filas, carga)
+            return len(filas)
+        except Exception as e:
+            if estado['estrategia'] == 'batch':
+                raise
+            print(f"  [ERROR] Error con {estado['estrategia']} en {estado['tabla']}: {e}")
+            print(f"  [INFO] Intentando con execute_batch...")
+            self._ejecutar_estrategia(estado, 'batch', filas)
+            return len(filas)
+
+    def _elegir_estrategia(self, estado, filas):
+        """Micro-benchmark sobre el primer chunk: cada candidato inserta una porción
+        distinta (los datos se insertan una sola vez) y gana el de más filas/s.
+        Con menos de _MIN_FILAS_BENCHMARK filas por candidato la medida sería ruido:
+        se usa el primer candidato y las stats lo indican."""
+        candidatos = estado['candidatos']
+        n, k       = len(filas), len(candidatos)
+        if n < k * self._MIN_FILAS_BENCHMARK:
+            estado['estrategia']     = candidatos[0]
+            estado['medidas']['auto'] = f"omitido, {n} filas < {k * self._MIN_FILAS_BENCHMARK}"
+            return self._insertar_chunk(estado, filas)
+        # Porciones de n//k o n//k + 1 filas: ninguna queda bajo el mínimo.
+        pendientes = [filas[i * n // k:(i + 1) * n // k] for i in range(k)]
+        for candidato in candidatos:
+            if not pendientes:
+                break
+            porcion = pendientes.pop(0)
+            try:
+                inicio = time.perf_counter()
+                self._ejecutar_estrategia(estado, candidato, porcion)
+                duracion = max(time.perf_counter() - inicio, 1e-9)
+                estado['medidas'][candidato] = len(porcion) / duracion
+            except Exception as e:
+                estado['medidas'][candidato] = 'fallo'
+                print(f"  [WARN] Estrategia {candidato} fallo en {estado['tabla']}: {e}")
+                pendientes.insert(0, porcion)
+        medidas = {k: v for k, v in estado['medidas'].items() if isinstance(v, float)}
+        estado['estrategia'] = max(medidas, key=medidas.get) if medidas else 'batch'
+        for porcion in pendientes:
+            self._insertar_chunk(estado, porcion)
+        return len(filas)
+
+    def _ejecutar_estrategia(self, estado, estrategia, filas, carga=None):
+        """Ejecuta una estrategia dentro de un SAVEPOINT para poder descartar solo ese intento."""
+        self.cursor.execute("SAVEPOINT _dp_chunk")
+        try:
+            if carga is not None:
+                getattr(self, self._SERIALIZADORES[estrategia][1])(estado, carga[1])
+            else:
+                getattr(self, self._METODOS_INSERCION[estrategia])(estado, filas)
+        except Exception:
+            self.cursor.execute("ROLLBACK TO SAVEPOINT _dp_chunk")
+            raise
+        self.cursor.execute("RELEASE SAVEPOINT _dp_chunk")
+
+    def _insertar_con_copy(self, estado, filas):
+        self._enviar_copy(estado, self._serializar_copy(estado, filas))
+
+    def _serializar_copy(self, estado, filas):
+        """Filas-tupla a COPY texto con el serializador compilado para la tabla."""
+        if estado['serializador'] is None:
+            estado['serializador'] = _compilar_serializador_texto(estado['tipos'])
+        return estado['serializador'](filas).encode(estado['codificacion'])
+
+    def _enviar_copy(self, estado, datos):
+        self.cursor.copy_expert(
+            f"COPY {estado['tabla_completa']} ({estado['columnas_str']}) FROM STDIN",
+            io.BytesIO(datos)
+        )
+
+    def _insertar_con_copy_binario(self, estado, filas):
+        self._enviar_copy_binario(estado, self._serializar_copy_binario(estado, filas))
+
+    def _serializar_copy_binario(self, estado, filas):
+        codificadores = estado['codificadores']
+        cabecera_fila = _S_H.pack(len(codificadores))
+        partes        = [_PGCOPY_CABECERA]
+        for fila in filas:
+            partes.append(cabecera_fila)
+            for codificar, valor in zip(codificadores, fila):
+                if valor is None:
+                    partes.append(_PGCOPY_NULL)
+                else:
+                    dato = codificar(valor)
+                    partes.append(_S_I.pack(len(dato)))
+                    partes.append(dato)
+        partes.append(_PGCOPY_FIN)
+        return b''.join(partes)
+
+    def _enviar_copy_binario(self, estado, datos):
+        self.cursor.copy_expert(
+            f"COPY {estado['tabla_completa']} ({estado['columnas_str']}) FROM STDIN WITH (FORMAT binary)",
+            io.BytesIO(datos)
+        )
+
+    def _insertar_con_values(self, estado, filas):
+        batch_size = self.config.get('optimizacion', {}).get('batch_size', 1000)
+        execute_values(self.cursor,
+                       f"INSERT INTO {estado['tabla_completa']} ({estado['columnas_str']}) VALUES %s",
+                       filas, page_size=batch_size)
+
+    def _insertar_con_prepared(self, estado, filas):
+        if estado['preparada'] is None:
+            self._n_preparadas += 1
+            nombre   = f"_dp_ins_{self._n_preparadas}"
+            params   = ', '.join(f'${i}' for i in range(1, len(estado['columnas']) + 1))
+            self.cursor.execute(
+                f"PREPARE {nombre} AS INSERT INTO {estado['tabla_completa']} ({estado['columnas_str']}) VALUES ({params})")
+            estado['preparada'] = nombre
+        batch_size   = self.config.get('optimizacion', {}).get('batch_size', 1000)
+        placeholders = ', '.join(['%s'] * len(estado['columnas']))
+        execute_batch(self.cursor, f"EXECUTE {estado['preparada']} ({placeholders})",
+                      filas, page_size=batch_size)
+
+    def _insertar_con_batch(self, estado, filas):
+        placeholders = ', '.join(['%s'] * len(estado['columnas']))
+        query        = f"INSERT INTO {estado['tabla_completa']} ({estado['columnas_str']}) VALUES ({placeholders})"
+        batch_size   = self.config.get('optimizacion', {}).get('batch_size', 1000)
+        execute_batch(self.cursor, query, filas, page_size=batch_size)
+
+    def _liberar_preparada(self, estado):
+        if estado['preparada'] is None:
+            return
+        try:
+            self.cursor.execute(f"DEALLOCATE {estado['preparada']}")
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
 
-    def _actualizar_cache_insercion(self, tabla, registros, columnas):
+    def _actualizar_cache_insercion(self, tabla, filas, columnas):
+        if tabla in self.metadata['fks_diferidas']:
+            pks = self.metadata['pks'].get(tabla, [])
+            if pks and all(pk in columnas for pk in pks):
+                idx = [columnas.index(pk) for pk in pks]
+                self._filas_diferidas.setdefault(tabla, []).extend(
+                    tuple(f[i] for i in idx) for f in filas)
+            else:
+                print(f"  [WARN] {tabla}: sin PK en las filas insertadas, no se completaran sus FKs diferidas")
+        for restriccion in self._unicas_compuestas.get(tabla, []):
+            if all(col in columnas for col in restriccion['columnas']):
+                idx       = [columnas.index(col) for col in restriccion['columnas']]
+                cache_key = f"{tabla}.({','.join(restriccion['columnas'])})"
+                tuplas    = (tuple(f[i] for i in idx) for f in filas)
+                self.data_cache.setdefault(cache_key, []).extend(t for t in tuplas if None not in t)
         for pk_col in self.metadata['pks'].get(tabla, []):
             if pk_col in columnas:
+                idx       = columnas.index(pk_col)
                 cache_key = f"{tabla}.{pk_col}"
-                valores   = [r[pk_col] for r in registros if r.get(pk_col) is not None]
+                valores   = [f[idx] for f in filas if f[idx] is not None]
                 self.data_cache.setdefault(cache_key, []).extend(valores)
 
+    # ── Mantenimiento posterior (ANALYZE / VACUUM) ────────────────────────────
+    def iniciar_mantenimiento(self):
+        if not self.config.get('mantenimiento', {}).get('habilitado', True):
+            return
+        from data_prueba_mantenimiento import MantenimientoPostCarga
+        self._mantenimiento = MantenimientoPostCarga(self)
+        self._mantenimiento.iniciar()
+
+    def _tabla_confirmada(self, tabla, filas):
+        if self._mantenimiento is not None:
+            self._mantenimiento.programar(tabla, filas)
+
+    def finalizar_mantenimiento(self, descartar=False):
+        """Espera al pool de mantenimiento; descartar abandona las tablas pendientes."""
+        if self._mantenimiento is None:
+            return None
+        mantenimiento, self._mantenimiento = self._mantenimiento, None
+        resumen = mantenimiento.finalizar(descartar)
+        if not descartar:
+            self.stats['mantenimiento'] = resumen
+        return resumen
+
     def generar_data_completa(self, cantidad_base=None):
         if cantidad_base is None:
             cantidad_base = self.config.get('cantidad_base', 100)
@@ -788,20 +1685,73 @@ class SmartDataGenerator:
         print(f"{'='*70}\n")
         print(f"Cantidad base: {cantidad_base} registros")
         print(f"Tablas a procesar: {len(self.metadata['orden_carga'])}")
-        usar_copy = self.config.get('optimizacion', {}).get('usar_copy')
-        print(f"Metodo de insercion: {'COPY' if usar_copy else 'INSERT BATCH'}\n")
+        opt        = self.config.get('optimizacion', {})
+        estrategia = opt.get('estrategia_insercion', 'auto')
+        print(f"Estrategia de insercion: {estrategia}")
+        print(f"Ejecucion: {'pipeline' if opt.get('pipeline', True) else 'secuencial'}\n")
+        perfilador = None
+        if self.config.get('perfilado', {}).get('habilitado'):
+            from data_prueba_perfilado import PerfiladorGeneracion
+            perfilador = PerfiladorGeneracion(self).instalar()
+        self.iniciar_mantenimiento()
+        try:
+            if opt.get('pipeline', True):
+                from data_prueba_pipeline import EjecutorPipeline
+                total_insertados = EjecutorPipeline(self).ejecutar(cantidad_base)
+            else:
+                total_insertados = self._generar_secuencial(cantidad_base)
+            self.completar_fks_diferidas()
+        except BaseException:
+            self.finalizar_mantenimiento(descartar=True)
+            raise
+        finally:
+            if perfilador is not None:
+                perfilador.desinstalar()
+        self.stats['tiempo_fin']      = datetime.now()
+        self.finalizar_mantenimiento()
+        if perfilador is not None:
+            self._guardar_perfilado(perfilador)
+        self.stats['total_registros'] = total_insertados
+        self._mostrar_reporte_final()
+
+    def _guardar_perfilado(self, perfilador):
+        resumen = perfilador.resumen()
+        self.stats['perfilado'] = resumen
+        try:
+            archivo = perfilador.guardar(resumen, self.config['perfilado'].get('directorio'))
+            self.stats['perfilado_archivo'] = str(archivo)
+        except Exception as e:
+            print(f"[WARN] No se pudo guardar el perfilado: {e}")
+
+    def estimar_costos(self, cantidad_base=None, plan=None):
+        """Predice tiempo, heap, índices y WAL de la carga sin dejar datos.
+        plan: {tabla: filas}; por defecto el mismo de generar_data_completa."""
+        from data_prueba_estimacion import EstimadorCostos
+        if plan is None:
+            if cantidad_base is None:
+                cantidad_base = self.config.get('cantidad_base', 100)
+            plan = {t: self._cantidad_tabla(t, cantidad_base) for t in self.metadata['orden_carga']}
+        estimador = EstimadorCostos(self)
+        resultado = estimador.estimar(plan)
+        estimador.imprimir(resultado)
+        return resultado
+
+    def _cantidad_tabla(self, tabla, cantidad_base):
+        cantidad = self.config.get('cantidad_por_tabla', {}).get(tabla, cantidad_base)
+        if (self.config['multiplicadores_fk']['habilitado']
+                and tabla in self.metadata['fks'] and self.metadata['fks'][tabla]):
+            factor   = self.config['multiplicadores_fk']['factor']
+            cantidad = int(cantidad_base * len(self.metadata['fks'][tabla]) * factor)
+        return cantidad
+
+    def _generar_secuencial(self, cantidad_base):
+        """Genera e inserta tabla por tabla (chunk a chunk), alternando CPU y red."""
         total_insertados = 0
         for i, tabla in enumerate(self.metadata['orden_carga'], 1):
             print(f"[{i}/{len(self.metadata['orden_carga'])}] {tabla}")
-            cantidad = self.config.get('cantidad_por_tabla', {}).get(tabla, cantidad_base)
-            if (self.config['multiplicadores_fk']['habilitado']
-                    and tabla in self.metadata['fks'] and self.metadata['fks'][tabla]):
-                factor   = self.config['multiplicadores_fk']['factor']
-                cantidad = int(cantidad_base * len(self.metadata['fks'][tabla]) * factor)
-            print(f"  -> Generando {cantidad} registros...")
-            registros  = self.generar_registros_tabla(tabla, cantidad)
-            print(f"  -> Insertando...")
-            insertados = self.insertar_registros(tabla, registros)
+            cantidad = self._cantidad_tabla(tabla, cantidad_base)
+            print(f"  -> Generando e insertando {cantidad} registros...")
+            insertados = self.cargar_tabla(tabla, cantidad)
             if insertados > 0:
                 print(f"  [OK] {insertados} registros insertados\n")
                 total_insertados += insertados
@@ -809,9 +1759,7 @@ class SmartDataGenerator:
             else:
                 print(f"  [WARN] 0 registros insertados\n")
                 self.stats['por_tabla'][tabla] = 0
-        self.stats['tiempo_fin']      = datetime.now()
-        self.stats['total_registros'] = total_insertados
-        self._mostrar_reporte_final()
+        return total_insertados
 
     def _mostrar_reporte_final(self):
         print(f"{'='*70}")
@@ -825,23 +1773,194 @@ class SmartDataGenerator:
             print(f"  - Tiempo total: {duracion:.2f} segundos")
             if duracion > 0:
                 print(f"  - Tasa de insercion: {self.stats['total_registros'] / duracion:.0f} registros/segundo")
+        if self.stats['estrategias']:
+            print(f"\nEstrategias de insercion:")
+            for tabla, info in self.stats['estrategias'].items():
+                medidas = ', '.join(
+                    f"{nombre} {valor:,.0f} f/s" if isinstance(valor, float) else f"{nombre} {valor}"
+                    for nombre, valor in info['medidas'].items())
+                print(f"  - {tabla}: {info['elegida']}" + (f" ({medidas})" if medidas else ""))
+        if self.stats.get('pipeline'):
+            pipeline = self.stats['pipeline']
+            print(f"\nPipeline ({pipeline['diagnostico']}):")
+            for nombre, etapa in pipeline['etapas'].items():
+                print(f"  - {nombre}: {etapa['utilizacion']:.0%} ocupada, "
+                      f"{etapa['items']} chunks, {etapa['ocupado']:.2f}s")
+            for nombre, cola in pipeline['colas'].items():
+                print(f"  - cola {nombre}: profundidad media {cola['media']:.1f}, "
+                      f"maxima {cola['maxima']}/{cola['capacidad']}")
+        if self.stats.get('mantenimiento'):
+            mant = self.stats['mantenimiento']
+            print(f"\nMantenimiento ({mant['operacion']}, {mant['conexiones']} conexiones): "
+                  f"{mant['duracion']:.2f}s, {mant['espera']:.2f}s despues de la carga")
+            for tabla, info in sorted(mant['tablas'].items(), key=lambda kv: -kv[1]['segundos']):
+                print(f"  - {tabla}: {info['segundos']:.2f}s ({info['filas']:,} filas)")
+            if mant['omitidas']:
+                print(f"  - omitidas: {', '.join(mant['omitidas'])}")
+        if self.stats.get('perfilado'):
+            from data_prueba_perfilado import PerfiladorGeneracion
+            PerfiladorGeneracion.imprimir(self.stats['perfilado'],
+                                          self.config.get('perfilado', {}).get('top', 15))
+            if self.stats.get('perfilado_archivo'):
+                print(f"\n[OK] Perfilado guardado en {self.stats['perfilado_archivo']}")
         if self.stats['errores']:
             print(f"\n[WARN] Errores encontrados: {len(self.stats['errores'])}")
             for error in self.stats['errores'][:5]:
                 print(f"  - {error}")
         print(f"\n{'='*70}\n")
 
-    def limpiar_tablas(self):
-        print(f"\nLimpiando tablas existentes...")
-        for tabla in reversed(self.metadata['orden_carga']):
+    def limpiar_tablas(self, tablas=None):
+        """Vacía las tablas (por defecto todas las del orden de carga) con un único
+        TRUNCATE: un solo round trip y una sola adquisición de locks."""
+        tablas = list(tablas if tablas is not None else self.metadata['orden_carga'])
+        if not tablas:
+            return
+        print(f"\nLimpiando {len(tablas)} tablas existentes...")
+        lista = ', '.join(f'{self.esquema}.{tabla}' for tabla in tablas)
+        try:
+            self.cursor.execute(f'TRUNCATE TABLE {lista} RESTART IDENTITY CASCADE')
+            self.conn.commit()
+            print(f"  [OK] {len(tablas)} tablas vaciadas, secuencias reiniciadas")
+            return
+        except Exception as e:
+            self.conn.rollback()
+            print(f"  [WARN] TRUNCATE conjunto fallo ({str(e).strip()}), limpiando tabla por tabla")
+        for tabla in reversed(tablas):
             try:
-                self.cursor.execute(f'TRUNCATE TABLE {self.esquema}.{tabla} CASCADE')
+                self.cursor.execute(f'TRUNCATE TABLE {self.esquema}.{tabla} RESTART IDENTITY CASCADE')
                 self.conn.commit()
                 print(f"  [OK] {tabla}")
             except Exception as e:
                 print(f"  [ERROR] Error en {tabla}: {e}")
                 self.conn.rollback()
 
+    # ── Snapshots (CREATE DATABASE ... TEMPLATE) ──────────────────────────────
+    # Un snapshot es una copia de la BD sembrada; restaurarlo clona el template a
+    # nivel de archivos, mucho más rápido que volver a generar.
+    _MARCA_SNAPSHOT = 'data_prueba snapshot de '
+
+    def _conexion_mantenimiento(self):
+        conn = psycopg2.connect(host=self.host, port=self.puerto, database='postgres',
+                                user=self.usuario, password=self.password)
+        conn.autocommit = True
+        return conn
+
+    def _liberar_bd(self, cursor, bd, forzar):
+        """CREATE DATABASE ... TEMPLATE y DROP DATABASE exigen que nadie esté conectado."""
+        cursor.execute("SELECT pid, usename, application_name FROM pg_stat_activity "
+                       "WHERE datname = %s AND pid <> pg_backend_pid()", (bd,))
+        sesiones = cursor.fetchall()
+        if not sesiones:
+            return
+        if not forzar:
+            raise RuntimeError(f"{len(sesiones)} sesion(es) conectadas a {bd} "
+                               f"(usar --forzar para terminarlas)")
+        for pid, _, _ in sesiones:
+            cursor.execute("SELECT pg_terminate_backend(%s)", (pid,))
+        print(f"  [WARN] {len(sesiones)} sesion(es) terminadas en {bd}")
+
+    def _es_snapshot(self, cursor, nombre):
+        """True si `nombre` existe y lleva la marca de snapshot, False si no existe.
+        Cualquier otra BD (o la de trabajo) es un error: nunca se borra ni se
+        restaura desde ella."""
+        if nombre == self.bd:
+            raise RuntimeError(f"El snapshot no puede ser la BD de trabajo ({self.bd})")
+        cursor.execute("SELECT shobj_description(oid, 'pg_database') FROM pg_database "
+                       "WHERE datname = %s", (nombre,))
+        fila = cursor.fetchone()
+        if fila is None:
+            return False
+        if not (fila[0] or '').startswith(self._MARCA_SNAPSHOT):
+            raise RuntimeError(f"{nombre} existe y no es un snapshot de data_prueba")
+        return True
+
+    def crear_snapshot(self, nombre=None, forzar=False):
+        """Guarda la BD actual como template `nombre` (por defecto <bd>_snapshot)."""
+        nombre = nombre or f"{self.bd}_snapshot"
+        inicio = time.perf_counter()
+        self.desconectar()
+        mant = self._conexion_mantenimiento()
+        try:
+            cur = mant.cursor()
+            if self._es_snapshot(cur, nombre):
+                cur.execute(sql.SQL("DROP DATABASE {}").format(sql.Identifier(nombre)))
+            self._liberar_bd(cur, self.bd, forzar)
+            cur.execute(sql.SQL("CREATE DATABASE {} TEMPLATE {}").format(
+                sql.Identifier(nombre), sql.Identifier(self.bd)))
+            cur.execute(sql.SQL("COMMENT ON DATABASE {} IS %s").format(sql.Identifier(nombre)),
+                        (f"{self._MARCA_SNAPSHOT}{self.bd} ({datetime.now():%Y-%m-%d %H:%M})",))
+            # Sin conexiones el snapshot no cambia y nunca bloquea una restauración.
+            cur.execute(sql.SQL("ALTER DATABASE {} ALLOW_CONNECTIONS false").format(
+                sql.Identifier(nombre)))
+            print(f"[OK] Snapshot {nombre} creado desde {self.bd} "
+                  f"en {time.perf_counter() - inicio:.1f}s")
+        finally:
+            mant.close()
+            self.conectar()
+        return nombre
+
+    def restaurar_snapshot(self, nombre=None, forzar=False):
+        """Reemplaza la BD por una copia del snapshot. Se clona primero a un nombre
+        temporal: si la copia falla, la BD original queda intacta."""
+        nombre   = nombre or f"{self.bd}_snapshot"
+        temporal = f"{self.bd}__restaurando"
+        inicio   = time.perf_counter()
+        self.desconectar()
+        mant = self._conexion_mantenimiento()
+        try:
+            cur = mant.cursor()
+            if not self._es_snapshot(cur, nombre):
+                raise RuntimeError(f"No existe el snapshot {nombre}")
+            self._liberar_bd(cur, self.bd, forzar)
+            cur.execute(sql.SQL("DROP DATABASE IF EXISTS {}").format(sql.Identifier(temporal)))
+            cur.execute(sql.SQL("CREATE DATABASE {} TEMPLATE {}").format(
+                sql.Identifier(temporal), sql.Identifier(nombre)))
+            cur.execute(sql.SQL("ALTER DATABASE {} ALLOW_CONNECTIONS true").format(
+                sql.Identifier(temporal)))
+            cur.execute(sql.SQL("COMMENT ON DATABASE {} IS NULL").format(sql.Identifier(temporal)))
+            self._liberar_bd(cur, self.bd, forzar)      # quien se conectó durante la copia
+            cur.execute(sql.SQL("DROP DATABASE {}").format(sql.Identifier(self.bd)))
+            cur.execute(sql.SQL("ALTER DATABASE {} RENAME TO {}").format(
+                sql.Identifier(temporal), sql.Identifier(self.bd)))
+            print(f"[OK] {self.bd} restaurada desde {nombre} "
+                  f"en {time.perf_counter() - inicio:.1f}s")
+        finally:
+            mant.close()
+            self.conectar()
+
+    def listar_snapshots(self):
+        mant = self._conexion_mantenimiento()
+        try:
+            cur = mant.cursor()
+            cur.execute("""
+                SELECT d.datname, shobj_description(d.oid, 'pg_database'),
+                       pg_size_pretty(pg_database_size(d.oid))
+                FROM pg_database d
+                WHERE shobj_description(d.oid, 'pg_database') LIKE %s
+                ORDER BY d.datname
+            """, (f"{self._MARCA_SNAPSHOT}%",))
+            snapshots = cur.fetchall()
+        finally:
+            mant.close()
+        for nombre, descripcion, tamano in snapshots:
+            print(f"  - {nombre}: {descripcion[len(self._MARCA_SNAPSHOT):]}, {tamano}")
+        if not snapshots:
+            print("  [INFO] No hay snapshots")
+        return snapshots
+
+    def eliminar_snapshot(self, nombre=None):
+        nombre = nombre or f"{self.bd}_snapshot"
+        mant = self._conexion_mantenimiento()
+        try:
+            cur = mant.cursor()
+            if not self._es_snapshot(cur, nombre):
+                print(f"[INFO] No existe el snapshot {nombre}")
+                return
+            cur.execute(sql.SQL("DROP DATABASE {}").format(sql.Identifier(nombre)))
+            print(f"[OK] Snapshot {nombre} eliminado")
+        finally:
+            mant.close()
+
 
 def main():
     if sys.platform == 'win32':
@@ -852,7 +1971,14 @@ def main():
             pass
     if len(sys.argv) < 7:
         print("Error: Faltan parámetros")
-        print("Uso: python data_prueba.py <host> <puerto> <bd> <usuario> <password> <esquema> [cantidad]")
+        print("Uso: python data_prueba.py <host> <puerto> <bd> <usuario> <password> <esquema> "
+              "[cantidad] [--perfilar]")
+        print("     python data_prueba.py <host> <puerto> <bd> <usuario> <password> <esquema> "
+              "--verificar <tabla> <desde> <hasta>")
+        print("     python data_prueba.py <host> <puerto> <bd> <usuario> <password> <esquema> "
+              "--estimar [cantidad]")
+        print("     python data_prueba.py <host> <puerto> <bd> <usuario> <password> <esquema> "
+              "--snapshot <crear|restaurar|listar|eliminar> [nombre] [--forzar]")
         sys.exit(1)
     host     = sys.argv[1]
     puerto   = sys.argv[2]
@@ -860,17 +1986,68 @@ def main():
     usuario  = sys.argv[4]
     password = sys.argv[5]
     esquema  = sys.argv[6]
-    cantidad = int(sys.argv[7]) if len(sys.argv) > 7 else None
+    opciones = sys.argv[7:]
+    if opciones[:1] == ['--verificar']:
+        if len(opciones) != 4:
+            print("Uso: ... --verificar <tabla> <desde> <hasta>")
+            sys.exit(1)
+        generator = SmartDataGenerator(host, puerto, bd, usuario, password, esquema)
+        if not generator.conectar():
+            sys.exit(1)
+        try:
+            generator.analizar_base_datos()
+            resultado = generator.verificar_rango(opciones[1], int(opciones[2]), int(opciones[3]))
+        finally:
+            generator.desconectar()
+        sys.exit(0 if resultado and resultado['faltantes'] == 0 else 2)
+    if opciones[:1] == ['--snapshot']:
+        forzar   = '--forzar' in opciones
+        args     = [o for o in opciones[1:] if o != '--forzar']
+        acciones = {'crear': 'crear_snapshot', 'restaurar': 'restaurar_snapshot',
+                    'listar': 'listar_snapshots', 'eliminar': 'eliminar_snapshot'}
+        if not args or args[0] not in acciones:
+            print("Uso: ... --snapshot <crear|restaurar|listar|eliminar> [nombre] [--forzar]")
+            sys.exit(1)
+        generator = SmartDataGenerator(host, puerto, bd, usuario, password, esquema)
+        try:
+            metodo = getattr(generator, acciones[args[0]])
+            if args[0] == 'listar':
+                metodo()
+            elif args[0] == 'eliminar':
+                metodo(args[1] if len(args) > 1 else None)
+            else:
+                metodo(args[1] if len(args) > 1 else None, forzar=forzar)
+        except Exception as e:
+            print(f"[ERROR] {e}")
+            sys.exit(1)
+        finally:
+            generator.desconectar()
+        sys.exit(0)
+    if opciones[:1] == ['--estimar']:
+        generator = SmartDataGenerator(host, puerto, bd, usuario, password, esquema)
+        if not generator.conectar():
+            sys.exit(1)
+        try:
+            generator.analizar_base_datos()
+            resultado = generator.estimar_costos(int(opciones[1]) if len(opciones) > 1 else None)
+        finally:
+            generator.desconectar()
+        sys.exit(0 if resultado['espacio'].get('suficiente', True) else 2)
+    perfilar = '--perfilar' in opciones
+    opciones = [o for o in opciones if o != '--perfilar']
+    cantidad = int(opciones[0]) if opciones else None
     print(f"\n{'='*70}")
     print(f"SEMBRADO INTELIGENTE DE DATOS - PostgreSQL")
     print(f"{'='*70}\n")
     print(f"Sistema de generacion semantica de datos de prueba")
     print(f"con inferencia de contexto de negocio\n")
     generator = SmartDataGenerator(host, puerto, bd, usuario, password, esquema)
+    if perfilar:
+        generator.config['perfilado']['habilitado'] = True
     if not generator.conectar():
         sys.exit(1)
     try:
-
+        generator.analizar_base_datos()
         if generator.config['limpieza_previa']['automatico']:
             generator.limpiar_tablas()
         elif generator.config['limpieza_previa']['preguntar']:
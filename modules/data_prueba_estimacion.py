@@ -0,0 +1,313 @@
+"""
+Estimación de costo de una carga de data_prueba antes de ejecutarla.
+
+Combina el plan de generación (filas por tabla) con una calibración local:
+  generacion    -> filas/s al generar una muestra de cada tabla.
+  serializacion -> filas/s al convertir la muestra a COPY texto.
+  envio         -> filas/s al cargar la muestra con COPY en las tablas reales,
+                   dentro de una transacción que se revierte al terminar.
+El ancho de fila sale del tipo de cada columna, de la muestra o de
+pg_stats.avg_width; con él se proyectan heap, índices y WAL.
+"""
+import math
+import re
+import shutil
+import time
+
+from psycopg2 import sql
+
+
+_PAGINA          = 8192
+_CABECERA_PAGINA = 24
+_CABECERA_TUPLA  = 23
+_PUNTERO_LINEA   = 4
+_MAX_TUPLAS_PAGINA = 291
+_LLENADO_BTREE   = 0.9      # fillfactor por defecto de los índices btree
+_REGISTRO_WAL    = 64       # cabecera aproximada de un registro WAL por inserción en índice
+
+# Ancho en disco de los tipos de largo fijo (udt_name).
+_ANCHOS_FIJOS = {
+    'bool': 1, 'char': 1, 'int2': 2, 'int4': 4, 'oid': 4, 'float4': 4, 'date': 4,
+    'int8': 8, 'float8': 8, 'money': 8, 'time': 8, 'timestamp': 8, 'timestamptz': 8,
+    'timetz': 12, 'interval': 16, 'uuid': 16, 'macaddr': 6, 'point': 16,
+}
+_ALINEACION = {'int2': 2, 'int4': 4, 'oid': 4, 'float4': 4, 'date': 4, 'int8': 8,
+               'float8': 8, 'money': 8, 'time': 8, 'timestamp': 8, 'timestamptz': 8,
+               'timetz': 8, 'interval': 8, 'point': 8}
+_HOSTS_LOCALES = {'', 'localhost', '127.0.0.1', '::1'}
+
+
+def _alinear(n, a=8):
+    return (n + a - 1) // a * a
+
+
+def formatear_bytes(n):
+    for unidad in ('B', 'KB', 'MB', 'GB', 'TB'):
+        if abs(n) < 1024 or unidad == 'TB':
+            return f"{n:,.0f} {unidad}" if unidad == 'B' else f"{n:,.1f} {unidad}"
+        n /= 1024
+
+
+def formatear_duracion(segundos):
+    if segundos < 60:
+        return f"{segundos:.1f}s"
+    if segundos < 3600:
+        return f"{int(segundos // 60)}m {int(segundos % 60):02d}s"
+    return f"{int(segundos // 3600)}h {int(segundos % 3600 // 60):02d}m"
+
+
+class EstimadorCostos:
+    """Predice tiempo, tamaño en disco y WAL de una carga sin dejar datos en la BD."""
+
+    def __init__(self, generador):
+        self.gen     = generador
+        opt          = generador.config.get('estimacion', {})
+        self.muestra = max(10, int(opt.get('filas_muestra', 1000)))
+
+    def estimar(self, plan):
+        """plan: {tabla: filas}. Devuelve el detalle por tabla y los totales."""
+        gen       = self.gen
+        orden     = [t for t in gen.metadata['orden_carga'] if plan.get(t, 0) > 0]
+        avg_width = self._anchos_pg_stats()
+        medidas   = self._calibrar(orden, plan)
+        tablas    = {}
+        for tabla in orden:
+            filas  = plan[tabla]
+            medida = medidas.get(tabla, {})
+            anchos = self._anchos_columnas(tabla, medida.get('muestra'), avg_width)
+            heap   = self._tamano_heap(tabla, filas, anchos)
+            indices = {idx['nombre']: self._tamano_indice(idx, filas, anchos)
+                       for idx in gen.metadata['indices'].get(tabla, [])}
+            if tabla in gen.metadata['fks_diferidas']:
+                # La segunda pasada (UPDATE de FKs diferidas) escribe otra versión de
+                # cada fila: páginas llenas, sin HOT.
+                heap    *= 2
+                indices  = {n: {'bytes': i['bytes'] * 2, 'entrada': i['entrada']}
+                            for n, i in indices.items()}
+            t_cpu  = sum(filas / medida[e] for e in ('generacion', 'serializacion') if medida.get(e))
+            t_red  = filas / medida['envio'] if medida.get('envio') else None
+            tablas[tabla] = {
+                'filas':        filas,
+                'ancho_fila':   sum(anchos.values()),
+                'tasas':        {e: medida.get(e) for e in ('generacion', 'serializacion', 'envio')},
+                'tiempo_cpu':   t_cpu,
+                'tiempo_envio': t_red,
+                'heap':         heap,
+                'indices':      sum(i['bytes'] for i in indices.values()),
+                # Heap: páginas nuevas registradas con su contenido. Índices: un registro
+                # por tupla más una imagen de página completa por página tocada.
+                'wal':          heap + sum(filas * (_REGISTRO_WAL + i['entrada']) + i['bytes']
+                                           for i in indices.values()),
+                'error':        medida.get('error'),
+            }
+        pipeline = gen.config.get('optimizacion', {}).get('pipeline', True)
+        cpu      = sum(t['tiempo_cpu'] for t in tablas.values())
+        red      = sum(t['tiempo_envio'] or 0 for t in tablas.values())
+        totales  = {
+            'filas':   sum(t['filas'] for t in tablas.values()),
+            'tiempo':  max(cpu, red) if pipeline else cpu + red,
+            'heap':    sum(t['heap'] for t in tablas.values()),
+            'indices': sum(t['indices'] for t in tablas.values()),
+            'wal':     sum(t['wal'] for t in tablas.values()),
+        }
+        totales['disco'] = totales['heap'] + totales['indices'] + totales['wal']
+        return {'tablas': tablas, 'totales': totales, 'pipeline': pipeline,
+                'espacio': self._espacio_libre(totales['disco'])}
+
+    # ── Calibración ───────────────────────────────────────────────────────────
+    def _calibrar(self, orden, plan):
+        """Genera, serializa y carga una muestra por tabla en orden de carga (las hijas
+        toman claves de la muestra de sus padres) y revierte todo al final."""
+        gen       = self.gen
+        cache     = {k: list(v) for k, v in gen.data_cache.items()}
+        unicos    = {k: set(v) for k, v in gen.generated_values.items()}
+        seriales  = self._inicios_seriales(orden)
+        medidas   = {}
+        print(f"Calibrando con muestras de hasta {self.muestra} filas por tabla...")
+        try:
+            for tabla in orden:
+                medidas[tabla] = self._calibrar_tabla(tabla, min(self.muestra, plan[tabla]),
+                                                      seriales.get(tabla, {}))
+        finally:
+            gen.conn.rollback()
+            gen.data_cache       = cache
+            gen.generated_values = unicos
+        return medidas
+
+    def _calibrar_tabla(self, tabla, n, seriales):
+        gen    = self.gen
+        medida = {}
+        t0        = time.perf_counter()
+        registros = gen.generar_registros_tabla(tabla, n)
+        medida['generacion'] = self._tasa(len(registros), t0)
+        if not registros:
+            medida['error'] = "la muestra no genero filas"
+            return medida
+        sin_inicio = [col for col, inicio in seriales.items() if inicio is None]
+        for col, inicio in seriales.items():
+            if inicio is not None:
+                for i, registro in enumerate(registros, 1):
+                    registro[col] = inicio + i
+        columnas = list(registros[0].keys())
+        filas    = [tuple(r.get(col) for col in columnas) for r in registros]
+        medida['muestra'] = (columnas, filas)
+        estado   = gen._nuevo_estado_insercion(tabla, columnas)
+        t0       = time.perf_counter()
+        datos    = gen._serializar_copy(estado, filas)
+        medida['serializacion'] = self._tasa(len(filas), t0)
+        if sin_inicio:
+            # Sin valores explícitos COPY llamaría a nextval: la muestra no se envía.
+            medida['error'] = f"no se pudo leer la secuencia de {', '.join(sin_inicio)}: envio sin medir"
+            print(f"  [WARN] {tabla}: {medida['error']}")
+            return medida
+        gen.cursor.execute("SAVEPOINT _dp_estimacion")
+        try:
+            t0 = time.perf_counter()
+            gen._enviar_copy(estado, datos)
+            medida['envio'] = self._tasa(len(filas), t0)
+            gen.cursor.execute("RELEASE SAVEPOINT _dp_estimacion")
+        except Exception as e:
+            gen.cursor.execute("ROLLBACK TO SAVEPOINT _dp_estimacion")
+            medida['error'] = f"COPY de la muestra fallo: {str(e).strip()}"
+            print(f"  [WARN] {tabla}: {medida['error']}")
+        return medida
+
+    @staticmethod
+    def _tasa(filas, inicio):
+        return filas / max(time.perf_counter() - inicio, 1e-6) if filas else None
+
+    def _inicios_seriales(self, orden):
+        """{tabla: {columna serial: último valor usado}} leído sin consumir la
+        secuencia (pg_sequence_last_value y el máximo de la columna). La muestra
+        lleva valores explícitos a partir de ahí: COPY no llama a nextval y la
+        estimación no toca secuencias que otras sesiones están usando. None si no
+        se pudo leer."""
+        gen     = self.gen
+        inicios = {}
+        for tabla in orden:
+            for col in gen.metadata['columnas'][tabla]:
+                secuencia = gen._secuencia_columna(col)
+                if secuencia is None:
+                    continue
+                try:
+                    gen.cursor.execute(sql.SQL(
+                        "SELECT COALESCE(GREATEST(pg_sequence_last_value(%s::regclass), "
+                        "(SELECT max({}) FROM {}.{})), 0)").format(
+                            sql.Identifier(col['nombre']), sql.Identifier(gen.esquema),
+                            sql.Identifier(tabla)), (secuencia,))
+                    valor = int(gen.cursor.fetchone()[0])
+                except Exception:
+                    gen.conn.rollback()
+                    valor = None
+                inicios.setdefault(tabla, {})[col['nombre']] = valor
+        gen.conn.rollback()
+        return inicios
+
+    # ── Tamaños ───────────────────────────────────────────────────────────────
+    def _anchos_pg_stats(self):
+        try:
+            self.gen.cursor.execute("""
+                SELECT tablename, attname, avg_width FROM pg_stats WHERE schemaname = %s
+            """, (self.gen.esquema,))
+            anchos = {(t, c): w for t, c, w in self.gen.cursor.fetchall()}
+            self.gen.conn.rollback()
+            return anchos
+        except Exception:
+            self.gen.conn.rollback()
+            return {}
+
+    def _anchos_columnas(self, tabla, muestra, avg_width):
+        """Bytes en disco por columna: tipo fijo, luego la muestra, luego pg_stats."""
+        columnas, filas = muestra or ([], [])
+        anchos = {}
+        for col in self.gen.metadata['columnas'][tabla]:
+            tipo = self.gen._tipo_columna(col)
+            if tipo in _ANCHOS_FIJOS:
+                ancho = _alinear(_ANCHOS_FIJOS[tipo], _ALINEACION.get(tipo, 1))
+            elif col['nombre'] in columnas and filas:
+                i       = columnas.index(col['nombre'])
+                valores = [len(str(f[i]).encode('utf-8')) for f in filas if f[i] is not None]
+                # Cabecera varlena corta (1 byte) hasta 126 bytes, larga (4) por encima.
+                ancho   = (sum(v + (1 if v < 127 else 4) for v in valores) / len(filas)
+                           if valores else 0)
+            elif (tabla, col['nombre']) in avg_width:
+                ancho = avg_width[(tabla, col['nombre'])]
+            else:
+                ancho = (col['max_length'] or 32) / 2
+            anchos[col['nombre']] = ancho
+        return anchos
+
+    def _tamano_heap(self, tabla, filas, anchos):
+        n_cols  = len(anchos)
+        nulos   = any(c['nullable'] for c in self.gen.metadata['columnas'][tabla])
+        cabecera = _alinear(_CABECERA_TUPLA + ((n_cols + 7) // 8 if nulos else 0))
+        tupla   = _alinear(cabecera + math.ceil(sum(anchos.values()))) + _PUNTERO_LINEA
+        por_pagina = min(_MAX_TUPLAS_PAGINA, max(1, (_PAGINA - _CABECERA_PAGINA) // tupla))
+        return math.ceil(filas / por_pagina) * _PAGINA
+
+    def _tamano_indice(self, indice, filas, anchos):
+        """B-tree: hojas al 90% más ~1% de páginas internas y la metapágina."""
+        m       = re.search(r'\((.*)\)', indice['definicion'])
+        claves  = [c.strip().strip('"') for c in m.group(1).split(',')] if m else []
+        llave   = sum(math.ceil(anchos.get(c, 8)) for c in claves) or 8
+        entrada = _alinear(8 + llave) + _PUNTERO_LINEA
+        por_hoja = max(1, int((_PAGINA - _CABECERA_PAGINA - 16) * _LLENADO_BTREE) // entrada)
+        hojas   = math.ceil(filas / por_hoja)
+        return {'bytes': (hojas + math.ceil(hojas * 0.01) + 1) * _PAGINA, 'entrada': entrada}
+
+    # ── Espacio libre ─────────────────────────────────────────────────────────
+    def _espacio_libre(self, requerido):
+        """Espacio libre del tablespace de la BD; solo medible si el servidor es local."""
+        gen    = self.gen
+        host   = str(gen.host or '')
+        if host not in _HOSTS_LOCALES and not host.startswith('/'):
+            return {'disponible': None, 'requerido': requerido,
+                    'motivo': f"servidor remoto ({host}): no se puede medir su disco"}
+        try:
+            gen.cursor.execute("""
+                SELECT t.spcname, pg_tablespace_location(t.oid)
+                FROM pg_database d JOIN pg_tablespace t ON t.oid = d.dattablespace
+                WHERE d.datname = current_database()
+            """)
+            tablespace, ruta = gen.cursor.fetchone()
+            if not ruta:
+                gen.cursor.execute("SHOW data_directory")
+                ruta = gen.cursor.fetchone()[0]
+            gen.conn.rollback()
+            libre = shutil.disk_usage(ruta).free
+        except Exception as e:
+            gen.conn.rollback()
+            return {'disponible': None, 'requerido': requerido,
+                    'motivo': f"no se pudo consultar el tablespace: {str(e).strip()}"}
+        return {'disponible': libre, 'requerido': requerido, 'tablespace': tablespace,
+                'ruta': ruta, 'suficiente': libre > requerido}
+
+    # ── Reporte ───────────────────────────────────────────────────────────────
+    def imprimir(self, resultado):
+        print(f"\n{'='*70}")
+        print(f"ESTIMACION DE COSTO")
+        print(f"{'='*70}\n")
+        print(f"  {'Tabla':<28}{'Filas':>12}{'Tiempo':>10}{'Heap':>12}{'Indices':>12}{'WAL':>12}")
+        for tabla, t in resultado['tablas'].items():
+            tiempo = t['tiempo_cpu'] + (t['tiempo_envio'] or 0)
+            print(f"  {tabla:<28}{t['filas']:>12,}{formatear_duracion(tiempo):>10}"
+                  f"{formatear_bytes(t['heap']):>12}{formatear_bytes(t['indices']):>12}"
+                  f"{formatear_bytes(t['wal']):>12}")
+            if t['error']:
+                print(f"    [WARN] {t['error']}")
+        tot = resultado['totales']
+        print(f"\nTotal ({'pipeline' if resultado['pipeline'] else 'secuencial'}):")
+        print(f"  - Registros: {tot['filas']:,}")
+        print(f"  - Tiempo estimado: {formatear_duracion(tot['tiempo'])}")
+        print(f"  - Heap: {formatear_bytes(tot['heap'])}, indices: {formatear_bytes(tot['indices'])}, "
+              f"WAL: {formatear_bytes(tot['wal'])}")
+        esp = resultado['espacio']
+        if esp['disponible'] is None:
+            print(f"  [INFO] Espacio libre desconocido: {esp['motivo']}")
+        elif esp['suficiente']:
+            print(f"  [OK] Espacio libre en {esp['tablespace']}: {formatear_bytes(esp['disponible'])} "
+                  f"(se necesitan ~{formatear_bytes(esp['requerido'])})")
+        else:
+            print(f"  [ERROR] Espacio insuficiente en {esp['tablespace']}: libre "
+                  f"{formatear_bytes(esp['disponible'])}, se necesitan ~{formatear_bytes(esp['requerido'])}")
+        print(f"\n{'='*70}\n")
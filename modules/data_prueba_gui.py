@@ -1,12 +1,16 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 import sys
+import queue
 import threading
+import time
 from pathlib import Path
 
 if not getattr(sys, 'frozen', False):
     sys.path.insert(0, str(Path(__file__).parent))
-from data_prueba import SmartDataGenerator
+from data_prueba import SmartDataGenerator, GeneracionCancelada
+from indice_busqueda import IndiceBusqueda
+from perfiles_columnas import AlmacenPerfiles
 
 # Fuentes como constantes de módulo — evita recrear tuplas por cada widget
 _F9   = ('Arial', 9)
@@ -16,7 +20,11 @@ _F11B = ('Arial', 11, 'bold')
 _F8   = ('Arial', 8)
 _F8B  = ('Arial', 8, 'bold')
 
-_LOTE_TABLAS = 10   # tablas a crear por tick del event loop
+_MARCA_SI    = '☑'
+_MARCA_NO    = '☐'
+_MAX_FILTRO  = 500   # resultados de búsqueda que se muestran en la lista
+_MS_GUARDADO = 800   # espera sin cambios antes de escribir los perfiles a disco
+_MS_EVENTOS  = 100  # intervalo de lectura de la cola de progreso
 
 
 class DataPruebaGUI:
@@ -33,14 +41,23 @@ class DataPruebaGUI:
         self.password = password
         self.esquema  = esquema
         self.generator               = None
-        self.tabla_vars              = {}
-        self.tabla_expanded          = {}
+        # Modelo plano: el Treeview solo refleja estos datos.
+        self.modelo_tablas           = {}   # tabla → {'seleccionada', 'cantidad', 'numero'}
         self.columnas_personalizadas = {}
-        self.columna_config_expanded = {}
-        self.columna_widgets         = {}   # col_key → (expand_btn, config_frame)
         self._col_info_idx           = {}   # col_key → col_info  (lookup O(1))
-        self._cfg_por_tabla          = {}   # cache de cantidad_por_tabla
+        self._tablas_abiertas        = set()   # tablas cuyas columnas ya se insertaron
+        self._editor_cantidad        = None
+        self._columna_en_panel       = None
+        self._indice                 = None   # IndiceBusqueda de tablas, columnas y comentarios
+        self._filtro_activo          = False
+        self._perfiles               = None   # AlmacenPerfiles (data/perfiles_columnas.db)
+        self._perfiles_cargados      = set()  # tablas cuyos perfiles ya están en memoria
+        self._guardado_programado    = None   # id de root.after del guardado diferido
+        self.root.protocol("WM_DELETE_WINDOW", self._al_cerrar)
         self.proceso_activo          = False
+        self._eventos                = queue.Queue()   # hilo de generación → Tk
+        self._cancelacion            = threading.Event()
+        self._progreso               = None            # métricas de la corrida en curso
         self.cantidad_base_default   = 100
         self.setup_ui()
         self.inicializar_generador()
@@ -69,27 +86,54 @@ class DataPruebaGUI:
                    command=self.deseleccionar_todas).pack(side=tk.RIGHT, padx=2)
         ttk.Button(header_panel, text="Todas",
                    command=self.seleccionar_todas).pack(side=tk.RIGHT, padx=2)
+        ttk.Button(header_panel, text="Importar perfiles",
+                   command=self.importar_perfiles).pack(side=tk.RIGHT, padx=2)
+        ttk.Button(header_panel, text="Exportar perfiles",
+                   command=self.exportar_perfiles).pack(side=tk.RIGHT, padx=(10, 2))
+        self.lbl_filtro = ttk.Label(header_panel, text="", font=_F8, foreground='gray')
+        self.lbl_filtro.pack(side=tk.RIGHT, padx=8)
+        self.buscar_var = tk.StringVar()
+        ttk.Entry(header_panel, textvariable=self.buscar_var, width=30,
+                  font=_F9).pack(side=tk.RIGHT, padx=2)
+        ttk.Label(header_panel, text="Buscar:", font=_F9).pack(side=tk.RIGHT, padx=(10, 2))
+        self.buscar_var.trace_add('write', lambda *_: self._filtrar_tablas())
 
         ttk.Separator(self.root, orient='horizontal').pack(fill=tk.X, padx=10)
 
         main_frame = ttk.Frame(self.root)
         main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
 
-        self.canvas   = tk.Canvas(main_frame, bg='white')
-        scrollbar     = ttk.Scrollbar(main_frame, orient="vertical",
-                                      command=self.canvas.yview)
-        self.tabla_frame = ttk.Frame(self.canvas)
-        self.canvas.configure(yscrollcommand=scrollbar.set)
+        # Treeview: solo dibuja las filas visibles; las columnas de cada tabla se
+        # insertan al expandirla y el panel de configuración se crea al elegir una.
+        self.panel_config = ttk.LabelFrame(main_frame, text="Configuración de columna",
+                                           padding=5, width=300)
+        self.panel_config.pack(side=tk.RIGHT, fill=tk.Y, padx=(8, 0))
+        self.panel_config.pack_propagate(False)
+        self._mostrar_ayuda_panel()
+
+        ttk.Style(self.root).configure('Treeview', rowheight=22)
+        self.tree = ttk.Treeview(main_frame, columns=('sel', 'cantidad', 'info'),
+                                 selectmode='browse')
+        self.tree.heading('#0', text='Tabla / columna', anchor=tk.W)
+        self.tree.heading('sel', text='Incluir')
+        self.tree.heading('cantidad', text='Registros')
+        self.tree.heading('info', text='Detalle', anchor=tk.W)
+        self.tree.column('#0', width=300, stretch=True)
+        self.tree.column('sel', width=60, anchor=tk.CENTER, stretch=False)
+        self.tree.column('cantidad', width=90, anchor=tk.E, stretch=False)
+        self.tree.column('info', width=220, stretch=True)
+        self.tree.tag_configure('tabla', font=_F10B)
+        self.tree.tag_configure('columna', font=_F9, foreground='#333333')
+        scrollbar = ttk.Scrollbar(main_frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        self._canvas_win = self.canvas.create_window(
-            (0, 0), window=self.tabla_frame, anchor="nw")
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
 
-        self.tabla_frame.bind("<Configure>", self._on_frame_configure)
-        self.canvas.bind("<Configure>", self._on_canvas_configure)
-        self.canvas.bind_all("<MouseWheel>",
-                             lambda e: self.canvas.yview_scroll(
-                                 int(-1 * (e.delta / 120)), "units"))
+        self.tree.bind('<<TreeviewOpen>>', self._on_tree_open)
+        self.tree.bind('<<TreeviewSelect>>', self._on_tree_select)
+        self.tree.bind('<Button-1>', self._on_tree_click)
+        self.tree.bind('<Double-1>', self._on_tree_doble_click)
+        self.tree.bind('<space>', self._on_tree_espacio)
 
         action_frame = ttk.Frame(self.root, padding="10")
         action_frame.pack(side=tk.BOTTOM, fill=tk.X)
@@ -97,15 +141,26 @@ class DataPruebaGUI:
         self.limpiar_var = tk.BooleanVar(value=False)
         ttk.Checkbutton(action_frame, text="Limpiar tablas antes de insertar",
                         variable=self.limpiar_var).pack(anchor=tk.W, pady=(0, 5))
+        self.btn_estimar = ttk.Button(action_frame, text="ESTIMAR COSTO",
+                                      command=self.estimar_costo)
+        self.btn_estimar.pack(fill=tk.X, pady=(0, 4))
         self.btn_ejecutar = ttk.Button(action_frame, text="GENERAR DATOS",
                                        command=self.ejecutar_generacion)
         self.btn_ejecutar.pack(fill=tk.X)
 
-    def _on_frame_configure(self, _event):
-        self.canvas.configure(scrollregion=self.canvas.bbox("all"))
-
-    def _on_canvas_configure(self, event):
-        self.canvas.itemconfig(self._canvas_win, width=event.width)
+        progreso_frame = ttk.Frame(action_frame)
+        progreso_frame.pack(fill=tk.X, pady=(6, 0))
+        self.lbl_tabla   = ttk.Label(progreso_frame, text="", font=_F9)
+        self.lbl_tabla.pack(anchor=tk.W)
+        self.bar_tabla   = ttk.Progressbar(progreso_frame, mode='determinate')
+        self.bar_tabla.pack(fill=tk.X, pady=(2, 4))
+        self.lbl_total   = ttk.Label(progreso_frame, text="", font=_F9)
+        self.lbl_total.pack(anchor=tk.W)
+        self.bar_total   = ttk.Progressbar(progreso_frame, mode='determinate')
+        self.bar_total.pack(fill=tk.X, pady=(2, 4))
+        self.btn_cancelar = ttk.Button(progreso_frame, text="CANCELAR",
+                                       command=self.cancelar_generacion, state=tk.DISABLED)
+        self.btn_cancelar.pack(fill=tk.X)
 
     # ── Inicialización ────────────────────────────────────────────────────────
     def inicializar_generador(self):
@@ -120,6 +175,10 @@ class DataPruebaGUI:
                 self.root.destroy()
                 return
             self.cantidad_base_default = self.generator.config.get('cantidad_base', 100)
+            try:
+                self._perfiles = AlmacenPerfiles(self.host, self.puerto, self.bd, self.esquema)
+            except Exception as e:
+                print(f"[WARN] Perfiles de columnas no disponibles: {e}")
             threading.Thread(target=self._analizar_bd_thread, daemon=True).start()
         except Exception as e:
             messagebox.showerror("Error", f"Error al inicializar: {e}")
@@ -128,152 +187,208 @@ class DataPruebaGUI:
     def _analizar_bd_thread(self):
         try:
             self.generator.analizar_base_datos()
+            self._indice = self._construir_indice()
         except Exception as e:
             self.root.after(0, lambda: messagebox.showerror(
                 "Error", f"Error en análisis: {e}"))
         else:
             self.root.after(0, self._preparar_indices_y_crear_controles)
 
-    # ── Construcción en lotes (no bloquea el event loop) ─────────────────────
+    # ── Lista de tablas (Treeview) ────────────────────────────────────────────
     def _preparar_indices_y_crear_controles(self):
-        """Construye índices O(1) y arranca la creación en lotes."""
+        """Construye índices O(1), el modelo y una fila de Treeview por tabla."""
         meta = self.generator.metadata
 
-        # Índice plano col_key → col_info (evita next() O(n) en cada toggle)
+        # Índice plano col_key → col_info (evita next() O(n) en cada selección)
         for tabla, cols in meta['columnas'].items():
             for col in cols:
                 self._col_info_idx[f"{tabla}.{col['nombre']}"] = col
 
-        # Cache de cantidad por tabla
-        self._cfg_por_tabla = self.generator.config.get('cantidad_por_tabla', {})
-
-        orden = list(enumerate(meta['orden_carga'], 1))
-        self._crear_lote_tablas(orden, 0)
-
-    def _crear_lote_tablas(self, orden, idx):
-        """Crea _LOTE_TABLAS controles y cede el control al event loop."""
-        fin = min(idx + _LOTE_TABLAS, len(orden))
-        for i in range(idx, fin):
-            self.crear_control_tabla(*orden[i])
-        if fin < len(orden):
-            self.root.after(0, self._crear_lote_tablas, orden, fin)
-
-    # ── Controles de tabla ────────────────────────────────────────────────────
-    def crear_control_tabla(self, numero, tabla):
-        container = ttk.Frame(self.tabla_frame, relief='solid', borderwidth=1)
-        container.pack(fill=tk.X, pady=2, padx=5)
-        header = ttk.Frame(container)
-        header.pack(fill=tk.X, padx=8, pady=5)
-
-        self.tabla_expanded[tabla] = tk.BooleanVar(value=False)
-        expand_btn = ttk.Button(header, text="▶", width=2,
-                                command=lambda t=tabla:
-                                self._toggle_columnas(t))
-        expand_btn.pack(side=tk.LEFT, padx=(0, 5))
-
-        var_check = tk.BooleanVar(value=True)
-        ttk.Checkbutton(header, variable=var_check).pack(side=tk.LEFT)
-
-        nombre_frame = ttk.Frame(header)
-        nombre_frame.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=10)
-        ttk.Label(nombre_frame, text=f"{numero}.",
-                  font=_F9, foreground='gray').pack(side=tk.LEFT)
-        ttk.Label(nombre_frame, text=tabla,
-                  font=_F10B).pack(side=tk.LEFT, padx=5)
-
-        num_fks = len(self.generator.metadata['fks'].get(tabla, []))
-        if num_fks:
-            ttk.Label(nombre_frame, text=f"FK: {num_fks}",
-                      font=_F8, foreground='gray').pack(side=tk.LEFT, padx=5)
-
-        cnt_frame = ttk.Frame(header)
-        cnt_frame.pack(side=tk.RIGHT)
-        ttk.Label(cnt_frame, text="Registros:", font=_F9).pack(side=tk.LEFT, padx=(0, 5))
-        cantidad_init = self._cfg_por_tabla.get(tabla, self.cantidad_base_default)
-        var_cantidad = tk.IntVar(value=cantidad_init)
-        tk.Spinbox(cnt_frame, from_=1, to=100000, textvariable=var_cantidad,
-                   width=8, font=_F9).pack(side=tk.LEFT)
-
-        columnas_frame = ttk.Frame(container)
-        self.tabla_vars[tabla] = (var_check, var_cantidad, expand_btn, columnas_frame)
-
-    def _toggle_columnas(self, tabla):
-        _, _, expand_btn, columnas_frame = self.tabla_vars[tabla]
-        if self.tabla_expanded[tabla].get():
-            columnas_frame.pack_forget()
-            expand_btn.config(text="▶")
-            self.tabla_expanded[tabla].set(False)
-        else:
-            if not columnas_frame.winfo_children():
-                self._crear_lista_columnas(tabla, columnas_frame)
-            columnas_frame.pack(fill=tk.BOTH, padx=15, pady=(0, 10))
-            expand_btn.config(text="▼")
-            self.tabla_expanded[tabla].set(True)
-
-    def _crear_lista_columnas(self, tabla, parent):
-        for col_info in self.generator.metadata['columnas'].get(tabla, []):
-            self._crear_control_columna(parent, tabla, col_info)
-
-    def _crear_control_columna(self, parent, tabla, col_info):
-        col_container = ttk.Frame(parent)
-        col_container.pack(fill=tk.X, padx=5, pady=1)
-        col_header = ttk.Frame(col_container)
-        col_header.pack(fill=tk.X, padx=8, pady=3)
-
-        col_key      = f"{tabla}.{col_info['nombre']}"
-        config_frame = ttk.Frame(col_container)
-
-        expand_btn = ttk.Button(col_header, text="▶", width=2,
-                                command=lambda k=col_key: self._toggle_config_columna(k))
-        expand_btn.pack(side=tk.LEFT, padx=(0, 5))
-        self.columna_widgets[col_key] = (expand_btn, config_frame)
-
-        ttk.Label(col_header, text=col_info['nombre'],
-                  font=_F9B).pack(side=tk.LEFT)
-
-        tipo = col_info['udt_name'] or col_info['tipo_dato']
-        ml   = col_info.get('max_length')
-        ttk.Label(col_header, text=f"{tipo}({ml})" if ml else tipo,
-                  font=_F8, foreground='gray').pack(side=tk.LEFT, padx=10)
-
-        meta        = self.generator.metadata
-        nombre      = col_info['nombre']
-        indicadores = []
+        cfg_por_tabla = self.generator.config.get('cantidad_por_tabla', {})
+        insertar      = self.tree.insert
+        for numero, tabla in enumerate(meta['orden_carga'], 1):
+            cantidad = cfg_por_tabla.get(tabla, self.cantidad_base_default)
+            if not isinstance(cantidad, int):
+                cantidad = self.cantidad_base_default
+            self.modelo_tablas[tabla] = {'seleccionada': True, 'cantidad': cantidad,
+                                         'numero': numero}
+            num_fks = len(meta['fks'].get(tabla, []))
+            insertar('', tk.END, iid=tabla, text=f"{numero}. {tabla}", tags=('tabla',),
+                     values=(_MARCA_SI, cantidad, f"FK: {num_fks}" if num_fks else ''))
+            if meta['columnas'].get(tabla):
+                insertar(tabla, tk.END, iid=f"{tabla}.")      # marcador: muestra ▶
+
+    def _on_tree_open(self, _event):
+        self._poblar_columnas(self.tree.focus())
+
+    def _poblar_columnas(self, tabla):
+        if tabla in self.modelo_tablas and tabla not in self._tablas_abiertas:
+            self._tablas_abiertas.add(tabla)
+            self._cargar_perfiles([tabla])
+            self.tree.delete(f"{tabla}.")
+            for col_info in self.generator.metadata['columnas'].get(tabla, []):
+                col_key = f"{tabla}.{col_info['nombre']}"
+                self.tree.insert(tabla, tk.END, iid=col_key, text=col_info['nombre'],
+                                 tags=('columna',), values=('', '', self._detalle_columna(tabla, col_info)))
+
+    def _detalle_columna(self, tabla, col_info):
+        tipo   = col_info['udt_name'] or col_info['tipo_dato']
+        ml     = col_info.get('max_length')
+        meta   = self.generator.metadata
+        nombre = col_info['nombre']
+        partes = [f"{tipo}({ml})" if ml else tipo]
         if tabla in meta['pks'] and nombre in meta['pks'][tabla]:
-            indicadores.append('PK')
-        if any(fk['columna'] == nombre for fk in meta['fks'].get(tabla, [])):
-            indicadores.append('FK')
-        if tabla in meta['uniques'] and nombre in meta['uniques'][tabla]:
-            indicadores.append('UQ')
+            partes.append('PK')
+        if any(nombre in fk['columnas'] for fk in meta['fks'].get(tabla, [])):
+            partes.append('FK')
+        if any(nombre in uq['columnas'] for uq in meta['uniques'].get(tabla, [])):
+            partes.append('UQ')
         if not col_info['nullable']:
-            indicadores.append('NN')
-        if indicadores:
-            ttk.Label(col_header, text=' | '.join(indicadores),
-                      font=_F8B, foreground='gray').pack(side=tk.LEFT, padx=5)
-        if col_key in self.columnas_personalizadas:
-            ttk.Label(col_header, text="Personalizado",
-                      font=_F8B).pack(side=tk.LEFT, padx=10)
-
-    def _toggle_config_columna(self, col_key):
-        entry = self.columna_widgets.get(col_key)
-        if not entry:
+            partes.append('NN')
+        if f"{tabla}.{nombre}" in self.columnas_personalizadas:
+            partes.append('Personalizado')
+        return ' | '.join(partes)
+
+    def _on_tree_click(self, event):
+        """Clic en la celda 'Incluir' de una tabla: alterna la selección."""
+        if self.tree.identify_region(event.x, event.y) != 'cell':
+            return
+        item = self.tree.identify_row(event.y)
+        if item in self.modelo_tablas and self.tree.identify_column(event.x) == '#1':
+            self._alternar_tabla(item)
+            return 'break'
+
+    def _on_tree_espacio(self, _event):
+        item = self.tree.focus()
+        if item in self.modelo_tablas:
+            self._alternar_tabla(item)
+        return 'break'
+
+    def _alternar_tabla(self, tabla):
+        modelo = self.modelo_tablas[tabla]
+        modelo['seleccionada'] = not modelo['seleccionada']
+        self.tree.set(tabla, 'sel', _MARCA_SI if modelo['seleccionada'] else _MARCA_NO)
+
+    def _on_tree_doble_click(self, event):
+        """Doble clic en 'Registros': edita la cantidad con un Spinbox superpuesto."""
+        item = self.tree.identify_row(event.y)
+        if item not in self.modelo_tablas or self.tree.identify_column(event.x) != '#2':
+            return
+        x, y, ancho, alto = self.tree.bbox(item, 'cantidad')
+        self._cerrar_editor_cantidad()
+        var    = tk.IntVar(value=self.modelo_tablas[item]['cantidad'])
+        editor = tk.Spinbox(self.tree, from_=1, to=100000000, textvariable=var, font=_F9,
+                            justify=tk.RIGHT)
+        editor.place(x=x, y=y, width=ancho, height=alto)
+        editor.focus_set()
+        editor.selection_range(0, tk.END)
+        confirmar = lambda _e=None: self._cerrar_editor_cantidad(item, var)
+        editor.bind('<Return>', confirmar)
+        editor.bind('<FocusOut>', confirmar)
+        editor.bind('<Escape>', lambda _e: self._cerrar_editor_cantidad())
+        self._editor_cantidad = editor
+        return 'break'
+
+    def _cerrar_editor_cantidad(self, tabla=None, var=None):
+        if tabla is not None:
+            try:
+                cantidad = max(1, int(var.get()))
+                self.modelo_tablas[tabla]['cantidad'] = cantidad
+                self.tree.set(tabla, 'cantidad', cantidad)
+            except (tk.TclError, ValueError):
+                pass
+        if self._editor_cantidad is not None:
+            editor, self._editor_cantidad = self._editor_cantidad, None
+            editor.destroy()
+
+    # ── Búsqueda ──────────────────────────────────────────────────────────────
+    def _construir_indice(self):
+        """Corre en el hilo de análisis: tablas y columnas por nombre y comentario."""
+        comentarios = self._comentarios_esquema()
+        indice      = IndiceBusqueda()
+        for tabla in self.generator.metadata['orden_carga']:
+            indice.agregar(tabla, tabla, comentarios.get((tabla, None)))
+            for col in self.generator.metadata['columnas'].get(tabla, []):
+                indice.agregar(f"{tabla}.{col['nombre']}", col['nombre'],
+                               comentarios.get((tabla, col['nombre'])))
+        indice.construir()
+        return indice
+
+    def _comentarios_esquema(self):
+        """{(tabla, columna o None): comentario} del esquema en una sola consulta."""
+        cursor = self.generator.cursor
+        try:
+            cursor.execute("""
+                SELECT c.relname, a.attname, d.description
+                FROM pg_description d
+                JOIN pg_class c ON c.oid = d.objoid AND d.classoid = 'pg_catalog.pg_class'::regclass
+                JOIN pg_namespace n ON n.oid = c.relnamespace
+                LEFT JOIN pg_attribute a ON a.attrelid = c.oid AND a.attnum = d.objsubid
+                WHERE n.nspname = %s AND c.relkind IN ('r', 'p')
+            """, (self.generator.esquema,))
+            return {(tabla, columna): comentario for tabla, columna, comentario in cursor.fetchall()}
+        except Exception as e:
+            print(f"[WARN] Comentarios no indexados: {e}")
+            self.generator.conn.rollback()
+            return {}
+
+    def _filtrar_tablas(self):
+        """Muestra solo las tablas que coinciden (o tienen columnas que coinciden),
+        ordenadas por relevancia; sin texto se restaura el orden de carga."""
+        if self._indice is None:
+            return
+        consulta = self.buscar_var.get()
+        if not consulta.strip():
+            if self._filtro_activo:
+                for pos, tabla in enumerate(self.modelo_tablas):
+                    self.tree.move(tabla, '', pos)
+                self._filtro_activo = False
+            self.lbl_filtro.config(text="")
+            return
+        tablas       = {}      # dict: conserva el orden de relevancia
+        con_columnas = set()
+        for clave in self._indice.buscar(consulta, limite=_MAX_FILTRO):
+            if clave in self.modelo_tablas:
+                tablas.setdefault(clave, None)
+            else:
+                tabla = clave.split('.', 1)[0]
+                tablas.setdefault(tabla, None)
+                con_columnas.add(tabla)
+        self.tree.detach(*self.tree.get_children(''))
+        for pos, tabla in enumerate(tablas):
+            self.tree.move(tabla, '', pos)
+        for tabla in con_columnas:
+            self._poblar_columnas(tabla)
+            self.tree.item(tabla, open=True)
+        self._filtro_activo = True
+        self.lbl_filtro.config(text=f"{len(tablas)} tabla(s)")
+
+    # ── Panel de configuración (uno a la vez, creado al seleccionar) ─────────
+    def _mostrar_ayuda_panel(self):
+        for widget in self.panel_config.winfo_children():
+            widget.destroy()
+        ttk.Label(self.panel_config, text="Expande una tabla y elige una columna\n"
+                                          "para personalizar su generación.",
+                  font=_F9, foreground='gray', justify=tk.LEFT).pack(anchor=tk.W, pady=10)
+
+    def _on_tree_select(self, _event):
+        seleccion = self.tree.selection()
+        col_key   = seleccion[0] if seleccion else None
+        if col_key == self._columna_en_panel:
             return
-        expand_btn, config_frame = entry
-        # O(1) lookup — sin next() lineal
         col_info = self._col_info_idx.get(col_key)
         if not col_info:
+            self._columna_en_panel = None
+            self._mostrar_ayuda_panel()
             return
+        self._columna_en_panel = col_key
         tabla = col_key.split('.', 1)[0]
-        if self.columna_config_expanded.get(col_key, False):
-            config_frame.pack_forget()
-            expand_btn.config(text="▶")
-            self.columna_config_expanded[col_key] = False
-        else:
-            if not config_frame.winfo_children():
-                self._crear_panel_config_columna(config_frame, tabla, col_info)
-            config_frame.pack(fill=tk.X, padx=20, pady=(0, 8))
-            expand_btn.config(text="▼")
-            self.columna_config_expanded[col_key] = True
+        for widget in self.panel_config.winfo_children():
+            widget.destroy()
+        ttk.Label(self.panel_config, text=col_info['nombre'], font=_F10B).pack(anchor=tk.W)
+        ttk.Label(self.panel_config, text=self._detalle_columna(tabla, col_info),
+                  font=_F8B, foreground='gray').pack(anchor=tk.W)
+        self._crear_panel_config_columna(self.panel_config, tabla, col_info)
 
     def _auto_save_columna(self, col_key, col_tipo, config_vars, *_):
         try:
@@ -298,9 +413,94 @@ class DataPruebaGUI:
             else:
                 return
             self.columnas_personalizadas[col_key] = {'tipo': col_tipo, 'config': config}
+            self._programar_guardado(col_key)
+            self._refrescar_detalle(col_key)
         except Exception:
             pass
 
+    def _refrescar_detalle(self, col_key):
+        if self.tree.exists(col_key):
+            tabla = col_key.split('.', 1)[0]
+            self.tree.set(col_key, 'info',
+                          self._detalle_columna(tabla, self._col_info_idx[col_key]))
+
+    # ── Perfiles persistidos ──────────────────────────────────────────────────
+    def _cargar_perfiles(self, tablas):
+        """Trae de disco los perfiles de las tablas que aún no se consultaron."""
+        faltan = [t for t in tablas if t not in self._perfiles_cargados]
+        if not faltan:
+            return
+        self._perfiles_cargados.update(faltan)
+        if self._perfiles is None:
+            return
+        try:
+            for col_key, perfil in self._perfiles.cargar_tablas(faltan).items():
+                self.columnas_personalizadas.setdefault(col_key, perfil)
+        except Exception as e:
+            print(f"[WARN] No se pudieron leer los perfiles: {e}")
+
+    def _programar_guardado(self, col_key):
+        """Cada cambio reinicia el temporizador: una ráfaga de teclas es una escritura."""
+        if self._perfiles is None:
+            return
+        self._perfiles.programar(col_key, self.columnas_personalizadas[col_key])
+        if self._guardado_programado is not None:
+            self.root.after_cancel(self._guardado_programado)
+        self._guardado_programado = self.root.after(_MS_GUARDADO, self._guardar_perfiles)
+
+    def _guardar_perfiles(self):
+        self._guardado_programado = None
+        try:
+            self._perfiles.guardar_pendientes()
+        except Exception as e:
+            print(f"[WARN] No se pudieron guardar los perfiles: {e}")
+
+    def exportar_perfiles(self):
+        if self._perfiles is None:
+            messagebox.showwarning("Advertencia", "Perfiles de columnas no disponibles")
+            return
+        archivo = filedialog.asksaveasfilename(
+            defaultextension=".json", filetypes=[("JSON", "*.json")],
+            initialfile=f"perfiles_{self.bd}_{self.esquema}.json")
+        if not archivo:
+            return
+        try:
+            n = self._perfiles.exportar(archivo)
+            messagebox.showinfo("Exportar perfiles", f"{n} perfil(es) exportado(s)")
+        except Exception as e:
+            messagebox.showerror("Error", f"Error al exportar perfiles: {e}")
+
+    def importar_perfiles(self):
+        if self._perfiles is None:
+            messagebox.showwarning("Advertencia", "Perfiles de columnas no disponibles")
+            return
+        archivo = filedialog.askopenfilename(filetypes=[("JSON", "*.json")])
+        if not archivo:
+            return
+        try:
+            importados = self._perfiles.importar(archivo)
+        except Exception as e:
+            messagebox.showerror("Error", f"Error al importar perfiles: {e}")
+            return
+        for col_key, perfil in importados.items():
+            if col_key.split('.', 1)[0] in self._perfiles_cargados:
+                self.columnas_personalizadas[col_key] = perfil
+                self._refrescar_detalle(col_key)
+        if self._columna_en_panel in importados:
+            self._columna_en_panel = None       # recrea el panel con los valores nuevos
+            self._on_tree_select(None)
+        messagebox.showinfo("Importar perfiles", f"{len(importados)} perfil(es) importado(s)")
+
+    def _al_cerrar(self):
+        if self._guardado_programado is not None:
+            self.root.after_cancel(self._guardado_programado)
+        if self._perfiles is not None:
+            try:
+                self._perfiles.cerrar()
+            except Exception as e:
+                print(f"[WARN] No se pudieron guardar los perfiles: {e}")
+        self.root.destroy()
+
     # ── Paneles de configuración de columna ───────────────────────────────────
     def _crear_panel_config_columna(self, parent, tabla, col_info):
         col_tipo = (col_info['udt_name'] or col_info['tipo_dato']).lower()
@@ -389,23 +589,32 @@ class DataPruebaGUI:
 
     # ── Selección ─────────────────────────────────────────────────────────────
     def seleccionar_todas(self):
-        for var_check, *_ in self.tabla_vars.values():
-            var_check.set(True)
+        self._marcar_todas(True)
 
     def deseleccionar_todas(self):
-        for var_check, *_ in self.tabla_vars.values():
-            var_check.set(False)
+        self._marcar_todas(False)
+
+    def _marcar_todas(self, valor):
+        """Marca las tablas visibles: con un filtro activo, las ocultas no cambian."""
+        marca = _MARCA_SI if valor else _MARCA_NO
+        for tabla in self.tree.get_children(''):
+            modelo = self.modelo_tablas[tabla]
+            if modelo['seleccionada'] != valor:
+                modelo['seleccionada'] = valor
+                self.tree.set(tabla, 'sel', marca)
+
+    def _plan_seleccionado(self):
+        """[(tabla, cantidad)] de las tablas marcadas, desde el modelo."""
+        self._cerrar_editor_cantidad()
+        return [(tabla, m['cantidad']) for tabla, m in self.modelo_tablas.items()
+                if m['seleccionada']]
 
     # ── Ejecución de generación ───────────────────────────────────────────────
     def ejecutar_generacion(self):
         if self.proceso_activo:
             messagebox.showwarning("Advertencia", "Ya hay un proceso en ejecución")
             return
-        tablas_seleccionadas = [
-            (tabla, var_cantidad.get())
-            for tabla, (var_check, var_cantidad, _, _) in self.tabla_vars.items()
-            if var_check.get()
-        ]
+        tablas_seleccionadas = self._plan_seleccionado()
         if not tablas_seleccionadas:
             messagebox.showwarning("Advertencia", "Selecciona al menos una tabla")
             return
@@ -417,56 +626,168 @@ class DataPruebaGUI:
         if not messagebox.askyesno("Confirmar", mensaje):
             return
         self.btn_ejecutar.config(state=tk.DISABLED, text="GENERANDO...")
+        self.btn_estimar.config(state=tk.DISABLED)
+        self.btn_cancelar.config(state=tk.NORMAL, text="CANCELAR")
         self.proceso_activo = True
+        self._cancelacion.clear()
         threading.Thread(target=self._generar_datos_thread,
                          args=(tablas_seleccionadas, limpiar),
                          daemon=True).start()
+        self.root.after(_MS_EVENTOS, self._atender_eventos)
+
+    def cancelar_generacion(self):
+        """La generación se detiene al terminar el chunk en curso."""
+        self._cancelacion.set()
+        self.btn_cancelar.config(state=tk.DISABLED, text="CANCELANDO...")
+
+    # ── Estimación de costo ───────────────────────────────────────────────────
+    def estimar_costo(self):
+        if self.proceso_activo:
+            messagebox.showwarning("Advertencia", "Ya hay un proceso en ejecución")
+            return
+        plan = dict(self._plan_seleccionado())
+        if not plan:
+            messagebox.showwarning("Advertencia", "Selecciona al menos una tabla")
+            return
+        self._aplicar_config_desde_ui()
+        self.btn_estimar.config(state=tk.DISABLED, text="ESTIMANDO...")
+        self.btn_ejecutar.config(state=tk.DISABLED)
+        self.proceso_activo = True
+        threading.Thread(target=self._estimar_costo_thread, args=(plan,),
+                         daemon=True).start()
+
+    def _estimar_costo_thread(self, plan):
+        from data_prueba_estimacion import formatear_bytes, formatear_duracion
+        try:
+            resultado = self.generator.estimar_costos(plan=plan)
+            tot       = resultado['totales']
+            lineas    = [f"{tabla}: {t['filas']:,} filas, "
+                         f"{formatear_duracion(t['tiempo_cpu'] + (t['tiempo_envio'] or 0))}, "
+                         f"{formatear_bytes(t['heap'] + t['indices'])}"
+                         for tabla, t in resultado['tablas'].items()]
+            resumen = (f"Registros: {tot['filas']:,}\n"
+                       f"Tiempo estimado: {formatear_duracion(tot['tiempo'])}\n"
+                       f"Heap: {formatear_bytes(tot['heap'])}\n"
+                       f"Índices: {formatear_bytes(tot['indices'])}\n"
+                       f"WAL: {formatear_bytes(tot['wal'])}\n\n" + "\n".join(lineas))
+            esp = resultado['espacio']
+            if esp['disponible'] is None:
+                resumen += f"\n\nEspacio libre desconocido: {esp['motivo']}"
+            else:
+                resumen += (f"\n\nEspacio libre: {formatear_bytes(esp['disponible'])} "
+                            f"(se necesitan ~{formatear_bytes(esp['requerido'])})")
+            if esp.get('suficiente') is False:
+                self.root.after(0, lambda: messagebox.showwarning("Espacio insuficiente", resumen))
+            else:
+                self.root.after(0, lambda: messagebox.showinfo("Estimación de costo", resumen))
+        except Exception as e:
+            # `e` deja de existir al salir del except: el mensaje se fija ahora.
+            msg = f"Error durante la estimación: {e}"
+            self.root.after(0, lambda msg=msg: messagebox.showerror("Error", msg))
+        finally:
+            self.root.after(0, lambda: (
+                self.btn_estimar.config(state=tk.NORMAL, text="ESTIMAR COSTO"),
+                self.btn_ejecutar.config(state=tk.NORMAL)))
+            self.proceso_activo = False
 
     def _aplicar_config_desde_ui(self):
+        self._cargar_perfiles(t for t, m in self.modelo_tablas.items() if m['seleccionada'])
         self.generator.config['columnas_personalizadas'] = \
             self.columnas_personalizadas.copy()
 
     def _generar_datos_thread(self, tablas_seleccionadas, limpiar):
+        """Corre fuera del hilo de Tk: solo publica eventos en self._eventos."""
+        gen = self.generator
         try:
-            orden_carga      = self.generator.metadata['orden_carga']
+            orden_carga      = gen.metadata['orden_carga']
             tablas_dict      = dict(tablas_seleccionadas)
             tablas_ordenadas = [(t, tablas_dict[t])
                                 for t in orden_carga if t in tablas_dict]
 
             if limpiar:
-                for tabla, _ in reversed(tablas_ordenadas):
-                    try:
-                        self.generator.cursor.execute(
-                            f'TRUNCATE TABLE {self.esquema}.{tabla} CASCADE')
-                        self.generator.conn.commit()
-                    except Exception:
-                        self.generator.conn.rollback()
+                gen.limpiar_tablas([t for t, _ in tablas_ordenadas])
+
+            total_plan = sum(cantidad for _, cantidad in tablas_ordenadas)
+            previas    = [0]        # filas de tablas ya cerradas
+            self._eventos.put(('inicio', total_plan, len(tablas_ordenadas)))
+            gen.cancelacion  = self._cancelacion
+            gen.al_progresar = lambda tabla, hechas, total: self._eventos.put(
+                ('progreso', tabla, hechas, total, previas[0] + hechas))
 
             errores          = []
             total_insertados = 0
-            for tabla, cantidad in tablas_ordenadas:
-                try:
-                    registros        = self.generator.generar_registros_tabla(
-                        tabla, cantidad)
-                    insertados       = self.generator.insertar_registros(
-                        tabla, registros)
-                    total_insertados += insertados
-                except Exception as e:
-                    errores.append(f"{tabla}: {e}")
+            gen.iniciar_mantenimiento()
+            try:
+                for tabla, cantidad in tablas_ordenadas:
+                    n_errores        = len(gen.stats['errores'])
+                    total_insertados += gen.cargar_tabla(tabla, cantidad)
+                    errores.extend(gen.stats['errores'][n_errores:])
+                    previas[0]       += cantidad
+                gen.completar_fks_diferidas()
+            except BaseException:
+                gen.finalizar_mantenimiento(descartar=True)
+                raise
+            n_errores = len(gen.stats['errores'])
+            gen.finalizar_mantenimiento()
+            errores.extend(gen.stats['errores'][n_errores:])
 
             resumen = f"Generación completada\n\nTotal de registros: {total_insertados:,}"
             if errores:
                 resumen += (f"\n\nErrores en {len(errores)} tabla(s):\n"
                             + "\n".join(errores))
-            self.root.after(0, lambda: messagebox.showinfo("Completado", resumen))
+            self._eventos.put(('fin', 'info', "Completado", resumen))
+        except GeneracionCancelada:
+            self._eventos.put(('fin', 'warning', "Cancelado",
+                               f"Generación cancelada\n\nTablas completas: {total_insertados:,} "
+                               f"registros confirmados.\nLa tabla en curso se revirtió."))
         except Exception as e:
-            self.root.after(0, lambda: messagebox.showerror(
-                "Error", f"Error durante la generación: {e}"))
+            self._eventos.put(('fin', 'error', "Error", f"Error durante la generación: {e}"))
         finally:
-            self.root.after(0, lambda: self.btn_ejecutar.config(
-                state=tk.NORMAL, text="GENERAR DATOS"))
-            self.proceso_activo = False
+            gen.cancelacion  = None
+            gen.al_progresar = None
 
+    def _atender_eventos(self):
+        """Vacía la cola de eventos del hilo de generación y actualiza el progreso."""
+        fin = None
+        try:
+            while True:
+                evento = self._eventos.get_nowait()
+                if evento[0] == 'inicio':
+                    _, total, n_tablas = evento
+                    self._progreso = {'total': total, 'tablas': n_tablas, 'tabla': None,
+                                      'n_tabla': 0, 'inicio': time.perf_counter()}
+                    self.bar_total.config(maximum=max(total, 1), value=0)
+                elif evento[0] == 'progreso':
+                    self._mostrar_progreso(*evento[1:])
+                else:
+                    fin = evento
+        except queue.Empty:
+            pass
+        if fin is None:
+            self.root.after(_MS_EVENTOS, self._atender_eventos)
+            return
+        _, tipo, titulo, mensaje = fin
+        self.proceso_activo = False
+        self.btn_ejecutar.config(state=tk.NORMAL, text="GENERAR DATOS")
+        self.btn_estimar.config(state=tk.NORMAL)
+        self.btn_cancelar.config(state=tk.DISABLED, text="CANCELAR")
+        getattr(messagebox, f"show{tipo}")(titulo, mensaje)
+
+    def _mostrar_progreso(self, tabla, hechas, total_tabla, hechas_global):
+        p = self._progreso
+        if tabla != p['tabla']:
+            p['tabla']    = tabla
+            p['n_tabla'] += 1
+        transcurrido = time.perf_counter() - p['inicio']
+        tasa         = hechas_global / transcurrido if transcurrido > 0 else 0
+        restante     = (p['total'] - hechas_global) / tasa if tasa > 0 else 0
+        eta          = f"{int(restante // 60)}m {int(restante % 60):02d}s"
+        self.lbl_tabla.config(
+            text=f"[{p['n_tabla']}/{p['tablas']}] {tabla}: {hechas:,} / {total_tabla:,}")
+        self.bar_tabla.config(maximum=max(total_tabla, 1), value=hechas)
+        self.lbl_total.config(
+            text=f"Total: {hechas_global:,} / {p['total']:,}  —  {tasa:,.0f} filas/s  —  ETA {eta}")
+        self.bar_total.config(value=hechas_global)
 
 def main():
     if len(sys.argv) < 7:
@@ -0,0 +1,126 @@
+"""
+Mantenimiento posterior a la carga de data_prueba.
+
+Tras un sembrado grande las estadísticas del planificador quedan desactualizadas
+hasta que pasa autovacuum. Este módulo ejecuta ANALYZE (o VACUUM (FREEZE, ANALYZE))
+sobre cada tabla cargada con un pool pequeño de conexiones propias:
+  - las tablas entran a la cola al confirmarse, mientras los niveles de FK
+    siguientes aún se cargan (ANALYZE/VACUUM no bloquean inserciones);
+  - la cola prioriza las tablas con más filas;
+  - las tablas con FKs diferidas esperan a completar_fks_diferidas(), cuyo
+    UPDATE cambiaría de nuevo sus estadísticas.
+"""
+import heapq
+import threading
+import time
+
+import psycopg2
+
+
+class MantenimientoPostCarga:
+    """Pool de conexiones autocommit que atiende tablas de mayor a menor."""
+
+    def __init__(self, generador):
+        self.gen        = generador
+        cfg             = generador.config.get('mantenimiento', {})
+        self.freeze     = bool(cfg.get('vacuum_freeze', False))
+        self.durante    = bool(cfg.get('durante_carga', True))
+        self.omitir     = set(cfg.get('omitir', []))
+        self.n_conexiones = max(1, int(cfg.get('conexiones', 2)))
+        self.resultados = {}
+        self._cola      = []          # heap de (-filas, orden, tabla)
+        self._retenidas = []
+        self._orden     = 0
+        self._cerrada   = False
+        self._descartar = False
+        self._cambio    = threading.Condition()
+        self._hilos     = []
+        self._inicio    = None
+
+    def iniciar(self):
+        self._inicio = time.perf_counter()
+        for i in range(self.n_conexiones):
+            hilo = threading.Thread(target=self._trabajador, name=f'dp-mantenimiento-{i}', daemon=True)
+            hilo.start()
+            self._hilos.append(hilo)
+
+    def programar(self, tabla, filas):
+        """Encola una tabla recién confirmada (sin filas u omitida, se ignora)."""
+        if filas <= 0 or tabla in self.omitir:
+            return
+        with self._cambio:
+            self._orden += 1
+            item = (-filas, self._orden, tabla)
+            if self.durante and tabla not in self.gen.metadata['fks_diferidas']:
+                heapq.heappush(self._cola, item)
+                self._cambio.notify()
+            else:
+                self._retenidas.append(item)
+
+    def finalizar(self, descartar=False):
+        """Libera las tablas retenidas y espera a que el pool termine.
+        descartar: abandona lo pendiente (carga cancelada o fallida)."""
+        espera_desde = time.perf_counter()
+        with self._cambio:
+            if descartar:
+                self._descartar = True
+                self._cola.clear()
+            else:
+                for item in self._retenidas:
+                    heapq.heappush(self._cola, item)
+            self._retenidas.clear()
+            self._cerrada = True
+            self._cambio.notify_all()
+        for hilo in self._hilos:
+            hilo.join()
+        return {'duracion':    time.perf_counter() - self._inicio if self._inicio else 0.0,
+                'operacion':   self._operacion(),
+                'conexiones':  self.n_conexiones,
+                'espera':      time.perf_counter() - espera_desde,
+                'tablas':      dict(self.resultados),
+                'omitidas':    sorted(self.omitir)}
+
+    # ── Trabajadores ──────────────────────────────────────────────────────────
+    def _operacion(self):
+        return 'VACUUM (FREEZE, ANALYZE)' if self.freeze else 'ANALYZE'
+
+    def _siguiente(self):
+        with self._cambio:
+            while not self._cola and not self._cerrada:
+                self._cambio.wait()
+            if not self._cola or self._descartar:
+                return None
+            return heapq.heappop(self._cola)
+
+    def _trabajador(self):
+        conn = None
+        try:
+            # VACUUM no puede ir dentro de una transacción.
+            conn = psycopg2.connect(host=self.gen.host, port=self.gen.puerto,
+                                    database=self.gen.bd, user=self.gen.usuario,
+                                    password=self.gen.password)
+            conn.autocommit = True
+            cursor = conn.cursor()
+        except Exception as e:
+            print(f"  [ERROR] Mantenimiento: no se pudo conectar: {e}")
+            self.gen.stats['errores'].append(f"mantenimiento: {e}")
+            cursor = None
+        try:
+            while True:
+                item = self._siguiente()
+                if item is None:
+                    break
+                menos_filas, _, tabla = item
+                if cursor is None:
+                    continue
+                t0 = time.perf_counter()
+                try:
+                    cursor.execute(f'{self._operacion()} {self.gen.esquema}.{tabla}')
+                    self.resultados[tabla] = {'filas': -menos_filas,
+                                              'segundos': time.perf_counter() - t0}
+                except Exception as e:
+                    print(f"  [ERROR] {self._operacion()} {tabla}: {e}")
+                    self.gen.stats['errores'].append(f"mantenimiento {tabla}: {e}")
+        finally:
+            if conn is not None:
+                conn.close()
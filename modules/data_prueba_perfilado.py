@@ -0,0 +1,256 @@
+"""
+Perfilado opcional de data_prueba: dónde se va el tiempo de un sembrado.
+
+Acumula, mientras está instalado:
+  columnas      -> tiempo y llamadas de generar_valor_columna por 'tabla.columna'
+  generadores   -> tiempo y llamadas por método generador (generar_email, generar_por_tipo...)
+  unicidad      -> reintentos y agotamientos de _garantizar_unicidad por columna
+  fks           -> aciertos y fallos de la caché de FKs (un fallo es una consulta)
+  tablas        -> generación, serialización y envío (COPY/INSERT) por tabla
+
+Instalar reemplaza esos métodos por envolturas como atributos de la instancia;
+desinstalar las borra. Sin perfilado no queda ningún chequeo en el camino
+caliente. Los tiempos son inclusivos (generar_por_tipo incluye a
+generar_texto_basico) y cada categoría la escribe un solo hilo del pipeline.
+"""
+import json
+import sys
+import time
+from datetime import datetime
+from functools import wraps
+from pathlib import Path
+
+
+_SERIALIZADORES = ('_serializar_copy', '_serializar_copy_binario')
+_ENVIOS         = ('_enviar_copy', '_enviar_copy_binario', '_insertar_con_values',
+                   '_insertar_con_prepared', '_insertar_con_batch')
+
+
+def directorio_por_defecto():
+    if getattr(sys, 'frozen', False):
+        raiz = Path(sys.executable).parent
+    else:
+        raiz = Path(__file__).resolve().parent.parent
+    return raiz / "data" / "perfilado"
+
+
+class _Contador:
+    __slots__ = ('llamadas', 'segundos')
+
+    def __init__(self):
+        self.llamadas = 0
+        self.segundos = 0.0
+
+    def a_dict(self):
+        return {'llamadas': self.llamadas, 'segundos': self.segundos}
+
+
+class PerfiladorGeneracion:
+    """Instrumenta un SmartDataGenerator entre instalar() y desinstalar()."""
+
+    def __init__(self, generador):
+        self.gen         = generador
+        self.columnas    = {}
+        self.generadores = {}
+        self.unicidad    = {}      # 'tabla.columna' -> {'valores', 'reintentos', 'agotados'}
+        self.compuestas  = {}      # 'tabla.restriccion' -> {'llamadas', 'rechazos', 'segundos'}
+        self.fks         = {}      # 'tabla_ref.columna' -> {'aciertos', 'fallos', 'segundos_fallos'}
+        self.tablas      = {}      # tabla -> {'generacion', 'serializacion', 'envio'}
+        self._instalados = []
+        self._inicio     = None
+
+    # ── Instalación ───────────────────────────────────────────────────────────
+    def instalar(self):
+        gen = self.gen
+        self._inicio = time.perf_counter()
+        self._envolver('generar_valor_columna', self._envolver_columna)
+        self._envolver('generar_registros_tabla', self._envolver_registros)
+        self._envolver('_garantizar_unicidad', self._envolver_unicidad)
+        self._envolver('_garantizar_unicidad_compuesta', self._envolver_compuesta)
+        self._envolver('obtener_valor_fk', self._envolver_fk_simple)
+        self._envolver('obtener_tupla_fk', self._envolver_fk_compuesta)
+        metodos = {nombre for _, nombre in gen._CTX}
+        metodos |= {'generar_por_tipo', 'generar_texto_basico', '_generar_valor_personalizado'}
+        for nombre in sorted(metodos):
+            self._envolver(nombre, lambda original, nombre=nombre: self._envolver_generador(nombre, original))
+        for nombre in _SERIALIZADORES:
+            self._envolver(nombre, lambda original: self._envolver_insercion('serializacion', original))
+        for nombre in _ENVIOS:
+            self._envolver(nombre, lambda original: self._envolver_insercion('envio', original))
+        return self
+
+    def desinstalar(self):
+        for nombre in self._instalados:
+            self.gen.__dict__.pop(nombre, None)
+        self._instalados = []
+
+    def _envolver(self, nombre, fabrica):
+        original = getattr(self.gen, nombre)
+        envoltura = wraps(original)(fabrica(original))
+        setattr(self.gen, nombre, envoltura)
+        self._instalados.append(nombre)
+
+    # ── Envolturas ────────────────────────────────────────────────────────────
+    def _envolver_columna(self, original):
+        columnas = self.columnas
+
+        def envoltura(tabla, columna_info, registro_actual=None):
+            t0    = time.perf_counter()
+            valor = original(tabla, columna_info, registro_actual)
+            clave = f"{tabla}.{columna_info['nombre']}"
+            c     = columnas.get(clave)
+            if c is None:
+                c = columnas[clave] = _Contador()
+            c.llamadas += 1
+            c.segundos += time.perf_counter() - t0
+            return valor
+        return envoltura
+
+    def _envolver_generador(self, nombre, original):
+        c = self.generadores.setdefault(nombre, _Contador())
+
+        def envoltura(*args, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                c.llamadas += 1
+                c.segundos += time.perf_counter() - t0
+        return envoltura
+
+    def _envolver_registros(self, original):
+        def envoltura(tabla, cantidad, inicio=0):
+            t0 = time.perf_counter()
+            registros = original(tabla, cantidad, inicio)
+            self._tabla(tabla)['generacion'] += time.perf_counter() - t0
+            return registros
+        return envoltura
+
+    def _envolver_unicidad(self, original):
+        maximo = self.gen.config.get('validacion', {}).get('max_intentos_unicidad', 1000)
+
+        def envoltura(tabla, columna, valor, generador, columna_info):
+            reintentos = [0]
+
+            def contado(ci):
+                reintentos[0] += 1
+                return generador(ci)
+            resultado = original(tabla, columna, valor, contado, columna_info)
+            u = self.unicidad.setdefault(f"{tabla}.{columna}",
+                                         {'valores': 0, 'reintentos': 0, 'agotados': 0})
+            u['valores']    += 1
+            u['reintentos'] += reintentos[0]
+            if reintentos[0] >= maximo:
+                u['agotados'] += 1
+            return resultado
+        return envoltura
+
+    def _envolver_compuesta(self, original):
+        def envoltura(tabla, restriccion, registro, columnas_info):
+            t0 = time.perf_counter()
+            ok = original(tabla, restriccion, registro, columnas_info)
+            u  = self.compuestas.setdefault(f"{tabla}.{restriccion['nombre']}",
+                                            {'llamadas': 0, 'rechazos': 0, 'segundos': 0.0})
+            u['llamadas'] += 1
+            u['segundos'] += time.perf_counter() - t0
+            if not ok:
+                u['rechazos'] += 1
+            return ok
+        return envoltura
+
+    def _envolver_fk_simple(self, original):
+        def envoltura(tabla_ref, columna_ref):
+            clave = f"{tabla_ref}.{columna_ref}"
+            return self._medir_fk(clave, original, tabla_ref, columna_ref)
+        return envoltura
+
+    def _envolver_fk_compuesta(self, original):
+        def envoltura(fk):
+            clave = f"{fk['tabla_ref']}.({','.join(fk['columnas_ref'])})"
+            return self._medir_fk(clave, original, fk)
+        return envoltura
+
+    def _medir_fk(self, clave, original, *args):
+        f = self.fks.get(clave)
+        if f is None:
+            f = self.fks[clave] = {'aciertos': 0, 'fallos': 0, 'segundos_fallos': 0.0}
+        if self.gen.data_cache.get(clave):
+            f['aciertos'] += 1
+            return original(*args)
+        t0 = time.perf_counter()
+        try:
+            return original(*args)
+        finally:
+            f['fallos']          += 1
+            f['segundos_fallos'] += time.perf_counter() - t0
+
+    def _envolver_insercion(self, fase, original):
+        def envoltura(estado, datos):
+            t0 = time.perf_counter()
+            try:
+                return original(estado, datos)
+            finally:
+                self._tabla(estado['tabla'])[fase] += time.perf_counter() - t0
+        return envoltura
+
+    def _tabla(self, tabla):
+        t = self.tablas.get(tabla)
+        if t is None:       # setdefault: el pipeline serializa y envía desde hilos distintos
+            t = self.tablas.setdefault(tabla, {'generacion': 0.0, 'serializacion': 0.0, 'envio': 0.0})
+        return t
+
+    # ── Reporte ───────────────────────────────────────────────────────────────
+    def resumen(self):
+        ordenar = lambda d: dict(sorted(d.items(), key=lambda kv: -kv[1].segundos))
+        return {
+            'fecha':       datetime.now().isoformat(timespec='seconds'),
+            'bd':          self.gen.bd,
+            'esquema':     self.gen.esquema,
+            'duracion':    time.perf_counter() - self._inicio if self._inicio else 0.0,
+            'columnas':    {k: c.a_dict() for k, c in ordenar(self.columnas).items()},
+            'generadores': {k: c.a_dict() for k, c in ordenar(self.generadores).items() if c.llamadas},
+            'unicidad':    dict(sorted(self.unicidad.items(), key=lambda kv: -kv[1]['reintentos'])),
+            'compuestas':  self.compuestas,
+            'fks':         dict(sorted(self.fks.items(), key=lambda kv: -kv[1]['segundos_fallos'])),
+            'tablas':      self.tablas,
+        }
+
+    def guardar(self, resumen, directorio=None):
+        directorio = Path(directorio) if directorio else directorio_por_defecto()
+        directorio.mkdir(parents=True, exist_ok=True)
+        archivo = directorio / f"perfil_{self.gen.bd}_{self.gen.esquema}_{datetime.now():%Y%m%d_%H%M%S}.json"
+        with open(archivo, 'w', encoding='utf-8') as f:
+            json.dump(resumen, f, indent=2, ensure_ascii=False)
+        return archivo
+
+    @staticmethod
+    def imprimir(resumen, top=15):
+        total = sum(c['segundos'] for c in resumen['columnas'].values()) or 1e-9
+        print(f"\nPuntos calientes por columna (top {top}, tiempo inclusivo):")
+        print(f"  {'columna':<45} {'llamadas':>10} {'segundos':>9} {'%':>6} {'us/llamada':>11}")
+        for clave, c in list(resumen['columnas'].items())[:top]:
+            print(f"  {clave:<45} {c['llamadas']:>10,} {c['segundos']:>9.3f} "
+                  f"{c['segundos'] / total:>6.1%} {c['segundos'] / max(c['llamadas'], 1) * 1e6:>11.1f}")
+        if resumen['generadores']:
+            print(f"\nGeneradores (top {top}):")
+            for nombre, c in list(resumen['generadores'].items())[:top]:
+                print(f"  {nombre:<45} {c['llamadas']:>10,} {c['segundos']:>9.3f}")
+        reintentos = {k: u for k, u in resumen['unicidad'].items() if u['reintentos']}
+        if reintentos:
+            print(f"\nReintentos de unicidad:")
+            for clave, u in list(reintentos.items())[:top]:
+                agotados = f", {u['agotados']} agotados" if u['agotados'] else ""
+                print(f"  {clave:<45} {u['reintentos']:>10,} reintentos / {u['valores']:,} valores{agotados}")
+        for clave, u in resumen['compuestas'].items():
+            if u['rechazos']:
+                print(f"  {clave:<45} {u['rechazos']:>10,} filas rechazadas / {u['llamadas']:,}")
+        if resumen['fks']:
+            print(f"\nCache de FKs:")
+            for clave, f in resumen['fks'].items():
+                print(f"  {clave:<45} {f['aciertos']:>10,} aciertos, {f['fallos']:,} fallos "
+                      f"({f['segundos_fallos']:.3f}s en consultas)")
+        if resumen['tablas']:
+            print(f"\nPor tabla (generacion / serializacion / envio, segundos):")
+            for tabla, t in sorted(resumen['tablas'].items(),
+                                   key=lambda kv: -sum(kv[1].values())):
+                print(f"  {tabla:<45} {t['generacion']:>9.3f} {t['serializacion']:>9.3f} {t['envio']:>9.3f}")
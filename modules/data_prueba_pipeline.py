@@ -0,0 +1,286 @@
+"""
+Ejecución en pipeline para data_prueba.
+
+Tres etapas corren en paralelo unidas por colas acotadas (backpressure):
+  generacion    -> produce chunks de registros, tabla por tabla, cuando sus
+                   tablas padre (FK) ya están confirmadas.
+  serializacion -> convierte los registros a tuplas y, si la estrategia de la
+                   tabla ya se conoce, prepara el payload COPY.
+  envio         -> inserta en la conexión principal (una transacción por tabla)
+                   y actualiza la caché de FKs al confirmar.
+"""
+import queue
+import threading
+import time
+
+import psycopg2
+
+
+_FIN = object()
+
+
+# ── Métricas ──────────────────────────────────────────────────────────────────
+class _Etapa:
+    """Tiempo ocupado de una etapa, sin contar las esperas en las colas."""
+
+    def __init__(self, nombre):
+        self.nombre  = nombre
+        self.ocupado = 0.0
+        self.items   = 0
+
+    def medir(self, inicio):
+        self.ocupado += time.perf_counter() - inicio
+        self.items   += 1
+
+
+class _Cola(queue.Queue):
+    """Cola acotada que registra su profundidad en cada put."""
+
+    def __init__(self, nombre, capacidad):
+        super().__init__(capacidad)
+        self.nombre   = nombre
+        self.muestras = 0
+        self.suma     = 0
+        self.maxima   = 0
+
+    def put(self, item, block=True, timeout=None):
+        super().put(item, block, timeout)
+        profundidad   = self.qsize()
+        self.muestras += 1
+        self.suma     += profundidad
+        self.maxima   = max(self.maxima, profundidad)
+
+    def resumen(self):
+        return {'media': self.suma / self.muestras if self.muestras else 0.0,
+                'maxima': self.maxima, 'capacidad': self.maxsize}
+
+
+class EjecutorPipeline:
+    """Solapa la generación (CPU) con el envío COPY (red) entre chunks y tablas."""
+
+    def __init__(self, generador):
+        self.gen       = generador
+        opt            = generador.config.get('optimizacion', {})
+        self.chunk     = max(1, int(opt.get('tamano_chunk', 5000)))
+        capacidad      = max(1, int(opt.get('tamano_cola', 4)))
+        self.cola_ser  = _Cola('generacion->serializacion', capacidad)
+        self.cola_env  = _Cola('serializacion->envio', capacidad)
+        self.etapas    = {n: _Etapa(n) for n in ('generacion', 'serializacion', 'envio')}
+        self.estados   = {}
+        self.abortar   = threading.Event()
+        self.error_generacion = None
+        self.cambio    = threading.Condition()
+        self.terminadas = set()
+        self.total     = 0
+        self.planificadas = {}
+
+    def ejecutar(self, cantidad_base):
+        orden   = list(self.gen.metadata['orden_carga'])
+        padres  = {t: {fk['tabla_ref'] for fk in self.gen.metadata['fks'].get(t, [])
+                       if fk['tabla_ref'] != t and fk['tabla_ref'] in orden
+                       and (t, fk['columnas'][0]) not in self.gen._diferidas}
+                   for t in orden}
+        hilos = [
+            threading.Thread(target=self._etapa_generacion, args=(orden, padres, cantidad_base),
+                             name='dp-generacion', daemon=True),
+            threading.Thread(target=self._etapa_serializacion, name='dp-serializacion', daemon=True),
+        ]
+        inicio = time.perf_counter()
+        for hilo in hilos:
+            hilo.start()
+        try:
+            self._etapa_envio(len(orden))
+        except Exception:
+            # Libera a las otras etapas (bloqueadas en colas llenas) antes de propagar;
+            # la tabla en curso queda sin confirmar.
+            self.abortar.set()
+            with self.cambio:
+                self.cambio.notify_all()
+            while self.cola_env.get() is not _FIN:
+                pass
+            self.gen.conn.rollback()
+            raise
+        finally:
+            for hilo in hilos:
+                hilo.join()
+        if self.abortar.is_set():
+            # La generación se cortó a mitad de una tabla: sus chunks siguen en la
+            # transacción abierta y las tablas restantes no se procesaron.
+            self.gen.conn.rollback()
+            self.gen._comprobar_cancelacion()
+            raise RuntimeError(f"Pipeline interrumpido en la generacion: {self.error_generacion}")
+        self._registrar_metricas(time.perf_counter() - inicio)
+        return self.total
+
+    # ── Etapas ────────────────────────────────────────────────────────────────
+    def _etapa_generacion(self, orden, padres, cantidad_base):
+        etapa   = self.etapas['generacion']
+        lectura = None
+        try:
+            # Conexión propia (autocommit) para las consultas de FK fuera de caché:
+            # la principal está ocupada por la transacción del envío.
+            lectura = psycopg2.connect(host=self.gen.host, port=self.gen.puerto,
+                                       database=self.gen.bd, user=self.gen.usuario,
+                                       password=self.gen.password)
+            lectura.autocommit = True
+            self.gen._cursor_lectura = lectura.cursor()
+            pendientes = list(orden)
+            while pendientes and not self.abortar.is_set():
+                tabla = self._siguiente_tabla(pendientes, padres)
+                if tabla is None:
+                    break
+                pendientes.remove(tabla)
+                cantidad = self.gen._cantidad_tabla(tabla, cantidad_base)
+                self.planificadas[tabla] = cantidad
+                print(f"  -> {tabla}: generando {cantidad} registros...")
+                for desde in range(0, cantidad, self.chunk):
+                    if self.gen.cancelacion is not None and self.gen.cancelacion.is_set():
+                        self.abortar.set()
+                    if self.abortar.is_set():
+                        break
+                    t0        = time.perf_counter()
+                    registros = self.gen.generar_registros_tabla(
+                        tabla, min(self.chunk, cantidad - desde), inicio=desde)
+                    self.gen._reservar_ids(tabla, registros)
+                    etapa.medir(t0)
+                    if registros:
+                        self.cola_ser.put(('chunk', tabla, registros))
+                self.cola_ser.put(('fin_tabla', tabla, None))
+        except Exception as e:
+            print(f"  [ERROR] Etapa de generacion: {e}")
+            self.gen.stats['errores'].append(f"pipeline generacion: {e}")
+            self.error_generacion = e
+            self.abortar.set()
+        finally:
+            self.gen._cursor_lectura = None
+            if lectura is not None:
+                lectura.close()
+            self.cola_ser.put(_FIN)
+
+    def _siguiente_tabla(self, pendientes, padres):
+        """Primera tabla pendiente cuyas tablas padre ya están confirmadas. En un ciclo
+        de FKs ninguna lo estará: cuando todo lo enviado ya se confirmó se toma la
+        siguiente en orden de carga, igual que en la ejecución secuencial."""
+        with self.cambio:
+            while not self.abortar.is_set():
+                for tabla in pendientes:
+                    if padres[tabla] <= self.terminadas:
+                        return tabla
+                if len(self.terminadas) + len(pendientes) == len(padres):
+                    return pendientes[0]
+                self.cambio.wait(0.5)
+        return None
+
+    def _etapa_serializacion(self):
+        etapa    = self.etapas['serializacion']
+        columnas = {}
+        while True:
+            item = self.cola_ser.get()
+            if item is _FIN:
+                break
+            tipo, tabla, registros = item
+            if tipo != 'chunk':
+                self.cola_env.put((tipo, tabla, None, None, None))
+                continue
+            if self.abortar.is_set():
+                continue
+            t0    = time.perf_counter()
+            cols  = columnas.setdefault(tabla, list(registros[0].keys()))
+            filas = [tuple(r.get(col) for col in cols) for r in registros]
+            carga = None
+            estado = self.estados.get(tabla)
+            if estado is not None and estado['estrategia'] in self.gen._SERIALIZADORES:
+                estrategia = estado['estrategia']
+                serializar = getattr(self.gen, self.gen._SERIALIZADORES[estrategia][0])
+                try:
+                    carga = (estrategia, serializar(estado, filas))
+                except Exception:
+                    carga = None
+            etapa.medir(t0)
+            self.cola_env.put(('chunk', tabla, cols, filas, carga))
+        self.cola_env.put(_FIN)
+
+    def _etapa_envio(self, n_tablas):
+        etapa      = self.etapas['envio']
+        gen        = self.gen
+        insertadas = {}
+        fallidas   = set()
+        lotes      = {}
+        while True:
+            item = self.cola_env.get()
+            if item is _FIN:
+                break
+            tipo, tabla, columnas, filas, carga = item
+            gen._comprobar_cancelacion()
+            t0 = time.perf_counter()
+            if tipo == 'chunk':
+                if tabla in fallidas:
+                    continue
+                estado = self.estados.get(tabla)
+                if estado is None:
+                    estado = gen._nuevo_estado_insercion(tabla, columnas)
+                    self.estados[tabla] = estado
+                try:
+                    insertadas[tabla] = insertadas.get(tabla, 0) + gen._insertar_chunk(estado, filas, carga)
+                    lotes.setdefault(tabla, []).append(filas)
+                    gen._notificar_progreso(tabla, insertadas[tabla], self.planificadas.get(tabla, 0))
+                except Exception as e:
+                    gen.conn.rollback()
+                    print(f"  [ERROR] Error insertando en {tabla}: {e}")
+                    gen.stats['errores'].append(f"{tabla}: {str(e)}")
+                    fallidas.add(tabla)
+            else:
+                self._cerrar_tabla(tabla, tabla in fallidas, insertadas.pop(tabla, 0),
+                                   lotes.pop(tabla, []), n_tablas)
+            etapa.medir(t0)
+
+    def _cerrar_tabla(self, tabla, fallida, insertados, lotes, n_tablas):
+        """Confirma la tabla, publica sus claves para las tablas hijas y la marca como lista."""
+        gen    = self.gen
+        estado = self.estados.pop(tabla, None)
+        if estado is not None and not fallida:
+            try:
+                gen.conn.commit()
+                gen.stats['estrategias'][tabla] = {'elegida': estado['estrategia'],
+                                                   'medidas': estado['medidas']}
+                for filas in lotes:
+                    gen._actualizar_cache_insercion(tabla, filas, estado['columnas'])
+                gen._tabla_confirmada(tabla, insertados)
+            except Exception as e:
+                gen.conn.rollback()
+                print(f"  [ERROR] Error confirmando {tabla}: {e}")
+                gen.stats['errores'].append(f"{tabla}: {str(e)}")
+                insertados = 0
+        else:
+            insertados = 0
+        if estado is not None:
+            gen._liberar_preparada(estado)
+        gen.stats['por_tabla'][tabla] = insertados
+        self.total += insertados
+        listas = len(gen.stats['por_tabla'])
+        if insertados > 0:
+            print(f"[{listas}/{n_tablas}] {tabla}: [OK] {insertados} registros insertados")
+        else:
+            print(f"[{listas}/{n_tablas}] {tabla}: [WARN] 0 registros insertados")
+        with self.cambio:
+            self.terminadas.add(tabla)
+            self.cambio.notify_all()
+
+    # ── Reporte ───────────────────────────────────────────────────────────────
+    def _registrar_metricas(self, duracion):
+        duracion = max(duracion, 1e-9)
+        etapas   = {n: {'ocupado': e.ocupado, 'items': e.items,
+                        'utilizacion': min(e.ocupado / duracion, 1.0)}
+                    for n, e in self.etapas.items()}
+        cuello   = max(etapas, key=lambda n: etapas[n]['utilizacion'])
+        if cuello == 'envio':
+            diagnostico = "limitado por E/S: la base de datos es el cuello de botella"
+        else:
+            diagnostico = f"limitado por CPU: la etapa de {cuello} es el cuello de botella"
+        self.gen.stats['pipeline'] = {
+            'duracion':    duracion,
+            'etapas':      etapas,
+            'colas':       {c.nombre: c.resumen() for c in (self.cola_ser, self.cola_env)},
+            'cuello':      cuello,
+            'diagnostico': diagnostico,
+        }
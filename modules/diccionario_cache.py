@@ -0,0 +1,149 @@
+"""
+Caché de fragmentos RTF de la sección de atributos del diccionario, por tabla,
+persistida en data/diccionario_fragmentos.db con clave host/puerto/bd/usuario/esquema
+(el usuario importa: lo que el catálogo muestra depende de sus privilegios).
+
+Cada fragmento se guarda con la huella (md5 calculado en el servidor) de lo que
+el diccionario muestra de la tabla: columnas, tipos, nulos, PK/FK y
+comentarios. En la siguiente corrida sólo se consultan y renderizan las tablas
+cuya huella cambió; el resto se copia tal cual al documento.
+"""
+import sqlite3
+import sys
+import threading
+from datetime import datetime
+from pathlib import Path
+
+
+# Subir al cambiar cómo se escribe el fragmento: invalida todo lo guardado.
+VERSION_FRAGMENTO = 1
+# Subir al cambiar la tabla de abajo: un archivo con otra versión se recrea vacío.
+VERSION_ESQUEMA   = 2
+# Segundos que una conexión espera a que otra (lote en paralelo) suelte el archivo.
+ESPERA_BLOQUEO    = 30
+
+# Los fragmentos nuevos se vuelcan a sqlite al juntar tantos o tantos caracteres,
+# para no retener en memoria todo el RTF regenerado hasta guardar().
+MAX_PENDIENTES       = 200
+MAX_CHARS_PENDIENTES = 4 << 20
+
+_ESQUEMA_SQL = """
+    CREATE TABLE fragmentos (
+        host        TEXT NOT NULL,
+        puerto      TEXT NOT NULL,
+        bd          TEXT NOT NULL,
+        usuario     TEXT NOT NULL,
+        esquema     TEXT NOT NULL,
+        tabla       TEXT NOT NULL,
+        huella      TEXT NOT NULL,
+        fragmento   TEXT NOT NULL,
+        actualizado TEXT NOT NULL,
+        PRIMARY KEY (host, puerto, bd, usuario, esquema, tabla)
+    )
+"""
+
+
+def ruta_por_defecto():
+    if getattr(sys, 'frozen', False):
+        raiz = Path(sys.executable).parent
+    else:
+        raiz = Path(__file__).resolve().parent.parent
+    return raiz / "data" / "diccionario_fragmentos.db"
+
+
+class CacheFragmentos:
+    """Fragmentos {tabla: rtf} de un esquema, vigentes mientras su huella no cambie.
+    vigente() y registrar() admiten varios hilos (partes escritas en paralelo)."""
+
+    def __init__(self, host, puerto, bd, usuario, esquema, ruta=None):
+        ruta = Path(ruta) if ruta else ruta_por_defecto()
+        ruta.parent.mkdir(parents=True, exist_ok=True)
+        self._clave       = (str(host), str(puerto), str(bd), str(usuario), str(esquema))
+        self._conn        = sqlite3.connect(str(ruta), timeout=ESPERA_BLOQUEO, check_same_thread=False)
+        self._preparar_esquema()
+        self._huellas     = {}
+        self._guardadas   = {}
+        self._pendientes  = []
+        self._chars_pend  = 0
+        self._bloqueo     = threading.Lock()
+        self.reutilizados = 0
+        self.regenerados  = 0
+
+    def _preparar_esquema(self):
+        # BEGIN IMMEDIATE: si dos procesos abren un archivo viejo a la vez, sólo
+        # uno lo recrea y el otro ve ya la versión nueva.
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            if self._conn.execute("PRAGMA user_version").fetchone()[0] != VERSION_ESQUEMA:
+                self._conn.execute("DROP TABLE IF EXISTS fragmentos")
+                self._conn.execute(_ESQUEMA_SQL)
+                self._conn.execute(f"PRAGMA user_version = {VERSION_ESQUEMA}")
+            self._conn.commit()
+        except Exception:
+            self._conn.rollback()
+            raise
+
+    def preparar(self, huellas):
+        """Recibe {tabla: md5} del catálogo actual; devuelve el conjunto de tablas
+        cuyo fragmento guardado sigue vigente."""
+        self._huellas   = {t: f"{VERSION_FRAGMENTO}:{h}" for t, h in huellas.items()}
+        self._guardadas = dict(self._conn.execute(
+            "SELECT tabla, huella FROM fragmentos "
+            "WHERE host = ? AND puerto = ? AND bd = ? AND usuario = ? AND esquema = ?",
+            self._clave).fetchall())
+        return {t for t, h in self._huellas.items() if self._guardadas.get(t) == h}
+
+    def vigente(self, tabla):
+        """Fragmento guardado de la tabla, o None si cambió o no está."""
+        huella = self._huellas.get(tabla)
+        if huella is None or self._guardadas.get(tabla) != huella:
+            return None
+        with self._bloqueo:
+            fila = self._conn.execute(
+                "SELECT fragmento FROM fragmentos "
+                "WHERE host = ? AND puerto = ? AND bd = ? AND usuario = ? AND esquema = ? AND tabla = ?",
+                (*self._clave, tabla)).fetchone()
+            if fila is None:
+                return None
+            self.reutilizados += 1
+        return fila[0]
+
+    def registrar(self, tabla, fragmento):
+        with self._bloqueo:
+            self.regenerados += 1
+            huella = self._huellas.get(tabla)
+            if huella is None:
+                return
+            self._pendientes.append((tabla, huella, fragmento))
+            self._chars_pend += len(fragmento)
+            if len(self._pendientes) >= MAX_PENDIENTES or self._chars_pend >= MAX_CHARS_PENDIENTES:
+                self._volcar_pendientes()
+
+    def _volcar_pendientes(self):
+        """Escribe los fragmentos acumulados. Se llama con el bloqueo tomado."""
+        if not self._pendientes:
+            return
+        ahora = datetime.now().isoformat(timespec='seconds')
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO fragmentos "
+                "(host, puerto, bd, usuario, esquema, tabla, huella, fragmento, actualizado) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(*self._clave, tabla, huella, fragmento, ahora)
+                 for tabla, huella, fragmento in self._pendientes])
+        self._pendientes = []
+        self._chars_pend = 0
+
+    def guardar(self):
+        """Escribe los fragmentos nuevos y borra los de tablas que ya no existen."""
+        with self._bloqueo:
+            self._volcar_pendientes()
+            borradas = [(*self._clave, t) for t in self._guardadas if t not in self._huellas]
+            with self._conn:
+                self._conn.executemany(
+                    "DELETE FROM fragmentos "
+                    "WHERE host = ? AND puerto = ? AND bd = ? AND usuario = ? AND esquema = ? AND tabla = ?",
+                    borradas)
+
+    def cerrar(self):
+        self._conn.close()
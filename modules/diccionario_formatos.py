@@ -0,0 +1,237 @@
+"""
+Renderizadores del diccionario de datos además del RTF: HTML, Markdown, XLSX y DOCX.
+
+Todos reciben una fuente con la interfaz de ModeloDiccionario (seccion,
+nombres_tablas, campos, esquema, bd) y la ruta de salida. XLSX y DOCX
+dependen de openpyxl y python-docx; si faltan, sólo falla ese formato.
+"""
+import html
+import re
+from xml.sax.saxutils import escape
+
+from diccionario_modelo import SECCIONES
+
+ATRIBUTOS_ENCABEZADOS = ["N", "Campo", "Tipo de Dato", "Nulos", "PK", "FK", "Descripcion",
+                         "Valores permitidos"]
+BUFFER_SALIDA = 1 << 20
+# XML (xlsx/docx) no admite caracteres de control salvo tab y saltos de línea.
+_CONTROL_XML = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+
+def filas_atributos(campos):
+    for j, campo in enumerate(campos, 1):
+        yield [str(j), campo.get('nombre_columna') or '', campo.get('tipo') or '',
+               campo.get('permite_nulos') or '', campo.get('pk') or '', campo.get('fk') or '',
+               campo.get('descripcion_columna') or '', campo.get('valores_permitidos') or '']
+
+
+def _secciones_antes_de_atributos():
+    # El documento intercala "Atributos" después de "Tablas", igual que el RTF.
+    corte = [clave for clave, *_ in SECCIONES].index('tablas') + 1
+    return SECCIONES[:corte], SECCIONES[corte:]
+
+
+def _texto_xml(texto):
+    return _CONTROL_XML.sub('', texto)
+
+
+# ── HTML ──────────────────────────────────────────────────────────────────────
+_ESTILO_HTML = """
+body { font-family: Arial, sans-serif; font-size: 13px; margin: 24px; color: #000; }
+h1 { text-align: center; } h2 { color: #191970; margin-top: 32px; } h3 { margin: 20px 0 6px; }
+table { border-collapse: collapse; margin-bottom: 12px; }
+th { background: #191970; color: #fff; } th, td { border: 1px solid #000; padding: 3px 6px; }
+td { vertical-align: top; white-space: pre-wrap; }
+"""
+
+
+def _tabla_html(encabezados, filas):
+    partes = ["<table><tr>", ''.join(f"<th>{html.escape(e)}</th>" for e in encabezados), "</tr>\n"]
+    for fila in filas:
+        partes.append("<tr>" + ''.join(f"<td>{html.escape(c)}</td>" for c in fila) + "</tr>\n")
+    partes.append("</table>\n")
+    return ''.join(partes)
+
+
+def _seccion_html(fuente, clave, titulo, columna):
+    objetos = fuente.seccion(clave)
+    cuerpo  = (_tabla_html(["N", columna, "Descripcion"],
+                           ([str(i), n, d or ''] for i, (n, d) in enumerate(objetos.items(), 1)))
+               if objetos else "<p><i>No aplica.</i></p>\n")
+    return f'<h2 id="{clave}">Descripcion de {html.escape(titulo)}</h2>\n{cuerpo}'
+
+
+def renderizar_html(fuente, ruta):
+    antes, despues = _secciones_antes_de_atributos()
+    titulo = f"Diccionario de datos - {fuente.bd}.{fuente.esquema}"
+    with open(ruta, 'w', encoding='utf-8', buffering=BUFFER_SALIDA) as f:
+        f.write(f"<!DOCTYPE html>\n<html lang=\"es\"><head><meta charset=\"utf-8\">"
+                f"<title>{html.escape(titulo)}</title><style>{_ESTILO_HTML}</style></head><body>\n")
+        f.write(f"<h1>DICCIONARIO DE DATOS</h1>\n<h2>Tabla de contenido</h2>\n<ol>\n")
+        for clave, titulo_seccion, _ in antes:
+            f.write(f'<li><a href="#{clave}">{html.escape(titulo_seccion)}</a></li>\n')
+        f.write('<li><a href="#atributos">Atributos</a></li>\n')
+        for clave, titulo_seccion, _ in despues:
+            f.write(f'<li><a href="#{clave}">{html.escape(titulo_seccion)}</a></li>\n')
+        f.write("</ol>\n")
+        for seccion in antes:
+            f.write(_seccion_html(fuente, *seccion))
+        f.write('<h2 id="atributos">Descripcion de Atributos</h2>\n')
+        for tabla in fuente.nombres_tablas():
+            f.write(f"<h3>Tabla: {html.escape(tabla)}</h3>\n")
+            campos = fuente.campos(tabla)
+            f.write(_tabla_html(ATRIBUTOS_ENCABEZADOS, filas_atributos(campos))
+                    if campos else "<p><i>No se encontraron columnas</i></p>\n")
+        for seccion in despues:
+            f.write(_seccion_html(fuente, *seccion))
+        f.write("</body></html>\n")
+
+
+# ── Markdown ──────────────────────────────────────────────────────────────────
+def _celda_md(texto):
+    return texto.replace('\\', '\\\\').replace('|', '\\|').replace('\r', '').replace('\n', '<br>')
+
+
+def _tabla_md(encabezados, filas):
+    partes = ["| " + " | ".join(encabezados) + " |\n", "|" + "---|" * len(encabezados) + "\n"]
+    for fila in filas:
+        partes.append("| " + " | ".join(_celda_md(c) for c in fila) + " |\n")
+    partes.append("\n")
+    return ''.join(partes)
+
+
+def _seccion_md(fuente, clave, titulo, columna):
+    objetos = fuente.seccion(clave)
+    cuerpo  = (_tabla_md(["N", columna, "Descripcion"],
+                         ([str(i), n, d or ''] for i, (n, d) in enumerate(objetos.items(), 1)))
+               if objetos else "_No aplica._\n\n")
+    return f"## Descripcion de {titulo}\n\n{cuerpo}"
+
+
+def renderizar_markdown(fuente, ruta):
+    antes, despues = _secciones_antes_de_atributos()
+    with open(ruta, 'w', encoding='utf-8', buffering=BUFFER_SALIDA) as f:
+        f.write(f"# Diccionario de datos: {fuente.bd}.{fuente.esquema}\n\n")
+        for seccion in antes:
+            f.write(_seccion_md(fuente, *seccion))
+        f.write("## Descripcion de Atributos\n\n")
+        for tabla in fuente.nombres_tablas():
+            f.write(f"### Tabla: {tabla}\n\n")
+            campos = fuente.campos(tabla)
+            f.write(_tabla_md(ATRIBUTOS_ENCABEZADOS, filas_atributos(campos))
+                    if campos else "_No se encontraron columnas_\n\n")
+        for seccion in despues:
+            f.write(_seccion_md(fuente, *seccion))
+
+
+# ── XLSX ──────────────────────────────────────────────────────────────────────
+def renderizar_xlsx(fuente, ruta):
+    """Una hoja por sección y una hoja 'Atributos' con todas las columnas del
+    esquema (tabla en la primera columna, para filtrar)."""
+    try:
+        from openpyxl import Workbook
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Font, PatternFill
+    except ImportError:
+        raise RuntimeError("El formato xlsx requiere openpyxl (pip install openpyxl)")
+    libro  = Workbook(write_only=True)
+    fuente_encabezado = Font(bold=True, color='FFFFFF')
+    relleno = PatternFill('solid', fgColor='191970')
+
+    def encabezado(hoja, textos):
+        celdas = []
+        for valor in textos:
+            celda = WriteOnlyCell(hoja, value=valor)
+            celda.font, celda.fill = fuente_encabezado, relleno
+            celdas.append(celda)
+        hoja.append(celdas)
+
+    def texto(hoja, valor):
+        valor = _texto_xml(valor)
+        if not valor.startswith('='):
+            return valor
+        celda = WriteOnlyCell(hoja, value=valor)
+        celda.data_type = 's'        # un comentario que empieza con '=' no es una fórmula
+        return celda
+
+    antes, despues = _secciones_antes_de_atributos()
+
+    def hoja_seccion(clave, titulo, columna):
+        # Los nombres de hoja admiten 31 caracteres y no admiten '/'.
+        hoja = libro.create_sheet(titulo.replace('/', '-')[:31])
+        encabezado(hoja, ["N", columna, "Descripcion"])
+        for i, (nombre, desc) in enumerate(fuente.seccion(clave).items(), 1):
+            hoja.append([i, texto(hoja, nombre), texto(hoja, desc or '')])
+
+    for seccion in antes:
+        hoja_seccion(*seccion)
+    hoja = libro.create_sheet('Atributos')
+    encabezado(hoja, ["Tabla"] + ATRIBUTOS_ENCABEZADOS)
+    for tabla in fuente.nombres_tablas():
+        for fila in filas_atributos(fuente.campos(tabla)):
+            hoja.append([tabla] + [texto(hoja, c) for c in fila])
+    for seccion in despues:
+        hoja_seccion(*seccion)
+    libro.save(ruta)
+
+
+# ── DOCX ──────────────────────────────────────────────────────────────────────
+def renderizar_docx(fuente, ruta):
+    try:
+        from docx import Document
+        from docx.oxml import parse_xml
+        from docx.oxml.ns import nsdecls
+    except ImportError:
+        raise RuntimeError("El formato docx requiere python-docx (pip install python-docx)")
+    documento = Document()
+    documento.add_heading('DICCIONARIO DE DATOS', 0)
+    documento.add_paragraph(f"{fuente.bd}.{fuente.esquema}")
+
+    # La tabla se arma como XML y se inserta de una vez: con la API de celdas
+    # (cell.text, rows[i].cells) python-docx recorre el árbol por cada celda y
+    # un esquema de miles de tablas tarda decenas de segundos.
+    cuerpo   = documento.element.body
+    ancho    = documento.sections[0].page_width - documento.sections[0].left_margin \
+        - documento.sections[0].right_margin
+    documento.styles['Table Grid']          # falla aquí si la plantilla no trae el estilo
+
+    def celda_docx(texto, negrita=False):
+        texto = escape(_texto_xml(texto)).replace('\r', '').replace(
+            '\n', '</w:t><w:br/><w:t xml:space="preserve">')
+        formato = '<w:rPr><w:b/></w:rPr>' if negrita else ''
+        return f'<w:tc><w:p><w:r>{formato}<w:t xml:space="preserve">{texto}</w:t></w:r></w:p></w:tc>'
+
+    def tabla_docx(encabezados, filas):
+        columna = ancho // len(encabezados)
+        partes  = [f'<w:tbl {nsdecls("w")}><w:tblPr><w:tblStyle w:val="TableGrid"/>'
+                   f'<w:tblW w:type="auto" w:w="0"/></w:tblPr><w:tblGrid>',
+                   f'<w:gridCol w:w="{columna // 635}"/>' * len(encabezados), '</w:tblGrid>',
+                   '<w:tr>', ''.join(celda_docx(e, True) for e in encabezados), '</w:tr>']
+        for fila in filas:
+            partes.append('<w:tr>' + ''.join(celda_docx(c) for c in fila) + '</w:tr>')
+        partes.append('</w:tbl>')
+        cuerpo.sectPr.addprevious(parse_xml(''.join(partes)))
+
+    def seccion_docx(clave, titulo, columna):
+        documento.add_heading(f"Descripcion de {titulo}", 1)
+        objetos = fuente.seccion(clave)
+        if objetos:
+            tabla_docx(["N", columna, "Descripcion"],
+                       ([str(i), n, d or ''] for i, (n, d) in enumerate(objetos.items(), 1)))
+        else:
+            documento.add_paragraph("No aplica.").runs[0].italic = True
+
+    antes, despues = _secciones_antes_de_atributos()
+    for seccion in antes:
+        seccion_docx(*seccion)
+    documento.add_heading("Descripcion de Atributos", 1)
+    for tabla in fuente.nombres_tablas():
+        documento.add_heading(f"Tabla: {tabla}", 2)
+        campos = fuente.campos(tabla)
+        if campos:
+            tabla_docx(ATRIBUTOS_ENCABEZADOS, filas_atributos(campos))
+        else:
+            documento.add_paragraph("No se encontraron columnas").runs[0].italic = True
+    for seccion in despues:
+        seccion_docx(*seccion)
+    documento.save(ruta)
@@ -0,0 +1,222 @@
+"""
+Modo lote de generar_diccionario: varios esquemas de varias bases de datos en
+una sola corrida.
+
+Los objetivos salen de un JSON (lista de {host, puerto, bd, usuario, password,
+esquema, ruta_salida_rtf}, los mismos parámetros del lanzador, y opcionalmente
+formatos y dividir) o del historial del lanzador (data/execution_history.json,
+ejecuciones de DICCIONARIO DE DATOS).
+Se procesan con un pool acotado de trabajadores. Las conexiones se reutilizan
+por base de datos: cada objetivo toma un juego libre (principal + secciones) de
+su base, o abre uno si no hay, y al terminar lo devuelve para el siguiente
+esquema de esa misma base.
+"""
+import json
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+
+from generar_diccionario import (conectar_catalogo, conexiones_secciones, documentar_esquema,
+                                 rutas_salida)
+
+
+MODULO_HISTORIAL  = 'DICCIONARIO DE DATOS'
+CONEXIONES_LOTE   = 2          # conexiones de secciones por objetivo (el paralelismo está entre objetivos)
+TRABAJADORES_LOTE = 4
+_CAMPOS_OBJETIVO  = ('host', 'puerto', 'bd', 'usuario', 'password', 'esquema')
+
+
+def ruta_historial():
+    if getattr(sys, 'frozen', False):
+        raiz = Path(sys.executable).parent
+    else:
+        raiz = Path(__file__).resolve().parent.parent
+    return raiz / "data" / "execution_history.json"
+
+
+# ── Objetivos ─────────────────────────────────────────────────────────────────
+def _normalizar(objetivo):
+    faltan = [c for c in _CAMPOS_OBJETIVO if objetivo.get(c) in (None, '') and c != 'password']
+    salida = objetivo.get('ruta_salida_rtf') or objetivo.get('salida')
+    if faltan or not salida:
+        raise ValueError(f"objetivo incompleto (falta {', '.join(faltan or ['ruta_salida_rtf'])}): "
+                         f"{objetivo.get('bd')}.{objetivo.get('esquema')}")
+    normalizado = {c: str(objetivo.get(c) or '') for c in _CAMPOS_OBJETIVO}
+    normalizado['salida'] = salida
+    if objetivo.get('formatos'):
+        normalizado['formatos'] = tuple(objetivo['formatos'])
+    if objetivo.get('dividir'):
+        normalizado['dividir'] = objetivo['dividir']
+    return normalizado
+
+
+def cargar_objetivos(ruta):
+    with open(ruta, 'r', encoding='utf-8') as f:
+        datos = json.load(f)
+    return [_normalizar(o) for o in (datos.get('objetivos', []) if isinstance(datos, dict) else datos)]
+
+
+def objetivos_desde_historial(ruta=None):
+    """Un objetivo por (host, puerto, bd, esquema, salida) distinto del historial,
+    con los parámetros de su ejecución más reciente."""
+    with open(ruta or ruta_historial(), 'r', encoding='utf-8') as f:
+        historial = json.load(f)
+    unicos = {}
+    for entrada in sorted(historial, key=lambda e: e.get('timestamp', '')):
+        if entrada.get('module_name') != MODULO_HISTORIAL:
+            continue
+        try:
+            objetivo = _normalizar(entrada.get('params', {}))
+        except ValueError:
+            continue
+        clave = (objetivo['host'], objetivo['puerto'], objetivo['bd'], objetivo['esquema'],
+                 objetivo['salida'])
+        unicos[clave] = objetivo
+    return list(unicos.values())
+
+
+def _desambiguar_salidas(objetivos):
+    """Dos objetivos con la misma ruta se pisarían: se les agrega bd_esquema."""
+    por_ruta = {}
+    for objetivo in objetivos:
+        por_ruta.setdefault(str(Path(objetivo['salida']).resolve()), []).append(objetivo)
+    for repetidos in por_ruta.values():
+        if len(repetidos) < 2:
+            continue
+        for objetivo in repetidos:
+            ruta = Path(objetivo['salida'])
+            objetivo['salida'] = str(ruta.with_name(f"{ruta.stem}_{objetivo['bd']}_{objetivo['esquema']}{ruta.suffix}"))
+            print(f"Aviso: salida repetida, {objetivo['bd']}.{objetivo['esquema']} -> {objetivo['salida']}")
+
+
+# ── Conexiones por base de datos ──────────────────────────────────────────────
+class ConexionesPorBD:
+    """Juegos (principal, [secciones]) libres por base de datos."""
+
+    def __init__(self, conexiones_secciones=CONEXIONES_LOTE):
+        self._libres    = {}
+        self._todos     = []
+        self._bloqueo   = threading.Lock()
+        self._secciones = conexiones_secciones
+        self.abiertos   = 0
+        self.reutilizados = 0
+
+    @staticmethod
+    def _clave(objetivo):
+        return tuple(objetivo[c] for c in _CAMPOS_OBJETIVO[:5])
+
+    def tomar(self, objetivo):
+        with self._bloqueo:
+            libres = self._libres.setdefault(self._clave(objetivo), queue.SimpleQueue())
+        try:
+            juego = libres.get_nowait()
+            with self._bloqueo:
+                self.reutilizados += 1
+            return juego
+        except queue.Empty:
+            pass
+        parametros = [objetivo[c] for c in _CAMPOS_OBJETIVO[:5]]
+        conn       = conectar_catalogo(*parametros)
+        juego      = (conn, conexiones_secciones(*parametros, cantidad=self._secciones))
+        with self._bloqueo:
+            self._todos.append(juego)
+            self.abiertos += 1
+        return juego
+
+    def devolver(self, objetivo, juego):
+        self._libres[self._clave(objetivo)].put(juego)
+
+    def cerrar(self):
+        for conn, secciones in self._todos:
+            for conexion in [conn] + secciones:
+                try:
+                    conexion.close()
+                except Exception:
+                    pass
+
+
+# ── Ejecución ─────────────────────────────────────────────────────────────────
+def _documentar(conexiones, objetivo, formatos, incremental):
+    inicio    = time.perf_counter()
+    resultado = {'host': objetivo['host'], 'puerto': objetivo['puerto'], 'bd': objetivo['bd'],
+                 'esquema': objetivo['esquema'], 'salida': objetivo['salida'], 'estado': 'OK',
+                 'error': None, 'conteo': {}, 'fallidas': {}, 'fragmentos': None}
+    try:
+        juego   = conexiones.tomar(objetivo)
+        salidas = rutas_salida(objetivo['salida'], objetivo.get('formatos', formatos))
+        resumen = documentar_esquema(juego[0], juego[1], objetivo['host'], objetivo['puerto'],
+                                     objetivo['bd'], objetivo['usuario'], objetivo['esquema'], salidas,
+                                     incremental=incremental, verboso=False,
+                                     dividir=objetivo.get('dividir'))
+        resultado['conteo']     = resumen['conteo']
+        resultado['fragmentos'] = resumen['fragmentos']
+        resultado['fallidas']   = resumen['fallidas']
+        if resumen['errores']:
+            resultado['estado'] = 'ERROR'
+            resultado['error']  = '; '.join(f"{f}: {e}" for f, e in resumen['errores'].items())
+        conexiones.devolver(objetivo, juego)
+    except Exception as e:
+        # Un juego que falló a mitad de camino no se devuelve (se cierra al final).
+        resultado['estado'] = 'ERROR'
+        resultado['error']  = str(e).strip()
+    resultado['segundos'] = time.perf_counter() - inicio
+    return resultado
+
+
+def ejecutar_lote(objetivos, trabajadores=TRABAJADORES_LOTE, formatos=('rtf',), incremental=True):
+    _desambiguar_salidas(objetivos)
+    trabajadores = max(1, min(trabajadores, len(objetivos)))
+    print(f"Lote de diccionarios: {len(objetivos)} objetivos, {trabajadores} trabajadores")
+    conexiones = ConexionesPorBD()
+    resultados = [None] * len(objetivos)
+    inicio     = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=trabajadores, thread_name_prefix='lote') as pool:
+            futuros = {pool.submit(_documentar, conexiones, o, formatos, incremental): i
+                       for i, o in enumerate(objetivos)}
+            for futuro in as_completed(futuros):
+                r = resultados[futuros[futuro]] = futuro.result()
+                detalle = r['error'] if r['error'] else r['salida']
+                print(f"[{r['estado']}] {r['bd']}.{r['esquema']}@{r['host']} "
+                      f"({r['segundos']:.1f}s) {detalle}")
+    finally:
+        conexiones.cerrar()
+    return {'fecha': datetime.now().isoformat(timespec='seconds'),
+            'duracion': time.perf_counter() - inicio,
+            'trabajadores': trabajadores,
+            'conexiones_abiertas': conexiones.abiertos,
+            'conexiones_reutilizadas': conexiones.reutilizados,
+            'objetivos': resultados}
+
+
+def imprimir_resumen(resumen):
+    print(f"\nResumen del lote ({resumen['duracion']:.1f}s, {resumen['trabajadores']} trabajadores, "
+          f"{resumen['conexiones_abiertas']} juegos de conexiones abiertos, "
+          f"{resumen['conexiones_reutilizadas']} reutilizados):")
+    print(f"  {'objetivo':<40} {'estado':<6} {'segundos':>8} {'tablas':>7} {'atributos':>9} {'otros':>6} {'cache':>11}")
+    for r in resumen['objetivos']:
+        conteo = r['conteo']
+        otros  = sum(n for clave, n in conteo.items() if clave not in ('tablas', 'atributos'))
+        cache  = f"{r['fragmentos'][0]}/{sum(r['fragmentos'])}" if r['fragmentos'] else '-'
+        print(f"  {r['bd'] + '.' + r['esquema'] + '@' + r['host']:<40} {r['estado']:<6} {r['segundos']:>8.1f} "
+              f"{conteo.get('tablas', 0):>7} {conteo.get('atributos', 0):>9} {otros:>6} {cache:>11}")
+    fallidos = [r for r in resumen['objetivos'] if r['estado'] != 'OK']
+    if fallidos:
+        print(f"\n{len(fallidos)} objetivo(s) con error:")
+        for r in fallidos:
+            print(f"  {r['bd']}.{r['esquema']}@{r['host']}: {r['error']}")
+    parciales = [r for r in resumen['objetivos'] if r['fallidas']]
+    if parciales:
+        print(f"\n{len(parciales)} objetivo(s) con tablas sin atributos por error:")
+        for r in parciales:
+            print(f"  {r['bd']}.{r['esquema']}@{r['host']}: {', '.join(r['fallidas'])}")
+
+
+def guardar_resumen(resumen, ruta):
+    Path(ruta).parent.mkdir(parents=True, exist_ok=True)
+    with open(ruta, 'w', encoding='utf-8') as f:
+        json.dump(resumen, f, indent=2, ensure_ascii=False)
@@ -0,0 +1,136 @@
+"""
+Modelo intermedio del diccionario de datos: lo que generar_diccionario extrae del
+catálogo, independiente del formato de salida.
+
+Se arma una vez (una pasada por el catálogo) y lo consumen todos los
+renderizadores (RTF, HTML, Markdown, XLSX, DOCX). Guardado como JSON permite
+volver a renderizar sin conexión a la base de datos.
+"""
+import json
+from datetime import datetime
+
+
+# Secciones de objetos {nombre: comentario}, en el orden del documento:
+# (clave, título de la sección, encabezado de la columna de nombres).
+SECCIONES = [
+    ('esquemas',           'Esquemas',                    'Esquema'),
+    ('tablespaces',        'Tablespaces',                 'Tablespace'),
+    ('extensiones',        'Extensiones',                 'Extension'),
+    ('tablas',             'Tablas',                      'Nombre de la Tabla'),
+    ('procedimientos',     'Procedimientos',              'Procedimiento'),
+    ('funciones',          'Funciones',                   'Funcion'),
+    ('vistas',             'Vistas',                      'Vista'),
+    ('triggers',           'Triggers',                    'Trigger'),
+    ('funciones_triggers', 'Funciones Triggers',          'Funcion Trigger'),
+    ('types',              'Types',                       'Type'),
+    ('dblinks',            'Dblinks / Foreign Servers',   'Dblink / Foreign Server'),
+    ('tablas_foraneas',    'Tablas Foraneas',             'Tabla Foránea'),
+    ('sinonimos',          'Sinonimos',                   'Sinónimo'),
+    ('indices',            'Indices',                     'Índice'),
+    ('constraints',        'Restricciones (Constraints)', 'Restricción'),
+    ('jobs',               'Jobs',                        'Job'),
+]
+# Claves de cada atributo (columna) de una tabla.
+CAMPOS_COLUMNAS = ('nombre_columna', 'tipo', 'permite_nulos', 'pk', 'fk',
+                   'descripcion_columna', 'valores_permitidos')
+
+
+class ModeloDiccionario:
+    """Secciones, nombres de tablas y atributos por tabla de un esquema.
+
+    Expone la misma interfaz de fuente que la extracción en vivo
+    (seccion, nombres_tablas, campos), así los renderizadores no distinguen
+    entre una y otra."""
+
+    VERSION = 1
+
+    def __init__(self, host, puerto, bd, esquema, generado=None):
+        self.host      = host
+        self.puerto    = puerto
+        self.bd        = bd
+        self.esquema   = esquema
+        self.generado  = generado or datetime.now().isoformat(timespec='seconds')
+        self.secciones = {clave: {} for clave, *_ in SECCIONES}
+        self.tablas    = []          # nombres, en el orden del documento
+        self.atributos = {}          # tabla -> [campo, ...]
+        self.fallidas  = {}          # tabla -> error al leer sus campos (no se guarda)
+
+    # ── Interfaz de fuente ────────────────────────────────────────────────────
+    def seccion(self, clave):
+        return self.secciones.get(clave, {})
+
+    def nombres_tablas(self):
+        return self.tablas
+
+    def campos(self, tabla):
+        return self.atributos.get(tabla, [])
+
+    def contar(self):
+        """Cantidad de objetos por sección, más tablas y atributos."""
+        conteo = {clave: len(self.secciones[clave]) for clave, *_ in SECCIONES}
+        conteo['atributos'] = sum(len(campos) for campos in self.atributos.values())
+        return conteo
+
+    # ── Construcción ──────────────────────────────────────────────────────────
+    @classmethod
+    def desde_fuente(cls, fuente, host, puerto, bd, esquema, al_progresar=None):
+        """Consume una fuente en vivo (secciones y atributos en streaming). Una
+        tabla cuyos campos fallan queda sin atributos y anotada en fallidas."""
+        modelo = cls(host, puerto, bd, esquema)
+        for clave, *_ in SECCIONES:
+            modelo.secciones[clave] = dict(fuente.seccion(clave))
+        modelo.tablas = list(fuente.nombres_tablas())
+        filas = 0
+        if al_progresar is not None:
+            al_progresar(0, len(modelo.tablas), 0)
+        for hechas, tabla in enumerate(modelo.tablas, 1):
+            try:
+                modelo.atributos[tabla] = list(fuente.campos(tabla))
+            except Exception as e:
+                print(f"Error al obtener campos de {tabla}: {e}", flush=True)
+                modelo.fallidas[tabla]  = str(e).strip()
+                modelo.atributos[tabla] = []
+            filas += len(modelo.atributos[tabla])
+            if al_progresar is not None:
+                al_progresar(hechas, len(modelo.tablas), filas)
+        return modelo
+
+    # ── JSON ──────────────────────────────────────────────────────────────────
+    def a_dict(self):
+        # Atributos como listas (sin repetir las claves en cada fila): el archivo
+        # de un esquema de miles de tablas queda varias veces más chico.
+        return {
+            'version':   self.VERSION,
+            'host':      self.host,
+            'puerto':    self.puerto,
+            'bd':        self.bd,
+            'esquema':   self.esquema,
+            'generado':  self.generado,
+            'secciones': self.secciones,
+            'tablas':    self.tablas,
+            'columnas':  list(CAMPOS_COLUMNAS),
+            'atributos': {tabla: [[campo.get(k, '') for k in CAMPOS_COLUMNAS] for campo in campos]
+                          for tabla, campos in self.atributos.items()},
+        }
+
+    @classmethod
+    def desde_dict(cls, datos):
+        if datos.get('version') != cls.VERSION:
+            raise ValueError(f"Version de modelo no soportada: {datos.get('version')}")
+        modelo = cls(datos['host'], datos['puerto'], datos['bd'], datos['esquema'], datos['generado'])
+        for clave, *_ in SECCIONES:
+            modelo.secciones[clave] = datos['secciones'].get(clave, {})
+        modelo.tablas   = datos['tablas']
+        columnas        = datos['columnas']
+        modelo.atributos = {tabla: [dict(zip(columnas, fila)) for fila in filas]
+                            for tabla, filas in datos['atributos'].items()}
+        return modelo
+
+    def guardar(self, ruta):
+        with open(ruta, 'w', encoding='utf-8') as f:
+            json.dump(self.a_dict(), f, ensure_ascii=False)
+
+    @classmethod
+    def cargar(cls, ruta):
+        with open(ruta, 'r', encoding='utf-8') as f:
+            return cls.desde_dict(json.load(f))
@@ -0,0 +1,250 @@
+"""
+Modo dividido de generar_diccionario: en vez de un RTF único (cientos de MB en
+esquemas de miles de tablas, que algunos editores no abren), un documento
+índice en la ruta pedida que enlaza las partes, guardadas en <salida>_partes/:
+
+  --dividir seccion     una parte por sección con objetos; los atributos, de a
+                        TABLAS_POR_PARTE tablas
+  --dividir tablas:N    una parte con las secciones y los atributos de a N tablas
+  --dividir prefijo     una parte con las secciones y los atributos por prefijo de
+                        tabla de reglas_nomenclatura.json (MAE_, TAB_, ...) más 'otros'
+
+Las partes se escriben en paralelo, cada una con su conexión. partes.json guarda
+la huella de cada parte (contenido de sus secciones y huellas de sus tablas): si
+no cambió y el archivo sigue ahí, la parte no se reescribe; las que sí se
+reescriben reutilizan los fragmentos de atributos de la caché. Sin caché no hay
+huellas de tablas y las partes de atributos se reescriben siempre.
+"""
+import hashlib
+import json
+import queue
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+from diccionario_cache import VERSION_FRAGMENTO
+from diccionario_modelo import SECCIONES
+from generar_diccionario import (BUFFER_SALIDA, DOCUMENTO_RTF, LectorCampos, escape_rtf,
+                                 escribir_atributos_rtf, escribir_inicio_rtf, escribir_seccion_rtf)
+
+
+# Subir al cambiar cómo se escribe una parte o el índice: fuerza reescribirlas.
+VERSION_PARTES   = 1
+MANIFIESTO       = "partes.json"
+# Tablas por parte de atributos en el modo seccion (una sola sería el RTF enorme
+# que el modo dividido quiere evitar).
+TABLAS_POR_PARTE = 500
+
+
+def ruta_reglas():
+    if getattr(sys, 'frozen', False):
+        return Path(sys.executable).parent / 'resources' / 'reglas_nomenclatura.json'
+    return Path(__file__).resolve().parent.parent / 'resources' / 'reglas_nomenclatura.json'
+
+
+def prefijos_tablas(ruta=None):
+    with open(ruta or ruta_reglas(), 'r', encoding='utf-8') as f:
+        reglas = json.load(f)
+    return [p.upper() for p in reglas.get('tabla', {}).get('prefijos_validos', [])]
+
+
+def leer_modo(texto):
+    """'seccion', 'tablas:N' o 'prefijo' -> (modo, valor)."""
+    modo, _, valor = (texto or '').strip().lower().partition(':')
+    if modo == 'seccion' and not valor:
+        return modo, None
+    if modo == 'tablas' and valor.isdigit() and int(valor) > 0:
+        return modo, int(valor)
+    if modo == 'prefijo' and not valor:
+        return modo, prefijos_tablas()
+    raise ValueError(f"modo de division no valido: {texto} (seccion, tablas:N o prefijo)")
+
+
+# ── Plan ──────────────────────────────────────────────────────────────────────
+def _parte(nombre, titulo, secciones=(), tablas=()):
+    return {'nombre': nombre, 'titulo': titulo, 'secciones': list(secciones), 'tablas': list(tablas)}
+
+
+def _partes_atributos(table_names, n):
+    partes = []
+    for i in range(0, len(table_names), n):
+        grupo = table_names[i:i + n]
+        partes.append(_parte(f"atributos_{i // n + 1:03d}",
+                             f"Atributos: {grupo[0]} - {grupo[-1]}", tablas=grupo))
+    return partes
+
+
+def planificar_partes(modo, valor, fuente, table_names):
+    """Partes en el orden del índice. Los nombres no dependen del contenido (salvo
+    la numeración de tablas:N), así una parte se reconoce entre corridas."""
+    claves = [clave for clave, _ in DOCUMENTO_RTF if clave != 'atributos']
+    if modo == 'seccion':
+        partes = []
+        for clave, titulo, _ in SECCIONES:
+            if fuente.seccion(clave):
+                partes.append(_parte(clave, titulo, secciones=[clave]))
+            if clave == 'tablas':
+                partes.extend(_partes_atributos(table_names, TABLAS_POR_PARTE))
+        return partes
+    partes = [_parte('secciones', 'Secciones', secciones=claves)]
+    if modo == 'tablas':
+        return partes + _partes_atributos(table_names, valor)
+    por_prefijo = {p: [] for p in valor}
+    otras       = []
+    for tabla in table_names:
+        prefijo = tabla.upper().split('_', 1)[0] if '_' in tabla else None
+        (por_prefijo[prefijo] if prefijo in por_prefijo else otras).append(tabla)
+    for prefijo, tablas in por_prefijo.items():
+        if tablas:
+            partes.append(_parte(f"atributos_{prefijo}", f"Atributos: {prefijo}_", tablas=tablas))
+    if otras:
+        partes.append(_parte("atributos_otros", "Atributos: otras tablas", tablas=otras))
+    return partes
+
+
+def huella_parte(parte, fuente):
+    """md5 de lo que muestra la parte, o None si no se puede saber (sin huellas)."""
+    huellas = fuente.huellas
+    if parte['tablas'] and (huellas is None or any(t not in huellas for t in parte['tablas'])):
+        return None
+    contenido = [VERSION_PARTES, VERSION_FRAGMENTO, fuente.bd, fuente.esquema, parte['titulo'],
+                 [[clave, fuente.seccion(clave)] for clave in parte['secciones']],
+                 [[t, huellas[t]] for t in parte['tablas']]]
+    return hashlib.md5(json.dumps(contenido, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+# ── Escritura ─────────────────────────────────────────────────────────────────
+class _ProgresoPartes:
+    """Suma el avance de las partes que se escriben en paralelo."""
+
+    def __init__(self, total, al_progresar):
+        self.total          = total
+        self._al_progresar  = al_progresar
+        self._por_parte     = {}
+        self._bloqueo       = threading.Lock()
+
+    def de_parte(self, nombre):
+        if self._al_progresar is None:
+            return None
+
+        def avanzar(hechas, _total, filas):
+            with self._bloqueo:
+                self._por_parte[nombre] = (hechas, filas)
+                self._al_progresar(sum(h for h, _ in self._por_parte.values()), self.total,
+                                   sum(f for _, f in self._por_parte.values()))
+        return avanzar
+
+
+def escribir_parte(parte, ruta, fuente, libres, fragmentos=None, al_progresar=None):
+    """Escribe una parte; las de atributos toman una conexión libre para consultar
+    las tablas que la caché no tiene. Devuelve ({tabla: error} de las que
+    fallaron, filas de atributos consultadas)."""
+    fallidas = {}
+    filas    = 0
+    with open(ruta, 'w', encoding='utf-8', buffering=BUFFER_SALIDA) as writer:
+        escribir_inicio_rtf(writer)
+        writer.write(f"\\qc\\fs22 {escape_rtf(f'{fuente.bd}.{fuente.esquema}')} - "
+                     f"{escape_rtf(parte['titulo'])}\\par\n")
+        writer.write("\\par\\page\n")
+        for clave in parte['secciones']:
+            escribir_seccion_rtf(writer, fuente, clave)
+            writer.write("\\par\\page\n")
+        if parte['tablas']:
+            vigentes  = fuente.tablas_vigentes() or set()
+            consultar = [t for t in parte['tablas'] if t not in vigentes]
+            conn      = libres.get()
+            lector    = LectorCampos(conn, fuente.esquema, tablas=consultar, esperadas=consultar,
+                                     streaming=bool(consultar))
+            try:
+                fallidas = escribir_atributos_rtf(writer, parte['tablas'], lector.campos,
+                                                  fragmentos, al_progresar)
+            finally:
+                filas = lector.filas
+                lector.cerrar()
+                libres.put(conn)
+        writer.write("}\n")
+    return fallidas, filas
+
+
+def escribir_indice(ruta, directorio, fuente, partes):
+    with open(ruta, 'w', encoding='utf-8') as writer:
+        escribir_inicio_rtf(writer)
+        writer.write(f"\\qc\\fs22 {escape_rtf(f'{fuente.bd}.{fuente.esquema}')}\\par\n")
+        writer.write(f"\\fs18 Generado: {datetime.now().isoformat(sep=' ', timespec='seconds')}\\par\n")
+        writer.write("\\par\\par\n")
+        writer.write("\\ql\\b\\fs28 PARTES DEL DICCIONARIO\\b0\\fs20\\par\n")
+        writer.write("\\par\n")
+        for i, parte in enumerate(partes, 1):
+            enlace = f"{directorio.name}/{parte['nombre']}.rtf"
+            if parte['tablas']:
+                detalle = f"{len(parte['tablas'])} tablas"
+            else:
+                detalle = ', '.join(f"{len(fuente.seccion(c))} {c.replace('_', ' ')}"
+                                    for c in parte['secciones'] if fuente.seccion(c)) or 'sin objetos'
+            writer.write(f"\\fs22 {i}. {{\\field{{\\*\\fldinst HYPERLINK \"{escape_rtf(enlace)}\"}}"
+                         f"{{\\fldrslt \\ul\\cf3 {escape_rtf(parte['titulo'])}\\ul0\\cf1}}}}"
+                         f"\\fs18  ({escape_rtf(detalle)})\\par\n")
+        writer.write("}\n")
+
+
+def _leer_manifiesto(directorio):
+    try:
+        with open(directorio / MANIFIESTO, 'r', encoding='utf-8') as f:
+            datos = json.load(f)
+        return datos.get('partes', {}) if datos.get('version') == VERSION_PARTES else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def documentar_dividido(conn, conexiones, fuente, ruta, modo, valor, fragmentos=None,
+                        al_progresar=None, verboso=True):
+    """Índice en ruta y partes en <ruta>_partes/. Devuelve tablas fallidas, partes
+    escritas y sin cambios, y filas de atributos consultadas. Las secciones ya
+    están lanzadas en la fuente; las conexiones se reparten entre las partes."""
+    ruta       = Path(ruta)
+    directorio = ruta.with_name(f"{ruta.stem}_partes")
+    directorio.mkdir(parents=True, exist_ok=True)
+    table_names = fuente.extractor.resultado('nombres_tablas')
+    if verboso:
+        print(f"Tablas detectadas: {len(table_names)}")
+    fuente.tablas_vigentes()
+    partes   = planificar_partes(modo, valor, fuente, table_names)
+    previas  = _leer_manifiesto(directorio)
+    huellas  = {p['nombre']: huella_parte(p, fuente) for p in partes}
+    escribir = [p for p in partes
+                if huellas[p['nombre']] is None or previas.get(p['nombre']) != huellas[p['nombre']]
+                or not (directorio / f"{p['nombre']}.rtf").exists()]
+    progreso = _ProgresoPartes(sum(len(p['tablas']) for p in escribir), al_progresar)
+    # Terminadas las secciones, la principal y las de secciones quedan libres para las partes.
+    libres   = queue.SimpleQueue()
+    for conexion in [conn] + list(conexiones):
+        libres.put(conexion)
+    resultado = {'fallidas': {}, 'escritas': len(escribir), 'sin_cambios': len(partes) - len(escribir),
+                 'filas': 0}
+    if escribir:
+        with ThreadPoolExecutor(max_workers=1 + len(conexiones), thread_name_prefix='parte') as pool:
+            futuros = {p['nombre']: pool.submit(escribir_parte, p, directorio / f"{p['nombre']}.rtf", fuente,
+                                                libres, fragmentos, progreso.de_parte(p['nombre']))
+                       for p in escribir}
+            for futuro in futuros.values():
+                fallidas, filas = futuro.result()
+                resultado['fallidas'].update(fallidas)
+                resultado['filas'] += filas
+    # Una parte con tablas fallidas no se da por vigente: se reescribe la próxima vez.
+    manifiesto = {p['nombre']: huellas[p['nombre']] for p in partes
+                  if not any(t in resultado['fallidas'] for t in p['tablas'])}
+    # Los archivos de partes que ya no están en el plan se borran, figuren o no en
+    # el manifiesto anterior (una parte con tablas fallidas no queda en él).
+    for archivo in directorio.glob("*.rtf"):
+        if archivo.stem not in huellas:
+            archivo.unlink(missing_ok=True)
+    with open(directorio / MANIFIESTO, 'w', encoding='utf-8') as f:
+        json.dump({'version': VERSION_PARTES, 'modo': modo, 'partes': manifiesto}, f, indent=2,
+                  ensure_ascii=False)
+    escribir_indice(ruta, directorio, fuente, partes)
+    if verboso:
+        print(f"Partes: {len(partes)} en {directorio} ({resultado['escritas']} escritas, "
+              f"{resultado['sin_cambios']} sin cambios)")
+    return resultado
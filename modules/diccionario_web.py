@@ -0,0 +1,217 @@
+"""
+Diccionario de datos como sitio HTML navegable, pensado para esquemas de miles
+de tablas:
+
+  <salida>_web/index.html            buscador y visor (sin dependencias)
+  <salida>_web/indice.json           índice de búsqueda: nombres y comentarios
+  <salida>_web/indice.js             el mismo índice, cargable desde file://
+  <salida>_web/fragmentos/bloque_N.js  atributos en HTML de TABLAS_POR_BLOQUE tablas
+
+El navegador sólo carga el índice al abrir; el bloque de una tabla se pide al
+verla. Los textos de búsqueda se normalizan aquí (minúsculas, sin tildes), así
+filtrar 10k tablas es recorrer una lista de cadenas.
+Los fragmentos son .js (no .json) porque los navegadores bloquean fetch() de
+archivos locales y el sitio debe abrirse con doble clic.
+"""
+import html
+import json
+import unicodedata
+from pathlib import Path
+
+from diccionario_formatos import ATRIBUTOS_ENCABEZADOS, filas_atributos
+from diccionario_modelo import SECCIONES
+
+TABLAS_POR_BLOQUE = 50
+
+
+def normalizar_busqueda(texto):
+    descompuesto = unicodedata.normalize('NFD', texto.lower())
+    return ''.join(c for c in descompuesto if not unicodedata.combining(c))
+
+
+def _fragmento_tabla(tabla, comentario, campos):
+    partes = [f"<h2>{html.escape(tabla)}</h2>"]
+    if comentario:
+        partes.append(f'<p class="comentario">{html.escape(comentario)}</p>')
+    if not campos:
+        partes.append("<p><i>No se encontraron columnas</i></p>")
+        return ''.join(partes)
+    partes.append("<table><tr>" + ''.join(f"<th>{html.escape(e)}</th>" for e in ATRIBUTOS_ENCABEZADOS)
+                  + "</tr>")
+    for fila in filas_atributos(campos):
+        partes.append("<tr>" + ''.join(f"<td>{html.escape(c)}</td>" for c in fila) + "</tr>")
+    partes.append("</table>")
+    return ''.join(partes)
+
+
+def construir_indice(fuente):
+    """Índice de búsqueda: tablas [nombre, comentario, bloque, columnas, busqueda]
+    y demás objetos [seccion, nombre, comentario, busqueda]."""
+    comentarios = fuente.seccion('tablas')
+    tablas      = []
+    for i, tabla in enumerate(fuente.nombres_tablas()):
+        comentario = comentarios.get(tabla) or ''
+        campos     = fuente.campos(tabla)
+        texto      = ' '.join(filter(None, [tabla, comentario]
+                                     + [c.get('nombre_columna') for c in campos]
+                                     + [c.get('descripcion_columna') for c in campos]))
+        tablas.append([tabla, comentario, i // TABLAS_POR_BLOQUE, len(campos), normalizar_busqueda(texto)])
+    objetos = []
+    for s, (clave, _, _) in enumerate(SECCIONES):
+        if clave == 'tablas':
+            continue
+        for nombre, comentario in fuente.seccion(clave).items():
+            objetos.append([s, nombre, comentario or '', normalizar_busqueda(f"{nombre} {comentario or ''}")])
+    return {'bd': fuente.bd, 'esquema': fuente.esquema,
+            'generado': getattr(fuente, 'generado', ''),
+            'secciones': [[clave, titulo] for clave, titulo, _ in SECCIONES],
+            'tablas': tablas, 'objetos': objetos}
+
+
+def renderizar_web(fuente, ruta):
+    directorio = Path(ruta)
+    (directorio / "fragmentos").mkdir(parents=True, exist_ok=True)
+    indice = construir_indice(fuente)
+    compacto = json.dumps(indice, ensure_ascii=False, separators=(',', ':'))
+    with open(directorio / "indice.json", 'w', encoding='utf-8') as f:
+        f.write(compacto)
+    with open(directorio / "indice.js", 'w', encoding='utf-8') as f:
+        f.write(f"window.DICCIONARIO_INDICE={compacto};\n")
+    # Bloques de fragmentos; los que sobran de una corrida anterior se borran.
+    comentarios = fuente.seccion('tablas')
+    bloques     = {}
+    for tabla, _, bloque, _, _ in indice['tablas']:
+        bloques.setdefault(bloque, {})[tabla] = _fragmento_tabla(tabla, comentarios.get(tabla) or '',
+                                                                fuente.campos(tabla))
+    for bloque, tablas in bloques.items():
+        with open(directorio / "fragmentos" / f"bloque_{bloque}.js", 'w', encoding='utf-8') as f:
+            f.write(f"DICCIONARIO.bloque({bloque},{json.dumps(tablas, ensure_ascii=False, separators=(',', ':'))});\n")
+    for viejo in (directorio / "fragmentos").glob("bloque_*.js"):
+        if int(viejo.stem.split('_')[1]) not in bloques:
+            viejo.unlink()
+    titulo = html.escape(f"Diccionario de datos - {fuente.bd}.{fuente.esquema}")
+    with open(directorio / "index.html", 'w', encoding='utf-8') as f:
+        f.write(_PAGINA.replace('{titulo}', titulo))
+
+
+_PAGINA = """<!DOCTYPE html>
+<html lang="es"><head><meta charset="utf-8"><title>{titulo}</title>
+<style>
+body { font-family: Arial, sans-serif; font-size: 13px; margin: 0; display: flex; height: 100vh; color: #000; }
+#panel { width: 34%; min-width: 280px; border-right: 1px solid #ccc; display: flex; flex-direction: column; }
+#barra { padding: 10px; background: #191970; color: #fff; }
+#barra h1 { font-size: 16px; margin: 0 0 8px; }
+#barra input, #barra select { width: 100%; box-sizing: border-box; padding: 5px; margin-top: 4px; }
+#info { padding: 6px 10px; color: #555; border-bottom: 1px solid #eee; }
+#lista { overflow-y: auto; flex: 1; margin: 0; padding: 0; list-style: none; }
+#lista li { padding: 5px 10px; border-bottom: 1px solid #f0f0f0; cursor: pointer; }
+#lista li:hover, #lista li.activo { background: #e8ecf7; }
+#lista .tipo { float: right; color: #888; font-size: 11px; }
+#lista .desc { color: #555; font-size: 12px; white-space: nowrap; overflow: hidden; text-overflow: ellipsis; }
+#detalle { flex: 1; overflow: auto; padding: 16px 24px; }
+table { border-collapse: collapse; } th { background: #191970; color: #fff; }
+th, td { border: 1px solid #000; padding: 3px 6px; vertical-align: top; white-space: pre-wrap; }
+.comentario { white-space: pre-wrap; }
+</style></head><body>
+<div id="panel">
+  <div id="barra"><h1>{titulo}</h1>
+    <input id="q" type="search" placeholder="Buscar tablas, columnas, comentarios..." autofocus>
+    <select id="tipo"></select></div>
+  <div id="info"></div>
+  <ul id="lista"></ul>
+</div>
+<div id="detalle"></div>
+<script src="indice.js"></script>
+<script>
+(function () {
+  var I = window.DICCIONARIO_INDICE, MAX = 500, bloques = {}, esperando = {};
+  var q = document.getElementById('q'), tipo = document.getElementById('tipo');
+  var lista = document.getElementById('lista'), info = document.getElementById('info');
+  var detalle = document.getElementById('detalle');
+  window.DICCIONARIO = { bloque: function (n, tablas) {
+    bloques[n] = tablas;
+    (esperando[n] || []).forEach(function (f) { f(); });
+    delete esperando[n];
+  } };
+  function cargarBloque(n, listo) {
+    if (bloques[n]) { listo(); return; }
+    if (esperando[n]) { esperando[n].push(listo); return; }
+    esperando[n] = [listo];
+    var s = document.createElement('script');
+    s.src = 'fragmentos/bloque_' + n + '.js';
+    document.head.appendChild(s);
+  }
+  function normalizar(t) { return t.toLowerCase().normalize('NFD').replace(/[\\u0300-\\u036f]/g, ''); }
+  function opcion(valor, texto) {
+    var o = document.createElement('option'); o.value = valor; o.textContent = texto; tipo.appendChild(o);
+  }
+  var porSeccion = {};
+  I.objetos.forEach(function (o) { porSeccion[o[0]] = (porSeccion[o[0]] || 0) + 1; });
+  opcion('todo', 'Todo');
+  opcion('tablas', 'Tablas (' + I.tablas.length + ')');
+  I.secciones.forEach(function (s, i) { if (porSeccion[i]) opcion(String(i), s[1] + ' (' + porSeccion[i] + ')'); });
+  function mostrarTabla(t) {
+    location.hash = 't=' + encodeURIComponent(t[0]);
+    detalle.textContent = 'Cargando ' + t[0] + '...';
+    cargarBloque(t[2], function () { detalle.innerHTML = bloques[t[2]][t[0]]; });
+  }
+  function mostrarObjeto(o) {
+    detalle.innerHTML = '';
+    var h = document.createElement('h2'); h.textContent = o[1];
+    var s = document.createElement('p'); s.textContent = I.secciones[o[0]][1];
+    var c = document.createElement('p'); c.className = 'comentario'; c.textContent = o[2] || 'Sin comentario';
+    detalle.appendChild(h); detalle.appendChild(s); detalle.appendChild(c);
+  }
+  function item(nombre, etiqueta, desc, alElegir) {
+    var li = document.createElement('li'), b = document.createElement('b'), e = document.createElement('span');
+    var d = document.createElement('div');
+    e.className = 'tipo'; e.textContent = etiqueta; b.textContent = nombre;
+    d.className = 'desc'; d.textContent = desc;
+    li.appendChild(e); li.appendChild(b); li.appendChild(d);
+    li.onclick = function () {
+      var previo = lista.querySelector('.activo'); if (previo) previo.className = '';
+      li.className = 'activo'; alElegir();
+    };
+    return li;
+  }
+  function buscar() {
+    var terminos = normalizar(q.value).split(/\\s+/).filter(Boolean), filtro = tipo.value;
+    var coincide = function (texto) {
+      for (var i = 0; i < terminos.length; i++) if (texto.indexOf(terminos[i]) < 0) return false;
+      return true;
+    };
+    var total = 0, frag = document.createDocumentFragment();
+    if (filtro === 'todo' || filtro === 'tablas') {
+      I.tablas.forEach(function (t) {
+        if (!coincide(t[4])) return;
+        if (total++ < MAX) frag.appendChild(item(t[0], t[3] + ' col.', t[1], function () { mostrarTabla(t); }));
+      });
+    }
+    if (filtro !== 'tablas') {
+      I.objetos.forEach(function (o) {
+        if ((filtro !== 'todo' && String(o[0]) !== filtro) || !coincide(o[3])) return;
+        if (total++ < MAX) frag.appendChild(item(o[1], I.secciones[o[0]][1], o[2], function () { mostrarObjeto(o); }));
+      });
+    }
+    lista.innerHTML = ''; lista.appendChild(frag);
+    info.textContent = total > MAX ? 'Mostrando ' + MAX + ' de ' + total + ' resultados' : total + ' resultados';
+  }
+  var espera;
+  q.oninput = function () { clearTimeout(espera); espera = setTimeout(buscar, 60); };
+  tipo.onchange = buscar;
+  buscar();
+  var m = /^#t=(.+)$/.exec(location.hash);
+  if (m) {
+    var nombre = decodeURIComponent(m[1]);
+    I.tablas.forEach(function (t) { if (t[0] === nombre) mostrarTabla(t); });
+  } else {
+    var h = document.createElement('h2'), p = document.createElement('p');
+    h.textContent = I.bd + '.' + I.esquema;
+    p.textContent = I.tablas.length + ' tablas y ' + I.objetos.length + ' objetos mas (extraido ' +
+      I.generado + '). Busque por nombre de tabla, columna o comentario.';
+    detalle.appendChild(h); detalle.appendChild(p);
+  }
+})();
+</script>
+</body></html>
+"""
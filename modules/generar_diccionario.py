@@ -1,7 +1,15 @@
 import sys
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import psycopg2
 
+import diccionario_formatos
+import diccionario_web
+from diccionario_cache import CacheFragmentos
+from diccionario_modelo import CAMPOS_COLUMNAS, ModeloDiccionario
+
 ESQUEMAS_HEADERS = ["ESQUEMA", "DESCRIPCION"]
 ESQUEMAS_WIDTHS = [3000, 4500]
 TBSPACE_HEADERS = ["TABLESPACE", "DESCRIPCION"]
@@ -37,58 +45,68 @@ CONSTRAINTS_WIDTHS = [500, 2500, 4500]
 JOBS_HEADERS = ["N", "Job", "Descripcion"]
 JOBS_WIDTHS = [450, 3000, 5500]
 
+class _TablaEscape(dict):
+    """Tabla para str.translate: ASCII precargado; el resto se calcula y se
+    guarda la primera vez que aparece (\\uN? por punto de código)."""
+
+    def __missing__(self, code):
+        valor = self[code] = f"\\u{code}?"
+        return valor
+
+
+_ESCAPE_RTF = _TablaEscape({code: f"\\u{code}?" for code in range(32)})
+_ESCAPE_RTF.update({code: chr(code) for code in range(32, 127)})
+_ESCAPE_RTF.update({ord('\\'): '\\\\', ord('{'): '\\{', ord('}'): '\\}',
+                    ord('\n'): '\\line ', ord('\r'): None, 127: "\\u127?"})
+
+
 def escape_rtf(text):
     if text is None:
         return ""
     text = str(text)
-    sb = []
-    for char in text:
-        code = ord(char)
-        if char == '\\':
-            sb.append('\\\\')
-        elif char == '{':
-            sb.append('\\{')
-        elif char == '}':
-            sb.append('\\}')
-        elif char == '\n':
-            sb.append('\\line ')
-        elif char == '\r':
-            continue
-        elif 32 <= code <= 126:
-            sb.append(char)
-        else:
-            sb.append(f"\\u{code}?")
-    return ''.join(sb)
+    # Camino rápido: ASCII imprimible sin llaves ni barras queda igual.
+    if text.isascii() and text.isprintable() and '\\' not in text and '{' not in text and '}' not in text:
+        return text
+    return text.translate(_ESCAPE_RTF)
 
-def create_table_row(cells, widths, is_header=False):
-    row = []
-    row.append("\\trowd\\trgaph108\\trleft0")
-    row.append("\\trbrdrt\\brdrs\\brdrw10")
-    row.append("\\trbrdrl\\brdrs\\brdrw10")
-    row.append("\\trbrdrb\\brdrs\\brdrw10")
-    row.append("\\trbrdrr\\brdrs\\brdrw10")
-    pos = 0
-    for width in widths:
-        pos += width
-        row.append("\\clbrdrt\\brdrs\\brdrw10")
-        row.append("\\clbrdrl\\brdrs\\brdrw10")
-        row.append("\\clbrdrb\\brdrs\\brdrw10")
-        row.append("\\clbrdrr\\brdrs\\brdrw10")
-        if is_header:
-            row.append("\\clcbpat3")
-        row.append(f"\\cellx{pos}")
-    row.append("\n")
-    for cell in cells:
+
+_PLANTILLAS_FILA = {}
+
+
+def _plantilla_fila(widths, is_header):
+    """(preámbulo, inicio de celda, fin de celda) de una fila, calculados una vez
+    por combinación de anchos y tipo de fila."""
+    clave = (tuple(widths), is_header)
+    plantilla = _PLANTILLAS_FILA.get(clave)
+    if plantilla is None:
+        row = ["\\trowd\\trgaph108\\trleft0",
+               "\\trbrdrt\\brdrs\\brdrw10",
+               "\\trbrdrl\\brdrs\\brdrw10",
+               "\\trbrdrb\\brdrs\\brdrw10",
+               "\\trbrdrr\\brdrs\\brdrw10"]
+        pos = 0
+        for width in widths:
+            pos += width
+            row.append("\\clbrdrt\\brdrs\\brdrw10")
+            row.append("\\clbrdrl\\brdrs\\brdrw10")
+            row.append("\\clbrdrb\\brdrs\\brdrw10")
+            row.append("\\clbrdrr\\brdrs\\brdrw10")
+            if is_header:
+                row.append("\\clcbpat3")
+            row.append(f"\\cellx{pos}")
+        row.append("\n")
         if is_header:
-            row.append("\\qc\\b\\cf2 ")
+            plantilla = (''.join(row), "\\qc\\b\\cf2 ", "\\b0\\cf1\\cell ")
         else:
-            row.append("\\ql ")
-        row.append(escape_rtf(cell or ""))
-        if is_header:
-            row.append("\\b0\\cf1")
-        row.append("\\cell ")
-    row.append("\\row\n")
-    return ''.join(row)
+            plantilla = (''.join(row), "\\ql ", "\\cell ")
+        _PLANTILLAS_FILA[clave] = plantilla
+    return plantilla
+
+
+def create_table_row(cells, widths, is_header=False):
+    preambulo, inicio, fin = _plantilla_fila(widths, is_header)
+    celdas = ''.join([inicio + escape_rtf(cell or "") + fin for cell in cells])
+    return preambulo + celdas + "\\row\n"
 
 def obtener_esquemas_con_comentarios(cursor):
     sql = """
@@ -277,13 +295,178 @@ def obtener_campos_tabla(cursor, schema, table_name):
                 continue
             results.append(dict(zip(columns, row)))
         return results
-    except Exception as e:
-        print(f"Error al obtener campos de {table_name}: {e}")
+    except Exception:
+        # Se propaga: quien arma el documento aísla la tabla (una lista vacía se
+        # confundiría con "No se encontraron columnas").
         cursor.connection.rollback()
-        import traceback
-        traceback.print_exc()
+        raise
+
+# Mismas columnas y reglas que obtener_campos_tabla, para todo el esquema en una
+# consulta sobre pg_catalog. Las expresiones de information_schema.columns
+# (udt_name, data_type, character_maximum_length, is_nullable, visibilidad) se
+# replican tal cual para que el RTF no cambie; igual que antes, una columna en
+# varias FKs aparece una vez por FK.
+_SQL_CAMPOS = """
+    SELECT
+        c.table_name,
+        lower(c.column_name) AS nombre_columna,
+        CASE
+            WHEN c.udt_name = 'date' THEN 'date'
+            WHEN c.udt_name = 'timestamp' THEN 'timestamp'
+            WHEN c.udt_name = 'int8' THEN 'bigint'
+            WHEN c.udt_name = 'int2' THEN 'smallint'
+            WHEN c.udt_name = 'text' THEN 'text'
+            WHEN c.udt_name = 'numeric' THEN 'numeric'
+            WHEN c.udt_name = 'jsonb' THEN 'jsonb'
+            WHEN c.udt_name IN ('bpchar', 'varchar') THEN 'varchar(' || COALESCE(c.character_maximum_length, 255)::text || ')'
+            ELSE
+                CASE
+                    WHEN c.udt_name = 'int4' THEN 'integer'
+                    WHEN c.character_maximum_length IS NOT NULL THEN c.udt_name || ' (' || c.character_maximum_length || ')'
+                    ELSE c.udt_name
+                END
+        END AS tipo,
+        CASE WHEN c.is_nullable = 'YES' THEN 'SI' ELSE 'NO' END AS permite_nulos,
+        c.pk,
+        c.fk,
+        c.descripcion_columna,
+        CASE
+            WHEN c.data_type = 'text' THEN 'Cadena tipo text'
+            WHEN c.data_type = 'numeric' THEN 'Numero decimal'
+            WHEN c.data_type = 'jsonb' THEN 'Representacion binaria de los datos JSON'
+            WHEN c.data_type IN ('integer','smallint','bigint') THEN 'Numero entero positivo'
+            ELSE
+                CASE
+                    WHEN c.data_type LIKE 'timestamp%%' OR c.data_type = 'date' THEN 'dd/mm/aaaa hh:mm:ss'
+                    WHEN c.character_maximum_length IS NOT NULL THEN 'Cadena de hasta ' || c.character_maximum_length || ' caracteres'
+                    ELSE 'Valor especifico del tipo de dato'
+                END
+        END AS valores_permitidos{extra}
+    FROM (
+        SELECT
+            r.relname AS table_name,
+            a.attnum,
+            a.attname::text AS column_name,
+            COALESCE(bt.typname, t.typname)::text AS udt_name,
+            CASE
+                WHEN t.typtype = 'd' THEN
+                    CASE
+                        WHEN bt.typelem <> 0 AND bt.typlen = -1 THEN 'ARRAY'
+                        WHEN nbt.nspname = 'pg_catalog' THEN format_type(t.typbasetype, NULL)
+                        ELSE 'USER-DEFINED'
+                    END
+                ELSE
+                    CASE
+                        WHEN t.typelem <> 0 AND t.typlen = -1 THEN 'ARRAY'
+                        WHEN nt.nspname = 'pg_catalog' THEN format_type(a.atttypid, NULL)
+                        ELSE 'USER-DEFINED'
+                    END
+            END AS data_type,
+            information_schema._pg_char_max_length(
+                information_schema._pg_truetypid(a.*, t.*),
+                information_schema._pg_truetypmod(a.*, t.*)) AS character_maximum_length,
+            CASE WHEN a.attnotnull OR (t.typtype = 'd' AND t.typnotnull) THEN 'NO' ELSE 'YES' END AS is_nullable,
+            COALESCE(d.description, '') AS descripcion_columna,
+            CASE WHEN pk.oid IS NOT NULL THEN 'SI' ELSE '' END AS pk,
+            CASE WHEN fk.oid IS NOT NULL THEN 'SI' ELSE '' END AS fk
+        FROM pg_catalog.pg_attribute a
+        JOIN pg_catalog.pg_class r ON r.oid = a.attrelid
+        JOIN pg_catalog.pg_namespace n ON n.oid = r.relnamespace
+        JOIN pg_catalog.pg_type t ON t.oid = a.atttypid
+        JOIN pg_catalog.pg_namespace nt ON nt.oid = t.typnamespace
+        LEFT JOIN (pg_catalog.pg_type bt JOIN pg_catalog.pg_namespace nbt ON nbt.oid = bt.typnamespace)
+          ON t.typtype = 'd' AND bt.oid = t.typbasetype
+        LEFT JOIN pg_catalog.pg_description d
+          ON d.objoid = r.oid AND d.classoid = 'pg_catalog.pg_class'::regclass AND d.objsubid = a.attnum
+        LEFT JOIN pg_catalog.pg_constraint pk
+          ON pk.conrelid = r.oid AND pk.contype = 'p' AND a.attnum = ANY (pk.conkey)
+         AND (pg_has_role(r.relowner, 'USAGE')
+              OR has_table_privilege(r.oid, 'INSERT, UPDATE, DELETE, TRUNCATE, REFERENCES, TRIGGER')
+              OR has_any_column_privilege(r.oid, 'INSERT, UPDATE, REFERENCES'))
+        LEFT JOIN pg_catalog.pg_constraint fk
+          ON fk.conrelid = r.oid AND fk.contype = 'f' AND a.attnum = ANY (fk.conkey)
+         AND (pg_has_role(r.relowner, 'USAGE')
+              OR has_table_privilege(r.oid, 'INSERT, UPDATE, DELETE, TRUNCATE, REFERENCES, TRIGGER')
+              OR has_any_column_privilege(r.oid, 'INSERT, UPDATE, REFERENCES'))
+        WHERE n.nspname = %s
+          AND r.relkind IN ('r', 'p')
+          AND a.attnum > 0
+          AND NOT a.attisdropped
+          AND (pg_has_role(r.relowner, 'USAGE')
+               OR has_column_privilege(r.oid, a.attnum, 'SELECT, INSERT, UPDATE, REFERENCES'))
+          {filtro}
+    ) c
+"""
+SQL_CAMPOS_ESQUEMA = _SQL_CAMPOS.format(extra='', filtro='') + "    ORDER BY c.table_name, c.attnum;"
+SQL_CAMPOS_TABLAS  = (_SQL_CAMPOS.format(extra='', filtro='AND r.relname = ANY (%s)')
+                      + "    ORDER BY c.table_name, c.attnum;")
+# Huella por tabla de exactamente lo que se escribe en su sección de atributos.
+SQL_HUELLAS_TABLAS = """
+    SELECT f.table_name,
+           md5(string_agg(concat_ws(chr(31), f.nombre_columna, f.tipo, f.permite_nulos, f.pk, f.fk,
+                                    f.descripcion_columna, f.valores_permitidos),
+                          chr(30) ORDER BY f.attnum)),
+           count(*)
+    FROM (""" + _SQL_CAMPOS.format(extra=', c.attnum', filtro='') + """) f
+    GROUP BY f.table_name;
+"""
+
+
+class CamposPorTabla:
+    """Recorre SQL_CAMPOS_ESQUEMA con un cursor de servidor y entrega los campos de
+    cada tabla a medida que se piden. Ambas listas vienen ordenadas por nombre (tipo
+    name: orden de bytes, el mismo que en Python), así que cada grupo se consume
+    tal como llega y la lectura se detiene al pasar el nombre pedido; los grupos
+    de tablas saltadas se guardan hasta que se pidan.
+    tablas: limita la consulta a esas tablas (regeneración incremental).
+    esperadas: tablas que se van a pedir; los grupos de cualquier otra (columnas
+    visibles de una tabla que no lista obtener_nombres_tablas) se descartan en vez
+    de quedar guardados, así la memoria no crece con el esquema."""
+
+    def __init__(self, conn, schema, lote=2000, tablas=None, esperadas=None):
+        # Un cursor de servidor se planifica para devolver rápido el 10% inicial
+        # (nested loops); aquí se lee completo, así que se pide el plan con hash joins.
+        with conn.cursor() as cursor:
+            cursor.execute("SET cursor_tuple_fraction = 1.0")
+        self._cursor = conn.cursor(name='diccionario_campos', withhold=True)
+        self._cursor.itersize = lote
+        if tablas is None:
+            self._cursor.execute(SQL_CAMPOS_ESQUEMA, (schema,))
+        else:
+            self._cursor.execute(SQL_CAMPOS_TABLAS, (schema, list(tablas)))
+        self._filas      = iter(self._cursor)
+        self._siguiente  = next(self._filas, None)
+        self._adelantados = {}
+        self._esperadas  = set(esperadas) if esperadas is not None else None
+
+    def campos(self, table_name):
+        if table_name in self._adelantados:
+            return self._adelantados.pop(table_name)
+        while self._siguiente is not None:
+            tabla = self._siguiente[0]
+            if tabla > table_name:
+                # Ya pasó su lugar en el orden: la tabla no tiene columnas visibles.
+                return []
+            grupo = []
+            while self._siguiente is not None and self._siguiente[0] == tabla:
+                grupo.append(dict(zip(CAMPOS_COLUMNAS, self._siguiente[1:])))
+                self._siguiente = next(self._filas, None)
+            if tabla == table_name:
+                return grupo
+            if self._esperadas is None or tabla in self._esperadas:
+                self._adelantados[tabla] = grupo
         return []
 
+    def cerrar(self):
+        self._cursor.close()
+
+
+def obtener_huellas_tablas(cursor, schema):
+    """{tabla: (md5, filas de atributos)}."""
+    cursor.execute(SQL_HUELLAS_TABLAS, (schema,))
+    return {tabla: (huella, filas) for tabla, huella, filas in cursor.fetchall()}
+
+
 def obtener_procedimientos_con_comentarios(cursor, schema):
     sql = """
     SELECT
@@ -498,290 +681,682 @@ def obtener_jobs_con_comentarios(cursor):
     except:
         return {}
 
-def generar_diccionario_rtf(host, port, database, user, password, schema, output_file):
-    output_path = Path(output_file)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
+CONEXIONES_CATALOGO = 4
+BUFFER_SALIDA       = 1 << 20
+INTERVALO_PROGRESO  = 1.0      # segundos entre líneas de progreso
+
+
+class ExtractorSecciones:
+    """Lanza las consultas de catálogo de cada sección en paralelo sobre un pool
+    pequeño de conexiones; resultado() las entrega en el orden que pida el writer
+    y registra cuánto tardó cada una en el servidor (verboso: imprime cada una)."""
+
+    def __init__(self, conexiones, verboso=True):
+        self._cursores = queue.Queue()
+        for conn in conexiones:
+            self._cursores.put(conn.cursor())
+        self._pool     = ThreadPoolExecutor(max_workers=len(conexiones),
+                                            thread_name_prefix='diccionario')
+        self._futuros  = {}
+        self.latencias = {}
+        self.verboso   = verboso
+
+    def lanzar(self, nombre, funcion, *args):
+        self._futuros[nombre] = self._pool.submit(self._ejecutar, funcion, args)
+
+    def _ejecutar(self, funcion, args):
+        cursor = self._cursores.get()
+        inicio = time.perf_counter()
+        try:
+            return funcion(cursor, *args), time.perf_counter() - inicio
+        finally:
+            self._cursores.put(cursor)
+
+    def resultado(self, nombre):
+        valor, segundos = self._futuros.pop(nombre).result()
+        self.latencias[nombre] = segundos
+        if self.verboso:
+            print(f"  {nombre}: {len(valor)} en {segundos * 1000:.0f} ms")
+        return valor
+
+    def cerrar(self):
+        self._pool.shutdown(wait=True)
+        while not self._cursores.empty():
+            self._cursores.get().close()
+        if self.latencias and self.verboso:
+            nombre = max(self.latencias, key=self.latencias.get)
+            print(f"Consulta de catalogo mas lenta: {nombre} ({self.latencias[nombre] * 1000:.0f} ms)")
+
+
+def conectar_catalogo(host, port, database, user, password):
+    conn = psycopg2.connect(
+        host=host,
+        port=port,
+        database=database,
+        user=user,
+        password=password
+    )
+    conn.autocommit = True
+    return conn
+
+
+# Consulta de cada sección de la fuente en vivo: (clave, función, recibe esquema).
+EXTRACCIONES = [
+    ('esquemas',           obtener_esquemas_con_comentarios,           False),
+    ('tablespaces',        obtener_tablespaces_con_comentarios,        False),
+    ('extensiones',        obtener_extensiones_con_comentarios,        True),
+    ('tablas',             obtener_tablas_con_comentarios,             True),
+    ('nombres_tablas',     obtener_nombres_tablas,                     True),
+    ('procedimientos',     obtener_procedimientos_con_comentarios,     True),
+    ('funciones',          obtener_funciones_con_comentarios,          True),
+    ('vistas',             obtener_vistas_con_comentarios,             True),
+    ('triggers',           obtener_triggers_con_comentarios,           True),
+    ('funciones_triggers', obtener_funciones_triggers_con_comentarios, True),
+    ('types',              obtener_types_con_comentarios,              True),
+    ('dblinks',            obtener_dblinks_con_comentarios,            True),
+    ('tablas_foraneas',    obtener_tablas_foraneas_con_comentarios,    True),
+    ('sinonimos',          obtener_sinonimos_con_comentarios,          True),
+    ('indices',            obtener_indices_con_comentarios,            True),
+    ('constraints',        obtener_constraints_con_comentarios,        True),
+    ('jobs',               obtener_jobs_con_comentarios,               False),
+]
+
+
+class LectorCampos:
+    """Campos por tabla sobre una conexión: en streaming desde CamposPorTabla y, si
+    el cursor del esquema no se puede abrir o se corta a mitad de camino, tabla
+    por tabla. Un error al consultar una tabla se propaga (lo aísla quien arma
+    el documento). streaming=False: sólo tabla por tabla."""
+
+    def __init__(self, conn, schema, tablas=None, esperadas=None, streaming=True):
+        self.esquema = schema
+        self.filas   = 0
+        self._cursor = conn.cursor()
+        self._campos = None
+        if not streaming:
+            return
+        try:
+            self._campos = CamposPorTabla(conn, schema, tablas=tablas, esperadas=esperadas)
+        except Exception as e:
+            print(f"Error al obtener campos del esquema ({e}), se consultara tabla por tabla")
+
+    def campos(self, table_name):
+        campos = None
+        if self._campos is not None:
+            try:
+                campos = self._campos.campos(table_name)
+            except Exception as e:
+                print(f"Error al leer campos del esquema ({e}), se consultara tabla por tabla",
+                      flush=True)
+                self._cerrar_campos()
+        if campos is None:
+            campos = obtener_campos_tabla(self._cursor, self.esquema, table_name)
+        self.filas += len(campos)
+        return campos
+
+    def _cerrar_campos(self):
+        campos, self._campos = self._campos, None
+        try:
+            campos.cerrar()
+        except Exception:
+            pass
+
+    def cerrar(self):
+        if self._campos is not None:
+            self._cerrar_campos()
+        self._cursor.close()
+
+
+class FuenteCatalogo:
+    """Extracción en vivo con la interfaz de ModeloDiccionario: las secciones se
+    lanzan todas al crearla y los atributos llegan en streaming (LectorCampos),
+    así el RTF se escribe mientras el catálogo responde.
+    Con una CacheFragmentos, sólo se consultan las tablas cuya huella cambió
+    (sin huellas, se consultan todas y la caché no guarda nada)."""
+
+    def __init__(self, conn, conexiones, bd, schema, fragmentos=None, verboso=True):
+        self.bd         = bd
+        self.esquema    = schema
+        self.fragmentos = fragmentos
+        self.verboso    = verboso
+        self.conteo     = {}
+        self.huellas    = None          # {tabla: md5} una vez preparada la caché
+        self._secciones = {}
+        self._conn      = conn
+        self._lector    = None
+        self._preparada = False
+        self._vigentes  = None
+        self._atributos_huellas = None
+        self.extractor  = ExtractorSecciones(conexiones or [conn], verboso)
+        for clave, funcion, con_esquema in EXTRACCIONES:
+            if con_esquema:
+                self.extractor.lanzar(clave, funcion, schema)
+            else:
+                self.extractor.lanzar(clave, funcion)
+        if fragmentos is not None:
+            self.extractor.lanzar('huellas', obtener_huellas_tablas, schema)
+        if verboso:
+            print("Latencia por seccion:")
+
+    def seccion(self, clave):
+        # El extractor entrega cada resultado una vez; el modo dividido lo pide
+        # varias (huella de la parte, la parte, el índice).
+        if clave not in self._secciones:
+            self._secciones[clave] = self.extractor.resultado(clave)
+            self.conteo[clave]     = len(self._secciones[clave])
+        return self._secciones[clave]
+
+    def tablas_vigentes(self):
+        """Prepara la caché con las huellas actuales (una vez) y devuelve las tablas
+        cuyo fragmento guardado sigue vigente; None sin caché o sin huellas."""
+        if self.fragmentos is not None and not self._preparada:
+            self._preparada = True
+            try:
+                huellas        = self.extractor.resultado('huellas')
+                self._vigentes = self.fragmentos.preparar({t: h for t, (h, _) in huellas.items()})
+                self.huellas   = {t: h for t, (h, _) in huellas.items()}
+                self._atributos_huellas = sum(n for _, n in huellas.values())
+            except Exception as e:
+                print(f"Error al obtener huellas de tablas ({e}), se regeneraran todas")
+        return self._vigentes
+
+    def nombres_tablas(self):
+        table_names = self.extractor.resultado('nombres_tablas')
+        if self.verboso:
+            print(f"Tablas detectadas: {len(table_names)}")
+        vigentes  = self.tablas_vigentes()
+        consultar = None if vigentes is None else [t for t in table_names if t not in vigentes]
+        if consultar != []:
+            self._lector = LectorCampos(self._conn, self.esquema, tablas=consultar,
+                                        esperadas=consultar or table_names)
+        return table_names
+
+    def campos(self, table_name):
+        if self._lector is None:
+            self._lector = LectorCampos(self._conn, self.esquema, streaming=False)
+        return self._lector.campos(table_name)
+
+    def contar(self):
+        """Objetos por sección ya entregados, más atributos (con caché, según las
+        huellas: las tablas reutilizadas no pasan por campos())."""
+        conteo = dict(self.conteo)
+        conteo['atributos'] = (self._atributos_huellas if self._atributos_huellas is not None
+                               else self._lector.filas if self._lector is not None else 0)
+        return conteo
+
+    def cerrar(self):
+        if self._lector is not None:
+            self._lector.cerrar()
+        self.extractor.cerrar()
+
+
+def fragmento_atributos_rtf(t_name, campos):
+    """Bloque RTF de una tabla en la sección de atributos (lo que guarda la caché)."""
+    partes = []
+    partes.append(f"\\b\\fs24 Tabla: {escape_rtf(t_name)}\\b0\\fs18\\par\n")
+    partes.append("\\par\n")
+    if campos:
+        partes.append(create_table_row(ATRIBUTOS_HEADERS, ATRIBUTOS_WIDTHS, True))
+        j = 1
+        for campo in campos:
+            cells = [
+                str(j),
+                campo.get('nombre_columna', ''),
+                campo.get('tipo', ''),
+                campo.get('permite_nulos', ''),
+                campo.get('pk', ''),
+                campo.get('fk', ''),
+                campo.get('descripcion_columna', ''),
+                campo.get('valores_permitidos', '')
+            ]
+            partes.append(create_table_row(cells, ATRIBUTOS_WIDTHS, False))
+            j += 1
+    else:
+        partes.append("\\i No se encontraron columnas\\i0\\par\n")
+    partes.append("\\par\n")
+    return ''.join(partes)
+
+
+def fragmento_error_rtf(t_name, error):
+    """Bloque de una tabla cuyos campos no se pudieron consultar (no se guarda en caché)."""
+    detalle = ' '.join(str(error).split())
+    return (f"\\b\\fs24 Tabla: {escape_rtf(t_name)}\\b0\\fs18\\par\n"
+            "\\par\n"
+            f"\\i No se pudieron obtener las columnas: {escape_rtf(detalle)}\\i0\\par\n"
+            "\\par\n")
+
+
+class ProgresoConsola:
+    """Avance de la sección de atributos en la consola del lanzador (que lee la
+    salida línea a línea): a lo sumo una línea cada `intervalo` segundos, más la final.
+    El reloj arranca con la llamada hechas=0 al empezar la sección, no al crearse,
+    para que filas/s no cuente la extracción de las secciones previas."""
+
+    def __init__(self, intervalo=INTERVALO_PROGRESO):
+        self.intervalo = intervalo
+        self._inicio   = time.perf_counter()
+        self._ultima   = self._inicio
+
+    def __call__(self, hechas, total, filas):
+        ahora = time.perf_counter()
+        if hechas == 0:
+            self._inicio = self._ultima = ahora
+            return
+        if hechas < total and ahora - self._ultima < self.intervalo:
+            return
+        self._ultima = ahora
+        segundos     = max(ahora - self._inicio, 1e-6)
+        porcentaje   = hechas * 100 // total if total else 100
+        print(f"[PROGRESO] Atributos: {hechas}/{total} tablas ({porcentaje}%), "
+              f"{filas:,} filas, {filas / segundos:,.0f} filas/s", flush=True)
+
+
+# Cuerpo de cada sección de objetos: clave -> (estilo del título, título,
+# encabezados, anchos, numerada, texto si no hay objetos).
+SECCIONES_RTF = {
+    'esquemas':           ("\\ql", "Esquemas", ESQUEMAS_HEADERS, ESQUEMAS_WIDTHS, False,
+                           "No se encontraron esquemas."),
+    'tablespaces':        ("\\ql", "Tablespaces", TBSPACE_HEADERS, TBSPACE_WIDTHS, False,
+                           "No se encontraron tablespaces personalizados."),
+    'extensiones':        ("\\ql", "Extensiones", EXTENSION_HEADERS, EXTENSION_WIDTHS, False, "No aplica."),
+    'tablas':             ("\\ql", "Tablas", ENTIDADES_HEADERS, ENTIDADES_WIDTHS, True,
+                           "No se encontraron comentarios de tablas en el esquema."),
+    'procedimientos':     ("", "Procedimientos", PROC_HEADERS, PROC_WIDTHS, True, "No aplica."),
+    'funciones':          ("", "Funciones", FUNC_HEADERS, FUNC_WIDTHS, True, "No aplica."),
+    'vistas':             ("\\ql", "Vistas", VISTAS_HEADERS, VISTAS_WIDTHS, True, "No aplica."),
+    'triggers':           ("\\ql", "Triggers", TRIGGERS_HEADERS, TRIGGERS_WIDTHS, True, "No aplica."),
+    'funciones_triggers': ("\\ql", "Funciones Triggers", F_TRIGGERS_HEADERS, F_TRIGGERS_WIDTHS, True,
+                           "No aplica."),
+    'types':              ("\\ql", "Types", TYPES_HEADERS, TYPES_WIDTHS, True, "No aplica."),
+    'dblinks':            ("\\ql", "Dblinks / Foreign Servers", DBLINKS_HEADERS, DBLINKS_WIDTHS, True,
+                           "No aplica."),
+    'tablas_foraneas':    ("\\ql", "Tablas Foraneas", T_FORANEA_HEADERS, T_FORANEA_WIDTHS, True,
+                           "No aplica."),
+    'sinonimos':          ("\\ql", "Sinonimos", SINONIMOS_HEADERS, SINONIMOS_WIDTHS, True, "No aplica."),
+    'indices':            ("\\ql", "Indices", INDICES_HEADERS, INDICES_WIDTHS, True, "No aplica."),
+    'constraints':        ("\\ql", "Constraints", CONSTRAINTS_HEADERS, CONSTRAINTS_WIDTHS, True,
+                           "No aplica."),
+    'jobs':               ("\\ql", "Jobs", JOBS_HEADERS, JOBS_WIDTHS, True, "No aplica."),
+}
+# Orden del documento completo y lo que se escribe tras cada sección.
+DOCUMENTO_RTF = [
+    ('esquemas', "\\par\n"), ('tablespaces', "\\par\n"), ('extensiones', "\\par\n\\par\\page\n"),
+    ('tablas', "\\par\\page\n"), ('atributos', "\\page\n"), ('procedimientos', "\\par\n\\page\n"),
+    ('funciones', "\\par\n"), ('vistas', "\\par\\page\n"), ('triggers', "\\par\\page\n"),
+    ('funciones_triggers', "\\par\\page\n"), ('types', "\\par\\page\n"), ('dblinks', "\\par\\page\n"),
+    ('tablas_foraneas', "\\par\\page\n"), ('sinonimos', "\\par\\page\n"), ('indices', "\\par\\page\n"),
+    ('constraints', "\\par\\page\n"), ('jobs', "\\par\n"),
+]
+
+
+def escribir_inicio_rtf(writer):
+    writer.write("{\\rtf1\\ansi\\deff0 {\\fonttbl {\\f0 Arial;}}\n")
+    writer.write("{\\colortbl;\\red0\\green0\\blue0;\\red255\\green255\\blue255;\\red25\\green25\\blue112;}\n")
+    writer.write("\\paperw11906\\paperh16838\\margl1063\\margr973\\margt1063\\margb1063\n")
+    writer.write("\\f0\\fs20\n")
+    writer.write("\\qc\\b\\fs36 DICCIONARIO DE DATOS\\b0\\fs22\\par\n")
+
+
+def escribir_seccion_rtf(writer, fuente, clave):
+    estilo, titulo, headers, widths, numerada, vacio = SECCIONES_RTF[clave]
+    writer.write(f"{estilo}\\b\\fs28 Descripcion de {titulo}\\b0\\fs18\\par\n")
+    writer.write("\\par\n")
+    objetos = fuente.seccion(clave)
+    if objetos:
+        writer.write(create_table_row(headers, widths, True))
+        for i, (nombre, desc) in enumerate(objetos.items(), 1):
+            celdas = [str(i), nombre, desc or ""] if numerada else [nombre, desc or ""]
+            writer.write(create_table_row(celdas, widths, False))
+    else:
+        writer.write(f"\\i {vacio}\\i0\\par\n")
+
+
+def escribir_atributos_rtf(writer, table_names, campos, fragmentos=None, al_progresar=None):
+    """Sección de atributos de esas tablas, tabla por tabla a medida que campos(tabla)
+    las entrega; una tabla que falla queda con una nota en el documento y no
+    detiene el resto. Devuelve {tabla: error} de las que fallaron.
+    al_progresar(hechas, total, filas) se llama al empezar (hechas=0) y tras cada tabla."""
+    writer.write("\\b\\fs28 Descripcion de Atributos\\b0\\fs18\\par\n")
+    writer.write("\\par\n")
+    fallidas = {}
+    filas    = 0
+    if al_progresar is not None:
+        al_progresar(0, len(table_names), 0)
+    for hechas, t_name in enumerate(table_names, 1):
+        fragmento = fragmentos.vigente(t_name) if fragmentos is not None else None
+        if fragmento is None:
+            try:
+                campos_tabla = campos(t_name)
+            except Exception as e:
+                print(f"Error al obtener campos de {t_name}: {e}", flush=True)
+                fallidas[t_name] = str(e).strip()
+                fragmento = fragmento_error_rtf(t_name, e)
+            else:
+                filas    += len(campos_tabla)
+                fragmento = fragmento_atributos_rtf(t_name, campos_tabla)
+                if fragmentos is not None:
+                    fragmentos.registrar(t_name, fragmento)
+        writer.write(fragmento)
+        if al_progresar is not None:
+            al_progresar(hechas, len(table_names), filas)
+    return fallidas
+
+
+def escribir_rtf(writer, fuente, fragmentos=None, al_progresar=None):
+    """Escribe el documento completo en streaming; la sección de atributos se arma
+    a medida que llegan los campos. Devuelve {tabla: error} de las tablas cuyos
+    campos fallaron."""
+    escribir_inicio_rtf(writer)
+    writer.write("\\par\\par\n")
+    writer.write("\\ql\\b\\fs28 TABLA DE CONTENIDO\\b0\\fs20\\par\n")
+    writer.write("\\par\n")
+    contenido = [
+        "1. Descripcion de Esquemas",
+        "2. Descripcion de Tablespaces",
+        "3. Descripcion de Extensiones",
+        "4. Descripcion de Tablas",
+        "5. Descripcion de Atributos",
+        "6. Descripcion de Procedimientos",
+        "7. Descripcion de Funciones",
+        "8. Descripcion de Vistas",
+        "9. Descripcion de Triggers",
+        "10. Descripcion de Funciones Triggers",
+        "11. Descripcion de Types",
+        "12. Descripcion de Dblinks / Foreign Servers",
+        "13. Descripcion de Tablas Foraneas",
+        "14. Descripcion de Sinonimos",
+        "15. Descripcion de Indices",
+        "16. Descripcion de Restricciones (Constraints)",
+        "17. Descripcion de Jobs"
+    ]
+    for item in contenido:
+        writer.write(f"\\fs22 {escape_rtf(item)}\\par\n")
+    writer.write("\\par\\page\n")
+    fallidas = {}
+    for clave, cierre in DOCUMENTO_RTF:
+        if clave == 'atributos':
+            fallidas = escribir_atributos_rtf(writer, fuente.nombres_tablas(), fuente.campos,
+                                              fragmentos, al_progresar)
+        else:
+            escribir_seccion_rtf(writer, fuente, clave)
+        writer.write(cierre)
+    writer.write("}\n")
+    return fallidas
+
+def renderizar_rtf(fuente, ruta, fragmentos=None, al_progresar=None):
+    # Un buffer grande: miles de write() pequeños terminan en pocas escrituras al disco.
+    with open(ruta, 'w', encoding='utf-8', buffering=BUFFER_SALIDA) as writer:
+        return escribir_rtf(writer, fuente, fragmentos, al_progresar)
+
+
+# formato -> (extensión, renderizador(fuente, ruta))
+RENDERIZADORES = {
+    'rtf':  ('.rtf',  renderizar_rtf),
+    'html': ('.html', diccionario_formatos.renderizar_html),
+    'md':   ('.md',   diccionario_formatos.renderizar_markdown),
+    'xlsx': ('.xlsx', diccionario_formatos.renderizar_xlsx),
+    'docx': ('.docx', diccionario_formatos.renderizar_docx),
+    'web':  ('_web',  diccionario_web.renderizar_web),        # directorio
+}
+
+
+def rutas_salida(output_file, formatos):
+    """Una ruta por formato a partir de la ruta pedida: mismo nombre, otra extensión.
+    El RTF conserva la ruta tal cual (es el parámetro ruta_salida_rtf de siempre)."""
+    base = Path(output_file)
+    rutas = {}
+    for formato in formatos:
+        extension = RENDERIZADORES[formato][0]
+        if formato == 'rtf':
+            rutas[formato] = output_file
+        elif extension.startswith('.'):
+            rutas[formato] = str(base.with_suffix(extension))
+        else:
+            rutas[formato] = str(base.with_name(base.stem + extension))
+    return rutas
+
+
+def renderizar_formatos(modelo, salidas, verboso=True):
+    """Renderiza el modelo en cada formato en paralelo. Un formato que falla no
+    detiene a los demás; devuelve {formato: error} de los que fallaron."""
+    def renderizar(formato, ruta):
+        inicio = time.perf_counter()
+        RENDERIZADORES[formato][1](modelo, ruta)
+        return time.perf_counter() - inicio
+
+    errores = {}
+    with ThreadPoolExecutor(max_workers=len(salidas), thread_name_prefix='renderizador') as pool:
+        futuros = {formato: pool.submit(renderizar, formato, ruta) for formato, ruta in salidas.items()}
+        for formato, futuro in futuros.items():
+            try:
+                segundos = futuro.result()
+                if verboso:
+                    print(f"  {formato}: {salidas[formato]} ({segundos * 1000:.0f} ms)")
+            except Exception as e:
+                print(f"Error al generar formato {formato}: {e}")
+                errores[formato] = e
+    return errores
+
+
+def conexiones_secciones(host, port, database, user, password, cantidad=CONEXIONES_CATALOGO):
+    """Conexiones extra para las secciones; sin ellas se comparte la principal."""
+    conexiones = []
+    for _ in range(cantidad):
+        try:
+            conexiones.append(conectar_catalogo(host, port, database, user, password))
+        except Exception as e:
+            print(f"Aviso: no se pudo abrir otra conexion de catalogo ({e})")
+            break
+    return conexiones
+
+
+def _avisar_fallidas(fallidas):
+    if fallidas:
+        print(f"Aviso: {len(fallidas)} tabla(s) sin atributos por error de consulta: "
+              f"{', '.join(fallidas)}")
+
+
+def documentar_esquema(conn, conexiones, host, port, database, user, schema, salidas,
+                       ruta_modelo=None, incremental=True, verboso=True, dividir=None):
+    """Extrae y renderiza un esquema sobre conexiones ya abiertas (no las cierra).
+    Sólo RTF y sin modelo, se escribe en streaming (reutilizando los fragmentos
+    de atributos de tablas sin cambios si incremental), o en partes si se pide
+    dividir (ver diccionario_partes); si no, se arma el modelo y se renderiza en
+    paralelo. Devuelve conteo de objetos, errores por formato, tablas cuyos
+    campos fallaron, (reutilizados, regenerados) de la caché y (escritas,
+    sin cambios) de las partes."""
+    streaming  = list(salidas) == ['rtf'] and ruta_modelo is None
+    division   = None
+    if dividir:
+        if not streaming:
+            raise ValueError("--dividir solo aplica a la salida RTF sin --modelo")
+        import diccionario_partes
+        division = diccionario_partes.leer_modo(dividir)
+    for ruta in salidas.values():
+        Path(ruta).parent.mkdir(parents=True, exist_ok=True)
+    resumen    = {'conteo': {}, 'errores': {}, 'fallidas': {}, 'fragmentos': None, 'partes': None}
+    progreso   = ProgresoConsola() if verboso else None
+    fragmentos = None
+    if streaming and incremental:
+        try:
+            fragmentos = CacheFragmentos(host, port, database, user, schema)
+        except Exception as e:
+            print(f"Aviso: cache de fragmentos no disponible ({e})")
+    fuente = FuenteCatalogo(conn, conexiones, database, schema, fragmentos, verboso)
+    try:
+        if streaming:
+            if division is not None:
+                partes = diccionario_partes.documentar_dividido(conn, conexiones, fuente, salidas['rtf'],
+                                                                *division, fragmentos, progreso, verboso)
+                resumen['fallidas'] = partes['fallidas']
+                resumen['partes']   = (partes['escritas'], partes['sin_cambios'])
+                resumen['conteo']   = fuente.contar()
+                if fuente.huellas is None:
+                    resumen['conteo']['atributos'] = partes['filas']
+            else:
+                resumen['fallidas'] = renderizar_rtf(fuente, salidas['rtf'], fragmentos, progreso)
+                resumen['conteo']   = fuente.contar()
+            _avisar_fallidas(resumen['fallidas'])
+            if fragmentos is not None:
+                fragmentos.guardar()
+                resumen['fragmentos'] = (fragmentos.reutilizados, fragmentos.regenerados)
+                if verboso:
+                    print(f"Fragmentos de atributos: {fragmentos.reutilizados} reutilizados, "
+                          f"{fragmentos.regenerados} regenerados")
+            return resumen
+        modelo = ModeloDiccionario.desde_fuente(fuente, host, port, database, schema, progreso)
+    finally:
+        fuente.cerrar()
+        if fragmentos is not None:
+            fragmentos.cerrar()
+    resumen['conteo']   = modelo.contar()
+    resumen['fallidas'] = modelo.fallidas
+    _avisar_fallidas(modelo.fallidas)
+    if ruta_modelo:
+        modelo.guardar(ruta_modelo)
+        if verboso:
+            print(f"Modelo guardado en: {ruta_modelo}")
+    if verboso:
+        print("Renderizando formatos:")
+    resumen['errores'] = renderizar_formatos(modelo, salidas, verboso)
+    return resumen
+
+
+def generar_diccionario(host, port, database, user, password, schema, output_file,
+                        formatos=('rtf',), ruta_modelo=None, incremental=True, dividir=None):
+    salidas = rutas_salida(output_file, formatos)
     print("Iniciando generación de diccionario...")
     print(f"Esquema: {schema}")
-    print(f"Archivo de salida: {output_file}")
+    print(f"Archivo de salida: {', '.join(salidas.values())}")
     try:
-        conn = psycopg2.connect(
-            host=host,
-            port=port,
-            database=database,
-            user=user,
-            password=password
-        )
-        conn.autocommit = True
-        cursor = conn.cursor()
+        conn = conectar_catalogo(host, port, database, user, password)
         print("Conexión exitosa a PostgreSQL")
     except Exception as e:
         print(f"Error al conectar a la base de datos: {e}")
         sys.exit(3)
-    esquemas = obtener_esquemas_con_comentarios(cursor)
-    tablespaces = obtener_tablespaces_con_comentarios(cursor)
-    extensiones = obtener_extensiones_con_comentarios(cursor, schema)
-    tablas = obtener_tablas_con_comentarios(cursor, schema)
-    table_names = obtener_nombres_tablas(cursor, schema)
-    print(f"Tablas detectadas: {len(table_names)}")
-    procedimientos = obtener_procedimientos_con_comentarios(cursor, schema)
-    funciones = obtener_funciones_con_comentarios(cursor, schema)
-    vistas = obtener_vistas_con_comentarios(cursor, schema)
-    triggers = obtener_triggers_con_comentarios(cursor, schema)
-    funciones_triggers = obtener_funciones_triggers_con_comentarios(cursor, schema)
-    types = obtener_types_con_comentarios(cursor, schema)
-    dblinks = obtener_dblinks_con_comentarios(cursor, schema)
-    tablas_foraneas = obtener_tablas_foraneas_con_comentarios(cursor, schema)
-    sinonimos = obtener_sinonimos_con_comentarios(cursor, schema)
-    indices = obtener_indices_con_comentarios(cursor, schema)
-    constraints = obtener_constraints_con_comentarios(cursor, schema)
-    jobs = obtener_jobs_con_comentarios(cursor)
-    with open(output_file, 'w', encoding='utf-8') as writer:
-        writer.write("{\\rtf1\\ansi\\deff0 {\\fonttbl {\\f0 Arial;}}\n")
-        writer.write("{\\colortbl;\\red0\\green0\\blue0;\\red255\\green255\\blue255;\\red25\\green25\\blue112;}\n")
-        writer.write("\\paperw11906\\paperh16838\\margl1063\\margr973\\margt1063\\margb1063\n")
-        writer.write("\\f0\\fs20\n")
-        writer.write("\\qc\\b\\fs36 DICCIONARIO DE DATOS\\b0\\fs22\\par\n")
-        writer.write("\\par\\par\n")
-        writer.write("\\ql\\b\\fs28 TABLA DE CONTENIDO\\b0\\fs20\\par\n")
-        writer.write("\\par\n")
-        contenido = [
-            "1. Descripcion de Esquemas",
-            "2. Descripcion de Tablespaces",
-            "3. Descripcion de Extensiones",
-            "4. Descripcion de Tablas",
-            "5. Descripcion de Atributos",
-            "6. Descripcion de Procedimientos",
-            "7. Descripcion de Funciones",
-            "8. Descripcion de Vistas",
-            "9. Descripcion de Triggers",
-            "10. Descripcion de Funciones Triggers",
-            "11. Descripcion de Types",
-            "12. Descripcion de Dblinks / Foreign Servers",
-            "13. Descripcion de Tablas Foraneas",
-            "14. Descripcion de Sinonimos",
-            "15. Descripcion de Indices",
-            "16. Descripcion de Restricciones (Constraints)",
-            "17. Descripcion de Jobs"
-        ]
-        for item in contenido:
-            writer.write(f"\\fs22 {escape_rtf(item)}\\par\n")
-        writer.write("\\par\\page\n")
-        writer.write("\\ql\\b\\fs28 Descripcion de Esquemas\\b0\\fs18\\par\n")
-        writer.write("\\par\n")
-        if esquemas:
-            writer.write(create_table_row(ESQUEMAS_HEADERS, ESQUEMAS_WIDTHS, True))
-            for esq_name, desc in esquemas.items():
-                writer.write(create_table_row([esq_name, desc or ""], ESQUEMAS_WIDTHS, False))
-        else:
-            writer.write("\\i No se encontraron esquemas.\\i0\\par\n")
-        writer.write("\\par\n")
-        writer.write("\\ql\\b\\fs28 Descripcion de Tablespaces\\b0\\fs18\\par\n")
-        writer.write("\\par\n")
-        if tablespaces:
-            writer.write(create_table_row(TBSPACE_HEADERS, TBSPACE_WIDTHS, True))
-            for tbs_name, desc in tablespaces.items():
-                writer.write(create_table_row([tbs_name, desc or ""], TBSPACE_WIDTHS, False))
-        else:
-            writer.write("\\i No se encontraron tablespaces personalizados.\\i0\\par\n")
-        writer.write("\\par\n")
-        writer.write("\\ql\\b\\fs28 Descripcion de Extensiones\\b0\\fs18\\par\n")
-        writer.write("\\par\n")
-        if extensiones:
-            writer.write(create_table_row(EXTENSION_HEADERS, EXTENSION_WIDTHS, True))
-            for ext_name, desc in extensiones.items():
-                writer.write(create_table_row([ext_name, desc or ""], EXTENSION_WIDTHS, False))
-        else:
-            writer.write("\\i No aplica.\\i0\\par\n")
-        writer.write("\\par\n")
-        writer.write("\\par\\page\n")
-        writer.write("\\ql\\b\\fs28 Descripcion de Tablas\\b0\\fs18\\par\n")
-        writer.write("\\par\n")
-        if tablas:
-            writer.write(create_table_row(ENTIDADES_HEADERS, ENTIDADES_WIDTHS, True))
-            i = 1
-            for t_name, desc in tablas.items():
-                writer.write(create_table_row([str(i), t_name, desc or ""], ENTIDADES_WIDTHS, False))
-                i += 1
-        else:
-            writer.write("\\i No se encontraron comentarios de tablas en el esquema.\\i0\\par\n")
-        writer.write("\\par\\page\n")
-        writer.write("\\b\\fs28 Descripcion de Atributos\\b0\\fs18\\par\n")
-        writer.write("\\par\n")
-        for t_name in table_names:
-            writer.write(f"\\b\\fs24 Tabla: {escape_rtf(t_name)}\\b0\\fs18\\par\n")
-            writer.write("\\par\n")
-            campos = obtener_campos_tabla(cursor, schema, t_name)
-            if campos:
-                writer.write(create_table_row(ATRIBUTOS_HEADERS, ATRIBUTOS_WIDTHS, True))
-                j = 1
-                for campo in campos:
-                    cells = [
-                        str(j),
-                        campo.get('nombre_columna', ''),
-                        campo.get('tipo', ''),
-                        campo.get('permite_nulos', ''),
-                        campo.get('pk', ''),
-                        campo.get('fk', ''),
-                        campo.get('descripcion_columna', ''),
-                        campo.get('valores_permitidos', '')
-                    ]
-                    writer.write(create_table_row(cells, ATRIBUTOS_WIDTHS, False))
-                    j += 1
-            else:
-                writer.write("\\i No se encontraron columnas\\i0\\par\n")
-            writer.write("\\par\n")
-        writer.write("\\page\n")
-        writer.write("\\b\\fs28 Descripcion de Procedimientos\\b0\\fs18\\par\n")
-        writer.write("\\par\n")
-        if procedimientos:
-            writer.write(create_table_row(PROC_HEADERS, PROC_WIDTHS, True))
-            k = 1
-            for p_name, p_desc in procedimientos.items():
-                writer.write(create_table_row([str(k), p_name, p_desc or ""], PROC_WIDTHS, False))
-                k += 1
-        else:
-            writer.write("\\i No aplica.\\i0\\par\n")
-        writer.write("\\par\n")
-        writer.write("\\page\n")
-        writer.write("\\b\\fs28 Descripcion de Funciones\\b0\\fs18\\par\n")
-        writer.write("\\par\n")
-        if funciones:
-            writer.write(create_table_row(FUNC_HEADERS, FUNC_WIDTHS, True))
-            m = 1
-            for f_name, f_desc in funciones.items():
-                writer.write(create_table_row([str(m), f_name, f_desc or ""], FUNC_WIDTHS, False))
-                m += 1
-        else:
-            writer.write("\\i No aplica.\\i0\\par\n")
-        writer.write("\\par\n")
-        writer.write("\\ql\\b\\fs28 Descripcion de Vistas\\b0\\fs18\\par\n")
-        writer.write("\\par\n")
-        if vistas:
-            writer.write(create_table_row(VISTAS_HEADERS, VISTAS_WIDTHS, True))
-            j = 1
-            for v_name, desc in vistas.items():
-                writer.write(create_table_row([str(j), v_name, desc or ""], VISTAS_WIDTHS, False))
-                j += 1
-        else:
-            writer.write("\\i No aplica.\\i0\\par\n")
-        writer.write("\\par\\page\n")
-        writer.write("\\ql\\b\\fs28 Descripcion de Triggers\\b0\\fs18\\par\n")
-        writer.write("\\par\n")
-        if triggers:
-            writer.write(create_table_row(TRIGGERS_HEADERS, TRIGGERS_WIDTHS, True))
-            l = 1
-            for t_name, desc in triggers.items():
-                writer.write(create_table_row([str(l), t_name, desc or ""], TRIGGERS_WIDTHS, False))
-                l += 1
-        else:
-            writer.write("\\i No aplica.\\i0\\par\n")
-        writer.write("\\par\\page\n")
-        writer.write("\\ql\\b\\fs28 Descripcion de Funciones Triggers\\b0\\fs18\\par\n")
-        writer.write("\\par\n")
-        if funciones_triggers:
-            writer.write(create_table_row(F_TRIGGERS_HEADERS, F_TRIGGERS_WIDTHS, True))
-            p = 1
-            for ft_name, desc in funciones_triggers.items():
-                writer.write(create_table_row([str(p), ft_name, desc or ""], F_TRIGGERS_WIDTHS, False))
-                p += 1
-        else:
-            writer.write("\\i No aplica.\\i0\\par\n")
-        writer.write("\\par\\page\n")
-        writer.write("\\ql\\b\\fs28 Descripcion de Types\\b0\\fs18\\par\n")
-        writer.write("\\par\n")
-        if types:
-            writer.write(create_table_row(TYPES_HEADERS, TYPES_WIDTHS, True))
-            q = 1
-            for type_name, desc in types.items():
-                writer.write(create_table_row([str(q), type_name, desc or ""], TYPES_WIDTHS, False))
-                q += 1
-        else:
-            writer.write("\\i No aplica.\\i0\\par\n")
-        writer.write("\\par\\page\n")
-        writer.write("\\ql\\b\\fs28 Descripcion de Dblinks / Foreign Servers\\b0\\fs18\\par\n")
-        writer.write("\\par\n")
-        if dblinks:
-            writer.write(create_table_row(DBLINKS_HEADERS, DBLINKS_WIDTHS, True))
-            r = 1
-            for db_name, desc in dblinks.items():
-                writer.write(create_table_row([str(r), db_name, desc or ""], DBLINKS_WIDTHS, False))
-                r += 1
-        else:
-            writer.write("\\i No aplica.\\i0\\par\n")
-        writer.write("\\par\\page\n")
-        writer.write("\\ql\\b\\fs28 Descripcion de Tablas Foraneas\\b0\\fs18\\par\n")
-        writer.write("\\par\n")
-        if tablas_foraneas:
-            writer.write(create_table_row(T_FORANEA_HEADERS, T_FORANEA_WIDTHS, True))
-            s = 1
-            for tf_name, desc in tablas_foraneas.items():
-                writer.write(create_table_row([str(s), tf_name, desc or ""], T_FORANEA_WIDTHS, False))
-                s += 1
-        else:
-            writer.write("\\i No aplica.\\i0\\par\n")
-        writer.write("\\par\\page\n")
-        writer.write("\\ql\\b\\fs28 Descripcion de Sinonimos\\b0\\fs18\\par\n")
-        writer.write("\\par\n")
-        if sinonimos:
-            writer.write(create_table_row(SINONIMOS_HEADERS, SINONIMOS_WIDTHS, True))
-            t = 1
-            for sin_name, desc in sinonimos.items():
-                writer.write(create_table_row([str(t), sin_name, desc or ""], SINONIMOS_WIDTHS, False))
-                t += 1
-        else:
-            writer.write("\\i No aplica.\\i0\\par\n")
-        writer.write("\\par\\page\n")
-        writer.write("\\ql\\b\\fs28 Descripcion de Indices\\b0\\fs18\\par\n")
-        writer.write("\\par\n")
-        if indices:
-            writer.write(create_table_row(INDICES_HEADERS, INDICES_WIDTHS, True))
-            u = 1
-            for idx_name, desc in indices.items():
-                writer.write(create_table_row([str(u), idx_name, desc or ""], INDICES_WIDTHS, False))
-                u += 1
-        else:
-            writer.write("\\i No aplica.\\i0\\par\n")
-        writer.write("\\par\\page\n")
-        writer.write("\\ql\\b\\fs28 Descripcion de Constraints\\b0\\fs18\\par\n")
-        writer.write("\\par\n")
-        if constraints:
-            writer.write(create_table_row(CONSTRAINTS_HEADERS, CONSTRAINTS_WIDTHS, True))
-            v = 1
-            for constraint_name, desc in constraints.items():
-                writer.write(create_table_row([str(v), constraint_name, desc or ""], CONSTRAINTS_WIDTHS, False))
-                v += 1
-        else:
-            writer.write("\\i No aplica.\\i0\\par\n")
-        writer.write("\\par\\page\n")
-        writer.write("\\ql\\b\\fs28 Descripcion de Jobs\\b0\\fs18\\par\n")
-        writer.write("\\par\n")
-        if jobs:
-            writer.write(create_table_row(JOBS_HEADERS, JOBS_WIDTHS, True))
-            w = 1
-            for job_name, desc in jobs.items():
-                writer.write(create_table_row([str(w), job_name, desc or ""], JOBS_WIDTHS, False))
-                w += 1
+    conexiones = conexiones_secciones(host, port, database, user, password)
+    try:
+        resumen = documentar_esquema(conn, conexiones, host, port, database, user, schema, salidas,
+                                     ruta_modelo, incremental, dividir=dividir)
+    finally:
+        for conexion in conexiones:
+            conexion.close()
+        conn.close()
+    if resumen['errores']:
+        sys.exit(4)
+    if dividir:
+        print(f"Indice RTF generado en: {salidas['rtf']}")
+    elif list(salidas) == ['rtf'] and ruta_modelo is None:
+        print(f"Archivo RTF generado en: {salidas['rtf']}")
+
+
+def generar_diccionario_rtf(host, port, database, user, password, schema, output_file):
+    generar_diccionario(host, port, database, user, password, schema, output_file)
+
+
+def renderizar_desde_modelo(ruta_modelo, output_file, formatos=('rtf',)):
+    """Vuelve a renderizar un modelo guardado, sin conexión a la base de datos."""
+    try:
+        modelo = ModeloDiccionario.cargar(ruta_modelo)
+    except Exception as e:
+        print(f"Error al leer el modelo {ruta_modelo}: {e}")
+        sys.exit(1)
+    salidas = rutas_salida(output_file, formatos)
+    for ruta in salidas.values():
+        Path(ruta).parent.mkdir(parents=True, exist_ok=True)
+    print(f"Modelo: {modelo.bd}.{modelo.esquema} (extraido {modelo.generado})")
+    print("Renderizando formatos:")
+    if renderizar_formatos(modelo, salidas):
+        sys.exit(4)
+
+
+def _leer_formatos(opciones):
+    if '--formatos' not in opciones:
+        return ('rtf',)
+    formatos = [f.strip().lower() for f in opciones[opciones.index('--formatos') + 1].split(',') if f.strip()]
+    desconocidos = [f for f in formatos if f not in RENDERIZADORES]
+    if desconocidos:
+        print(f"Error: formato no soportado: {', '.join(desconocidos)} "
+              f"(disponibles: {', '.join(RENDERIZADORES)})")
+        sys.exit(1)
+    return tuple(dict.fromkeys(formatos))
+
+
+def _valor_opcion(opciones, nombre):
+    return opciones[opciones.index(nombre) + 1] if nombre in opciones else None
+
+
+def ejecutar_lote_cli(args, uso):
+    import diccionario_lote
+    opciones = args[1:]
+    ruta     = opciones[0] if opciones and not opciones[0].startswith('--') else None
+    try:
+        if args[0] == '--lote':
+            if ruta is None:
+                raise ValueError("falta el archivo de objetivos")
+            objetivos = diccionario_lote.cargar_objetivos(ruta)
         else:
-            writer.write("\\i No aplica.\\i0\\par\n")
-        writer.write("\\par\n")
-        writer.write("}\n")
-    cursor.close()
-    conn.close()
-    print(f"Archivo RTF generado en: {output_file}")
+            objetivos = diccionario_lote.objetivos_desde_historial(ruta)
+        trabajadores = int(_valor_opcion(opciones, '--trabajadores') or diccionario_lote.TRABAJADORES_LOTE)
+    except (OSError, ValueError) as e:
+        print(f"Error al leer los objetivos del lote: {e}")
+        print(uso)
+        sys.exit(1)
+    if not objetivos:
+        print("No hay objetivos para el lote")
+        sys.exit(1)
+    resumen = diccionario_lote.ejecutar_lote(objetivos, trabajadores, _leer_formatos(opciones),
+                                             incremental='--sin-cache' not in opciones)
+    diccionario_lote.imprimir_resumen(resumen)
+    if _valor_opcion(opciones, '--resumen'):
+        diccionario_lote.guardar_resumen(resumen, _valor_opcion(opciones, '--resumen'))
+        print(f"Resumen guardado en: {_valor_opcion(opciones, '--resumen')}")
+    if any(r['estado'] != 'OK' for r in resumen['objetivos']):
+        sys.exit(4)
+
 
 def main():
-    if len(sys.argv) != 8:
+    uso = ("Uso: python generar_diccionario.py <host> <puerto> <bd> <usuario> <password> <esquema> "
+           "<ruta_salida_rtf> [--formatos rtf,html,md,xlsx,docx,web] [--modelo modelo.json] [--sin-cache] "
+           "[--dividir seccion|tablas:N|prefijo]\n"
+           "     python generar_diccionario.py --desde-modelo <modelo.json> <ruta_salida> "
+           "[--formatos rtf,html,md,xlsx,docx,web]\n"
+           "     python generar_diccionario.py --lote <objetivos.json> | --lote-historial [historial.json] "
+           "[--trabajadores N] [--formatos ...] [--sin-cache] [--resumen resumen.json]")
+    args = sys.argv[1:]
+    if args[:1] in (['--lote'], ['--lote-historial']):
+        ejecutar_lote_cli(args, uso)
+        return
+    try:
+        if args[:1] == ['--desde-modelo']:
+            opciones = args[3:]
+            formatos = _leer_formatos(opciones)
+            renderizar_desde_modelo(args[1], args[2], formatos)
+            return
+        opciones    = args[7:]
+        formatos    = _leer_formatos(opciones)
+        ruta_modelo = _valor_opcion(opciones, '--modelo')
+        dividir     = _valor_opcion(opciones, '--dividir')
+    except IndexError:
+        print("Error: Faltan parametros")
+        print(uso)
+        sys.exit(1)
+    if len(args) < 7:
         print("Error: Se requieren 7 parametros")
-        print("Uso: python generar_diccionario.py <host> <puerto> <bd> <usuario> <password> <esquema> <ruta_salida_rtf>")
+        print(uso)
         sys.exit(1)
-    host = sys.argv[1]
-    port = sys.argv[2]
-    database = sys.argv[3]
-    user = sys.argv[4]
-    password = sys.argv[5]
-    schema = sys.argv[6]
-    output_file = sys.argv[7]
-    generar_diccionario_rtf(host, port, database, user, password, schema, output_file)
+    if dividir:
+        try:
+            if formatos != ('rtf',) or ruta_modelo:
+                raise ValueError("--dividir solo aplica a la salida RTF sin --modelo")
+            import diccionario_partes
+            diccionario_partes.leer_modo(dividir)
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}")
+            print(uso)
+            sys.exit(1)
+    host, port, database, user, password, schema, output_file = args[:7]
+    generar_diccionario(host, port, database, user, password, schema, output_file, formatos, ruta_modelo,
+                        incremental='--sin-cache' not in opciones, dividir=dividir)
 if __name__ == "__main__":
     main()
@@ -0,0 +1,193 @@
+"""
+Índice de búsqueda en memoria sobre objetos del esquema (tablas, columnas y sus
+comentarios), compartido por las GUIs.
+
+Se construye una vez y responde consultas en el orden:
+  1. nombre exacto y prefijo   -> bisect sobre los nombres ordenados
+  2. subcadena en el nombre     -> intersección de trigramas + verificación
+  3. subcadena en el comentario -> str.find sobre los comentarios concatenados
+  4. difusa                     -> similitud de trigramas por palabra del nombre
+                                   (Jaccard >= 0.3, el umbral por defecto de pg_trgm)
+Las consultas de 1-2 caracteres usan str.find sobre los nombres concatenados.
+"""
+import re
+import unicodedata
+from bisect import bisect_left, bisect_right
+from collections import Counter
+
+
+_SEPARADOR        = '\n'
+_SIMILITUD_MINIMA = 0.3
+_PALABRA          = re.compile(r'[^\W\d_]+')
+
+
+def normalizar(texto):
+    """Minúsculas y sin tildes, para que 'Región' encuentre 'region'."""
+    if texto.isascii():
+        return texto.lower()
+    descompuesto = unicodedata.normalize('NFKD', texto)
+    return ''.join(c for c in descompuesto if not unicodedata.combining(c)).lower()
+
+
+def _trigramas(texto, relleno=False):
+    """Con relleno se suman los trigramas de borde ('  a', ' ab', 'yz '), como pg_trgm."""
+    if relleno:
+        texto = f"  {texto} "
+    return {texto[i:i + 3] for i in range(len(texto) - 2)}
+
+
+class IndiceBusqueda:
+    """Búsqueda por prefijo, subcadena y difusa sobre nombres y comentarios."""
+
+    def __init__(self):
+        self._claves      = []
+        self._nombres     = []      # normalizados
+        self._comentarios = []      # normalizados
+        self._construido  = False
+
+    def __len__(self):
+        return len(self._claves)
+
+    def agregar(self, clave, nombre, comentario=''):
+        """clave: lo que devuelve buscar() (p. ej. 'tabla' o 'tabla.columna')."""
+        self._claves.append(clave)
+        self._nombres.append(normalizar(nombre))
+        self._comentarios.append(normalizar(comentario or ''))
+        self._construido = False
+
+    def construir(self):
+        n = len(self._claves)
+        # Nombres ordenados para prefijos; ids en ese orden.
+        self._orden          = sorted(range(n), key=self._nombres.__getitem__)
+        self._nombres_orden  = [self._nombres[i] for i in self._orden]
+        self._trigramas      = {}
+        palabras             = {}      # palabra → ids de entradas
+        for i, nombre in enumerate(self._nombres):
+            for g in _trigramas(nombre):
+                lista = self._trigramas.get(g)
+                if lista is None:
+                    self._trigramas[g] = [i]
+                else:
+                    lista.append(i)
+            for palabra in _PALABRA.findall(nombre):
+                palabras.setdefault(palabra, []).append(i)
+        # La difusa compara contra el vocabulario (miles de palabras), no contra
+        # cada entrada: 'clinete' encuentra 'cliente' en mae_cliente y cab_cliente.
+        self._palabras          = list(palabras)
+        self._entradas_palabra  = [palabras[p] for p in self._palabras]
+        self._trigramas_palabra = [_trigramas(p, relleno=True) for p in self._palabras]
+        self._indice_palabras   = {}
+        for j, grams in enumerate(self._trigramas_palabra):
+            for g in grams:
+                self._indice_palabras.setdefault(g, []).append(j)
+        # Textos concatenados: str.find recorre en C y el offset se mapea al id.
+        self._nombres_unidos,     self._inicios_nombres     = self._unir(self._nombres)
+        self._comentarios_unidos, self._inicios_comentarios = self._unir(self._comentarios)
+        self._construido = True
+
+    @staticmethod
+    def _unir(textos):
+        inicios = []
+        pos     = 0
+        for texto in textos:
+            inicios.append(pos)
+            pos += len(texto) + 1
+        return _SEPARADOR.join(textos), inicios
+
+    # ── Consulta ──────────────────────────────────────────────────────────────
+    def buscar(self, consulta, limite=200):
+        """Claves ordenadas por relevancia; a lo sumo `limite` (None = todas)."""
+        if not self._construido:
+            self.construir()
+        q = normalizar(consulta.strip())
+        if not q:
+            return []
+        limite   = limite or len(self._claves)
+        vistos   = set()
+        ids      = []
+
+        def sumar(candidatos):
+            for i in candidatos:
+                if i not in vistos:
+                    vistos.add(i)
+                    ids.append(i)
+                    if len(ids) >= limite:
+                        return True
+            return False
+
+        # 1. Exacto y prefijo (bisect: los exactos quedan primero).
+        desde = bisect_left(self._nombres_orden, q)
+        hasta = bisect_right(self._nombres_orden, q + '\uffff', desde)
+        if sumar(self._orden[desde:hasta]):
+            return self._resultado(ids)
+        # 2. Subcadena en el nombre.
+        if sumar(sorted(self._subcadena_nombre(q), key=lambda i: (len(self._nombres[i]), i))):
+            return self._resultado(ids)
+        # 3. Subcadena en el comentario.
+        if sumar(self._buscar_unido(self._comentarios_unidos, self._inicios_comentarios, q)):
+            return self._resultado(ids)
+        # 4. Difusa.
+        if len(q) >= 3:
+            sumar(self._difusa(q, vistos))
+        return self._resultado(ids)
+
+    def _resultado(self, ids):
+        return [self._claves[i] for i in ids]
+
+    def _subcadena_nombre(self, q):
+        if len(q) < 3:
+            return self._buscar_unido(self._nombres_unidos, self._inicios_nombres, q)
+        listas = []
+        for g in _trigramas(q):
+            lista = self._trigramas.get(g)
+            if lista is None:
+                return []
+            listas.append(lista)
+        listas.sort(key=len)
+        candidatos = set(listas[0])
+        for lista in listas[1:]:
+            if len(candidatos) < 64:
+                break               # pocos candidatos: verificar es más barato que intersecar
+            candidatos.intersection_update(lista)
+        nombres = self._nombres
+        return [i for i in candidatos if q in nombres[i]]
+
+    @staticmethod
+    def _buscar_unido(unido, inicios, q):
+        encontrados = []
+        pos         = unido.find(q)
+        while pos != -1:
+            i = bisect_right(inicios, pos) - 1
+            encontrados.append(i)
+            # Siguiente entrada: evita contar dos veces el mismo texto.
+            siguiente = inicios[i + 1] if i + 1 < len(inicios) else len(unido)
+            pos = unido.find(q, siguiente)
+        return encontrados
+
+    def _difusa(self, q, excluidos):
+        """Cada palabra de la consulta debe parecerse (Jaccard de trigramas) a alguna
+        palabra del nombre; el puntaje de la entrada es la peor de esas similitudes."""
+        mejores = None
+        for palabra in _PALABRA.findall(q):
+            grams  = _trigramas(palabra, relleno=True)
+            conteo = Counter()
+            for g in grams:
+                conteo.update(self._indice_palabras.get(g, ()))
+            por_entrada = {}
+            for j, comunes in conteo.items():
+                similitud = comunes / (len(grams) + len(self._trigramas_palabra[j]) - comunes)
+                if similitud >= _SIMILITUD_MINIMA:
+                    for i in self._entradas_palabra[j]:
+                        if similitud > por_entrada.get(i, 0):
+                            por_entrada[i] = similitud
+            if mejores is None:
+                mejores = por_entrada
+            else:
+                mejores = {i: min(s, por_entrada[i]) for i, s in mejores.items() if i in por_entrada}
+            if not mejores:
+                return []
+        if not mejores:
+            return []
+        puntajes = sorted((-s, len(self._nombres[i]), i) for i, s in mejores.items()
+                          if i not in excluidos)
+        return [i for _, _, i in puntajes]
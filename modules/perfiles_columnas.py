@@ -0,0 +1,124 @@
+"""
+Perfiles de generación por columna (rangos, longitudes, fechas...) persistidos
+entre sesiones en data/perfiles_columnas.db, con clave host/puerto/bd/esquema.
+
+Los cambios se acumulan en memoria (uno por columna, el último gana) y se
+escriben juntos en una transacción al llamar a guardar_pendientes(); quien usa
+el almacén decide cuándo (la GUI lo hace con un temporizador que se reinicia
+en cada cambio).
+"""
+import json
+import sqlite3
+import sys
+from datetime import datetime
+from pathlib import Path
+
+
+_ESQUEMA_SQL = """
+    CREATE TABLE IF NOT EXISTS perfiles (
+        host        TEXT NOT NULL,
+        puerto      TEXT NOT NULL,
+        bd          TEXT NOT NULL,
+        esquema     TEXT NOT NULL,
+        tabla       TEXT NOT NULL,
+        columna     TEXT NOT NULL,
+        tipo        TEXT NOT NULL,
+        config      TEXT NOT NULL,
+        actualizado TEXT NOT NULL,
+        PRIMARY KEY (host, puerto, bd, esquema, tabla, columna)
+    )
+"""
+
+
+def ruta_por_defecto():
+    if getattr(sys, 'frozen', False):
+        raiz = Path(sys.executable).parent
+    else:
+        raiz = Path(__file__).resolve().parent.parent
+    return raiz / "data" / "perfiles_columnas.db"
+
+
+class AlmacenPerfiles:
+    """Perfiles {'tabla.columna': {'tipo': ..., 'config': {...}}} de un esquema."""
+
+    def __init__(self, host, puerto, bd, esquema, ruta=None):
+        ruta = Path(ruta) if ruta else ruta_por_defecto()
+        ruta.parent.mkdir(parents=True, exist_ok=True)
+        self._clave      = (str(host), str(puerto), str(bd), str(esquema))
+        self._conn       = sqlite3.connect(str(ruta))
+        self._conn.execute(_ESQUEMA_SQL)
+        self._conn.commit()
+        self._pendientes = {}
+
+    # ── Lectura ───────────────────────────────────────────────────────────────
+    def cargar_tablas(self, tablas):
+        """Perfiles guardados de esas tablas (los pendientes de escribir ganan)."""
+        tablas = list(tablas)
+        perfiles = {}
+        for desde in range(0, len(tablas), 500):          # límite de parámetros de SQLite
+            lote   = tablas[desde:desde + 500]
+            marcas = ', '.join('?' * len(lote))
+            filas  = self._conn.execute(
+                f"SELECT tabla, columna, tipo, config FROM perfiles "
+                f"WHERE host = ? AND puerto = ? AND bd = ? AND esquema = ? AND tabla IN ({marcas})",
+                (*self._clave, *lote))
+            for tabla, columna, tipo, config in filas:
+                perfiles[f"{tabla}.{columna}"] = {'tipo': tipo, 'config': json.loads(config)}
+        lote = set(tablas)
+        perfiles.update({k: v for k, v in self._pendientes.items() if k.split('.', 1)[0] in lote})
+        return perfiles
+
+    def todos(self):
+        self.guardar_pendientes()
+        filas = self._conn.execute(
+            "SELECT tabla, columna, tipo, config FROM perfiles "
+            "WHERE host = ? AND puerto = ? AND bd = ? AND esquema = ? ORDER BY tabla, columna",
+            self._clave)
+        return {f"{t}.{c}": {'tipo': tipo, 'config': json.loads(cfg)} for t, c, tipo, cfg in filas}
+
+    # ── Escritura ─────────────────────────────────────────────────────────────
+    def programar(self, col_key, perfil):
+        """Encola el perfil; escrituras repetidas de la misma columna se funden."""
+        self._pendientes[col_key] = perfil
+
+    def hay_pendientes(self):
+        return bool(self._pendientes)
+
+    def guardar_pendientes(self):
+        if not self._pendientes:
+            return 0
+        ahora = datetime.now().isoformat(timespec='seconds')
+        filas = [(*self._clave, *col_key.split('.', 1), perfil['tipo'],
+                  json.dumps(perfil['config'], ensure_ascii=False), ahora)
+                 for col_key, perfil in self._pendientes.items()]
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO perfiles "
+                "(host, puerto, bd, esquema, tabla, columna, tipo, config, actualizado) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", filas)
+        self._pendientes.clear()
+        return len(filas)
+
+    # ── Exportar / importar ───────────────────────────────────────────────────
+    def exportar(self, archivo):
+        perfiles = self.todos()
+        host, puerto, bd, esquema = self._clave
+        with open(archivo, 'w', encoding='utf-8') as f:
+            json.dump({'host': host, 'puerto': puerto, 'bd': bd, 'esquema': esquema,
+                       'perfiles': perfiles}, f, indent=2, ensure_ascii=False)
+        return len(perfiles)
+
+    def importar(self, archivo):
+        """Acepta el formato de exportar() o un dict plano {'tabla.columna': perfil}."""
+        with open(archivo, 'r', encoding='utf-8') as f:
+            datos = json.load(f)
+        perfiles = datos.get('perfiles', datos)
+        validos  = {k: v for k, v in perfiles.items()
+                    if '.' in k and isinstance(v, dict) and 'tipo' in v and 'config' in v}
+        self._pendientes.update(validos)
+        self.guardar_pendientes()
+        return validos
+
+    def cerrar(self):
+        self.guardar_pendientes()
+        self._conn.close()